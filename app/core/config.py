@@ -1,3 +1,5 @@
+from typing import Dict
+
 from pydantic_settings import BaseSettings
 
 
@@ -31,6 +33,67 @@ class Settings(BaseSettings):
     # フロントエンド設定
     FRONTEND_URL: str = "com.example.ai_english"
 
+    # クイズカタログの更新確認間隔（秒）。0以下の場合は起動時の読み込みのみ
+    QUIZ_CATALOG_REFRESH_INTERVAL_SECONDS: float = 60
+
+    # 採点処理を実行するワーカープロセス数。0（既定）の場合はプロセスプールを使わず、
+    # イベントループ上で採点する。ワーカーを使う場合はデプロイごとに環境変数で指定する
+    CPU_EXECUTOR_WORKERS: int = 0
+    # ワーカープロセスで採点する回答・正解の合計文字数の下限
+    CPU_EXECUTOR_THRESHOLD_CHARS: int = 4000
+
+    # /metrics を取得する際のBearerトークン。空の場合は認証なしで公開する
+    METRICS_TOKEN: str = ""
+
+    # 「メソッド ルートのテンプレート」ごとの1リクエストあたりのSQLクエリ数の上限
+    # 例: QUERY_BUDGETS='{"GET /practice/conversation/{conversation_id}": 3}'
+    QUERY_BUDGETS: Dict[str, int] = {}
+    # 上限を超えた場合の動作（log: 警告ログを出力する / raise: 例外にする）
+    QUERY_BUDGET_ACTION: str = "log"
+
+    # 管理者用の操作（プロファイルの取得など）に使うトークン。空の場合は無効
+    ADMIN_TOKEN: str = ""
+
+    # プロファイラの設定
+    # 無作為にプロファイルするリクエストの割合（0〜1）。0の場合はヘッダを指定したリクエストのみ
+    PROFILER_SAMPLE_RATE: float = 0.0
+    # スタックを取得する間隔（ミリ秒）
+    PROFILER_INTERVAL_MS: float = 5.0
+    # collapsed形式とフレームグラフの保存先
+    PROFILER_OUTPUT_DIR: str = "profiles"
+
+    # 遅いリクエストの記録の設定
+    # これ以上かかったリクエストのSQLクエリ・LLMの呼び出しを記録する（ミリ秒）
+    SLOW_REQUEST_THRESHOLD_MS: float = 1000
+    # メモリに保持する件数（古いものから破棄する）
+    SLOW_REQUEST_BUFFER_SIZE: int = 100
+    # ファイルに書き込む間隔（秒）。0以下の場合は書き込まない
+    SLOW_REQUEST_DUMP_INTERVAL_SECONDS: float = 60
+    # 書き込み先のディレクトリ（ワーカーのプロセスIDごとのファイルに書き込む）
+    SLOW_REQUEST_DUMP_DIR: str = "slow_requests"
+
+    # トレースの設定
+    # スパンの書き出し先（jsonl: ファイル / otlp: OTLP/HTTP）。空の場合はトレースしない
+    TRACING_EXPORTER: str = ""
+    # 無作為にトレースするリクエストの割合（0〜1）。0の場合はヘッダを指定したリクエストのみ
+    TRACING_SAMPLE_RATE: float = 0.0
+    # jsonl の書き出し先
+    TRACING_JSONL_PATH: str = "traces/spans.jsonl"
+    # otlp の送信先（/v1/traces を付けて送信する）
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318"
+
+    # ログの設定（JSON形式で標準出力に書き込む）
+    LOG_LEVEL: str = "INFO"
+    # 発行したSQLをINFOレベルで出力する（件数が多いため開発時のみ）
+    LOG_SQL: bool = False
+    # 「メソッド ルートのテンプレート」ごとのアクセスログ・INFO以下のログを出力するリクエストの割合（0〜1）
+    # 例: LOG_SAMPLE_RATES='{"GET /home/": 0.1}'
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+    # これより時間がかかったリクエストは割合に関わらずWARNINGで出力する（ミリ秒）
+    LOG_SLOW_REQUEST_MS: float = 1000
+    # 書き込み待ちのログの上限件数。超えた分は破棄する
+    LOG_QUEUE_SIZE: int = 10000
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _warm_up() -> None:
+    """ワーカープロセスで採点処理のモジュールを読み込んでおく"""
+    import app.domain.practice.test_result_entity  # noqa: F401
+    import app.domain.recall.reacall_card_entity  # noqa: F401
+
+
+def _ping() -> int:
+    return 0
+
+
+class CpuExecutor:
+    """類似度計算などCPU負荷の高い処理をプロセスプールで実行する
+
+    処理対象の大きさ（文字数）が閾値未満の場合や、ワーカー数が0の場合は
+    プロセス間通信のコストの方が大きいため、イベントループ上でそのまま実行する。
+    """
+
+    def __init__(self, max_workers: int, threshold: int):
+        self.max_workers = max_workers
+        self.threshold = threshold
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._pool is not None
+
+    def start(self) -> None:
+        """プロセスプールを作成し、全ワーカーを起動しておく"""
+        if self._pool is not None or self.max_workers <= 0:
+            return
+
+        # asyncioのイベントループやDB接続を引き継がないようspawnで起動する
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_up,
+        )
+        # 最初のリクエストでワーカーの起動を待たないよう、ここで起動を完了させる
+        for future in [self._pool.submit(_ping) for _ in range(self.max_workers)]:
+            future.result()
+        logger.info("CPUワーカーを%d個起動しました", self.max_workers)
+
+    def shutdown(self) -> None:
+        """プロセスプールを終了する"""
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._pool = None
+
+    async def run(
+        self, size: int, func: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """sizeが閾値以上ならワーカープロセスで、未満ならその場でfuncを実行する
+
+        funcと引数はワーカープロセスに渡すためpickle可能である必要がある。
+        """
+        if self._pool is None or size < self.threshold:
+            return func(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, partial(func, *args, **kwargs))
+
+
+cpu_executor = CpuExecutor(
+    max_workers=settings.CPU_EXECUTOR_WORKERS,
+    threshold=settings.CPU_EXECUTOR_THRESHOLD_CHARS,
+)
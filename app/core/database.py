@@ -2,9 +2,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 from app.core.config import settings
+from app.core.query_metrics import instrument_engine
 
-# 非同期用のデータベースエンジンを作成
-engine = create_async_engine(settings.ASYNC_DATABASE_URL, echo=True)
+# 非同期用のデータベースエンジンを作成（SQLのログは LOG_SQL で出力する）
+engine = create_async_engine(settings.ASYNC_DATABASE_URL)
+
+# リクエストごとのSQLクエリ数・実行時間を数える
+instrument_engine(engine)
 
 # 非同期セッションを生成するためのファクトリーを作成
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -13,6 +13,7 @@ from app.domain.reviewSchedule.review_schedule_repository import (
     ReviewScheduleRepository,
 )
 from app.domain.studyRecord.study_record_repository import StudyRecordRepository
+from app.domain.unit_of_work import UnitOfWork
 from app.domain.userAnswer.study_ai_api_repository import StudyAiApiRepository
 from app.domain.userAnswer.user_answer_repository import UserAnswerRepository
 from app.repository.auth_postgres_repository import AuthPostgresRepository
@@ -23,6 +24,7 @@ from app.repository.email_postgress_resend_repository import (
 from app.repository.practice_api_openai_repository import (
     PracticeApiOpenAiRepository,
 )
+from app.repository.postgres_unit_of_work import PostgresUnitOfWork
 from app.repository.practice_postgres_repository import (
     PracticePostgresRepository,
 )
@@ -30,7 +32,9 @@ from langchain_core.language_models.chat_models import (
     BaseChatModel,
 )
 from app.core.config import settings
+from app.repository.quiz_catalog_repository import QuizCatalogRepository
 from app.repository.quiz_postgres_repository import QuizPostgresRepository
+from app.repository.quiz_type_catalog_repository import QuizTypeCatalogRepository
 from app.repository.quiz_type_postgres_repository import QuizTypePostgresRepository
 from app.repository.recall_card_postgres_repository import RecallCardPostgresRepository
 from app.repository.review_schedule_postgres_repository import (
@@ -89,14 +93,15 @@ def get_quiz_repository(
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> QuizRepository:
     """QuizRepositoryのインスタンスを提供する依存性"""
-    return QuizPostgresRepository(db)
+    # 起動時に読み込んだカタログを優先し、未読み込みの場合はPostgreSQLから取得する
+    return QuizCatalogRepository(QuizPostgresRepository(db))
 
 
 def get_quiz_type_repository(
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> QuizTypeRepository:
     """QuizTypeRepositoryのインスタンスを提供する依存性"""
-    return QuizTypePostgresRepository(db)
+    return QuizTypeCatalogRepository(QuizTypePostgresRepository(db))
 
 
 def get_study_record_repository(
@@ -125,3 +130,10 @@ def get_study_ai_api_repository(
 ) -> StudyAiApiRepository:
     """StudyAiApiRepositoryのインスタンスを提供する依存性"""
     return StudyAIAPIOpenAIRepository(llm)
+
+
+def get_unit_of_work(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> UnitOfWork:
+    """リクエスト内のリポジトリと同じセッションを使うUnitOfWorkを提供する依存性"""
+    return PostgresUnitOfWork(db)
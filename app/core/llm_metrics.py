@@ -0,0 +1,221 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+from prometheus_client import Counter, Histogram
+
+from app.core.metrics import LATENCY_BUCKETS, current_route
+from app.core.slow_requests import current_trace
+
+UNKNOWN_MODEL = "unknown"
+
+# モデルごとの100万トークンあたりの料金（USD）。(入力, 出力)
+# モデル名は日付付き（gpt-4.1-mini-2025-04-14 など）で返るため前方一致で探す
+MODEL_PRICES_PER_MILLION_TOKENS: Dict[str, Tuple[float, float]] = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+LLM_REQUESTS = Counter(
+    "llm_requests_total",
+    "LLMの呼び出し数",
+    ["route", "model", "status"],
+)
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds",
+    "LLMの呼び出しにかかった時間（秒）",
+    ["route", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "llm_time_to_first_token_seconds",
+    "ストリーミングでLLMが最初のトークンを返すまでの時間（秒）",
+    ["route", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "LLMの入力・出力トークン数",
+    ["route", "model", "type"],
+)
+LLM_COST = Counter(
+    "llm_cost_usd_total",
+    "LLMの推定料金（USD）",
+    ["route", "model"],
+)
+
+
+class _LLMRun:
+    def __init__(self, route: str, model: str):
+        self.route = route
+        self.model = model
+        self.start = time.perf_counter()
+        self.first_token: Optional[float] = None
+        # 遅いリクエストの調査用に、呼び出し元のリクエストの記録へ処理時間を追加する
+        self.trace = current_trace()
+
+
+class LLMMetricsCallbackHandler(BaseCallbackHandler):
+    """LLMの呼び出しごとの処理時間・トークン数・推定料金を記録するコールバック
+
+    呼び出し元のエンドポイントはリクエストのルートから、モデルは呼び出し時のパラメータから取得する。
+    """
+
+    # 非同期の呼び出しでもスレッドプールを経由せずにその場で実行する（処理が軽いため）
+    run_inline = True
+
+    def __init__(self) -> None:
+        self._runs: Dict[UUID, _LLMRun] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(run_id, metadata, kwargs.get("invocation_params"))
+
+    def on_llm_start(
+        self,
+        serialized: Dict[str, Any],
+        prompts: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(run_id, metadata, kwargs.get("invocation_params"))
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._runs.get(run_id)
+        if run is None or run.first_token is not None:
+            return
+        run.first_token = time.perf_counter()
+        LLM_TIME_TO_FIRST_TOKEN.labels(run.route, run.model).observe(
+            run.first_token - run.start
+        )
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+
+        LLM_REQUESTS.labels(run.route, run.model, "success").inc()
+        LLM_LATENCY.labels(run.route, run.model).observe(
+            time.perf_counter() - run.start
+        )
+
+        prompt_tokens, completion_tokens = get_token_usage(response)
+        LLM_TOKENS.labels(run.route, run.model, "prompt").inc(prompt_tokens)
+        LLM_TOKENS.labels(run.route, run.model, "completion").inc(completion_tokens)
+
+        cost = estimate_cost(run.model, prompt_tokens, completion_tokens)
+        if cost is not None:
+            LLM_COST.labels(run.route, run.model).inc(cost)
+
+        if run.trace is not None:
+            run.trace.add_llm_call(
+                run.model, run.start, "success", prompt_tokens, completion_tokens
+            )
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        LLM_REQUESTS.labels(run.route, run.model, "error").inc()
+        LLM_LATENCY.labels(run.route, run.model).observe(
+            time.perf_counter() - run.start
+        )
+        if run.trace is not None:
+            run.trace.add_llm_call(run.model, run.start, "error")
+
+    def _start(
+        self,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]],
+        invocation_params: Optional[Dict[str, Any]],
+    ) -> None:
+        self._runs[run_id] = _LLMRun(
+            route=current_route(),
+            model=_get_model_name(metadata or {}, invocation_params or {}),
+        )
+
+
+def get_token_usage(response: LLMResult) -> Tuple[int, int]:
+    """LLMの応答から入力・出力トークン数を取得する"""
+    prompt_tokens = 0
+    completion_tokens = 0
+    found = False
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(
+                getattr(generation, "message", None), "usage_metadata", None
+            )
+            if usage:
+                found = True
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+    if found:
+        return prompt_tokens, completion_tokens
+
+    # usage_metadataに対応していないモデルはOpenAI形式のllm_outputから取得する
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    return (
+        token_usage.get("prompt_tokens", 0),
+        token_usage.get("completion_tokens", 0),
+    )
+
+
+def estimate_cost(
+    model: str, prompt_tokens: int, completion_tokens: int
+) -> Optional[float]:
+    """トークン数から推定料金（USD）を計算する。料金が不明なモデルの場合はNone"""
+    prefix = max(
+        (name for name in MODEL_PRICES_PER_MILLION_TOKENS if model.startswith(name)),
+        key=len,
+        default=None,
+    )
+    if prefix is None:
+        return None
+    input_price, output_price = MODEL_PRICES_PER_MILLION_TOKENS[prefix]
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def _get_model_name(metadata: Dict[str, Any], invocation_params: Dict[str, Any]) -> str:
+    return (
+        metadata.get("ls_model_name")
+        or invocation_params.get("model_name")
+        or invocation_params.get("model")
+        or UNKNOWN_MODEL
+    )
+
+
+llm_metrics_handler = LLMMetricsCallbackHandler()
+
+# 既定値をハンドラにしたコンテキスト変数を登録すると、
+# コールバックを渡していない呼び出しを含む全てのLangChainの実行にハンドラが追加される
+_llm_metrics_callback_var: ContextVar[Optional[BaseCallbackHandler]] = ContextVar(
+    "llm_metrics_callback", default=llm_metrics_handler
+)
+_registered = False
+
+
+def register_llm_metrics() -> None:
+    """LLMのメトリクスを記録するコールバックを全てのLangChainの実行に登録する"""
+    global _registered
+    if _registered:
+        return
+    register_configure_hook(_llm_metrics_callback_var, inheritable=True)
+    _registered = True
@@ -0,0 +1,146 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Set, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 複数のuvicornワーカーの値をまとめて公開する場合は、起動前にこの環境変数へ
+# 空のディレクトリを指定する。各ワーカーはそのディレクトリのmmapファイルに値を書き込み、
+# /metrics はリクエストを受けたワーカーが全ファイルを集計して返す。
+MULTIPROCESS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# レスポンス時間のバケット（秒）。AIを呼び出すエンドポイントは数秒かかるため長めまで用意する
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# どのルートにも一致しなかったリクエストのラベル（パスをそのまま使うとラベルが増え続けるため）
+UNMATCHED_ROUTE = "<unmatched>"
+OTHER_ROUTE_GROUP = "<other>"
+
+REQUEST_COUNT = Counter(
+    "http_requests_total",
+    "HTTPリクエスト数",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTPリクエストの処理時間（秒）",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "処理中のHTTPリクエスト数",
+    ["method", "route_group"],
+    multiprocess_mode="livesum",
+)
+
+
+# 処理中のリクエストのASGIスコープ（LLMの呼び出しなどをエンドポイントごとに集計するため）
+_current_scope: ContextVar[Optional[Scope]] = ContextVar(
+    "metrics_current_scope", default=None
+)
+
+
+def current_route() -> str:
+    """処理中のリクエストのルートのテンプレートを取得する"""
+    scope = _current_scope.get()
+    if scope is None:
+        return UNMATCHED_ROUTE
+    return getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+
+
+def is_multiprocess() -> bool:
+    return bool(os.environ.get(MULTIPROCESS_DIR_ENV))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Prometheusのテキスト形式でメトリクスを出力する"""
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """終了するワーカーの処理中リクエスト数を集計対象から外す"""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """ルートごとのリクエスト数・処理時間・処理中の数を記録するASGIミドルウェア
+
+    ラベルにはパスではなくルートのテンプレート（/practice/conversation/{conversation_id} など）を使う。
+    処理中の数はルーティング前に数えるため、パスの先頭の階層（/study など）ごとに集計する。
+    ラベルが増え続けないよう、階層はルートに一致したリクエストで見つかったものだけを使う。
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: Tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+        self._route_groups: Set[str] = set()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress = REQUESTS_IN_PROGRESS.labels(method, self._route_group(scope))
+        response: Dict[str, int] = {"status": 500}
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            await send(message)
+
+        in_progress.inc()
+        token = _current_scope.set(scope)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            in_progress.dec()
+
+            # ルーティング後にStarletteが scope["route"] に一致したルートを設定する
+            route = current_route()
+            _current_scope.reset(token)
+            if route != UNMATCHED_ROUTE:
+                self._route_groups.add(_first_segment(route))
+            REQUEST_COUNT.labels(method, route, str(response["status"])).inc()
+            REQUEST_LATENCY.labels(method, route).observe(duration)
+
+    def _route_group(self, scope: Scope) -> str:
+        group = _first_segment(scope["path"])
+        return group if group in self._route_groups else OTHER_ROUTE_GROUP
+
+
+def _first_segment(path: str) -> str:
+    return "/" + path.lstrip("/").split("/", 1)[0]
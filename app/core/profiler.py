@@ -0,0 +1,222 @@
+import asyncio
+import html
+import logging
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import zlib
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# このヘッダにADMIN_TOKENを指定したリクエストをプロファイルする
+PROFILE_HEADER = "X-Profile"
+# 保存したプロファイルのファイル名（拡張子なし）を返すヘッダ
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+FRAME_HEIGHT = 16
+FLAMEGRAPH_WIDTH = 1200
+# これより細い（全体に対する割合）フレームはフレームグラフに描画しない
+MIN_FRAME_RATIO = 0.002
+
+
+class StackSampler:
+    """別スレッドから一定間隔で対象スレッドのスタックを取得するサンプリングプロファイラ
+
+    イベントループのスレッドを対象にすると、同時に処理している他のリクエストの
+    スタックも含まれる。スタックはルートから順に「;」で連結した形式で数える。
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            frames: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(
+                    f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            self.stacks[";".join(reversed(frames))] += 1
+
+
+class ProfilerMiddleware:
+    """指定したリクエストをサンプリングし、collapsed形式とフレームグラフ（SVG）を保存するASGIミドルウェア
+
+    プロファイルするのは、PROFILE_HEADER にADMIN_TOKENを指定したリクエストと、
+    PROFILER_SAMPLE_RATE の割合で無作為に選んだリクエスト。
+    オーバーヘッドを抑えるため、同時にプロファイルするのは1リクエストだけにする。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        output_dir: Optional[str] = None,
+        sample_rate: Optional[float] = None,
+        interval: Optional[float] = None,
+    ):
+        self.app = app
+        self.output_dir = output_dir or settings.PROFILER_OUTPUT_DIR
+        self.sample_rate = (
+            settings.PROFILER_SAMPLE_RATE if sample_rate is None else sample_rate
+        )
+        self.interval = (
+            settings.PROFILER_INTERVAL_MS / 1000 if interval is None else interval
+        )
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        name = _profile_name(scope)
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, name)
+            await send(message)
+
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            stacks = sampler.stop()
+            self._busy.release()
+            try:
+                await asyncio.to_thread(write_profile, stacks, self.output_dir, name)
+            except Exception:
+                logger.exception("プロファイルの保存に失敗しました")
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if settings.ADMIN_TOKEN:
+            token = Headers(scope=scope).get(PROFILE_HEADER)
+            if token and secrets.compare_digest(token, settings.ADMIN_TOKEN):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+
+def write_profile(stacks: Counter[str], output_dir: str, name: str) -> Tuple[str, str]:
+    """collapsed形式（flamegraph.pl などで利用可能）とSVGのフレームグラフを保存する"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    collapsed_path = os.path.join(output_dir, f"{name}.collapsed.txt")
+    with open(collapsed_path, "w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    svg_path = os.path.join(output_dir, f"{name}.svg")
+    with open(svg_path, "w", encoding="utf-8") as f:
+        f.write(render_flamegraph(stacks, title=name))
+
+    return collapsed_path, svg_path
+
+
+def render_flamegraph(stacks: Counter[str], title: str = "") -> str:
+    """collapsed形式のスタックからSVGのフレームグラフを作成する"""
+    # フレームの木を作成する（フレーム名 -> [サンプル数, 子フレームの木]）
+    root: Dict[str, list] = {}
+    total = 0
+    for stack, count in stacks.items():
+        total += count
+        children = root
+        for frame in stack.split(";"):
+            node = children.setdefault(frame, [0, {}])
+            node[0] += count
+            children = node[1]
+
+    # 描画するフレームの (名前, サンプル数, 左端のサンプル位置, 深さ)
+    frames: List[Tuple[str, int, int, int]] = []
+
+    def layout(children: Dict[str, list], x: int, depth: int) -> None:
+        for frame, (count, grandchildren) in sorted(children.items()):
+            if count / total >= MIN_FRAME_RATIO:
+                frames.append((frame, count, x, depth))
+                layout(grandchildren, x, depth + 1)
+            x += count
+
+    if total:
+        layout(root, 0, 0)
+
+    max_depth = max((depth for _, _, _, depth in frames), default=0)
+    height = (max_depth + 2) * FRAME_HEIGHT + 24
+    rects = [
+        _svg_frame(frame, count, total, x, height - (depth + 1) * FRAME_HEIGHT)
+        for frame, count, x, depth in frames
+    ]
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{FLAMEGRAPH_WIDTH}" '
+        f'height="{height}" font-family="monospace" font-size="11">\n'
+        f'<text x="4" y="14">{html.escape(title)} ({total} samples)</text>\n'
+        + "\n".join(rects)
+        + "\n</svg>\n"
+    )
+
+
+def _svg_frame(frame: str, count: int, total: int, x: int, y: int) -> str:
+    left = x / total * FLAMEGRAPH_WIDTH
+    width = count / total * FLAMEGRAPH_WIDTH
+    label = html.escape(frame)
+    # 幅に収まる場合だけ名前を表示する（1文字およそ7px）
+    visible = label if len(frame) * 7 < width - 4 else ""
+    # 同じ関数が同じ色になるよう名前から色を決める
+    hue = 20 + zlib.crc32(frame.encode()) % 40
+    return (
+        f"<g><title>{label} ({count} samples, {count / total:.1%})</title>"
+        f'<rect x="{left:.1f}" y="{y}" width="{width:.1f}" '
+        f'height="{FRAME_HEIGHT - 1}" fill="hsl({hue},90%,60%)"/>'
+        f'<text x="{left + 2:.1f}" y="{y + 12}">{visible}</text></g>'
+    )
+
+
+def _profile_name(scope: Scope) -> str:
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    path = re.sub(r"[^\w.-]", "_", scope["path"].strip("/")) or "root"
+    return f"{timestamp}-{scope['method']}-{path[:80]}"
+
+
+def _short_path(filename: str) -> str:
+    """site-packagesやカレントディレクトリからの相対パスにする"""
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    cwd = os.getcwd() + os.sep
+    if filename.startswith(cwd):
+        return filename[len(cwd) :]
+    return filename
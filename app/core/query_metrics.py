@@ -0,0 +1,190 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import LATENCY_BUCKETS, UNMATCHED_ROUTE
+from app.core.slow_requests import current_trace
+from app.core.tracing import record_query_span
+
+logger = logging.getLogger(__name__)
+
+# 接続ごとに実行中のクエリの開始時刻を積んでおくキー
+QUERY_START_KEY = "query_metrics_start"
+
+QUERY_BUDGET_ACTION_LOG = "log"
+QUERY_BUDGET_ACTION_RAISE = "raise"
+
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQLクエリ1件の実行時間（秒）",
+    buckets=LATENCY_BUCKETS,
+)
+QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "1リクエストで発行されたSQLクエリ数",
+    ["method", "route"],
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "1リクエストでSQLクエリの実行にかかった時間の合計（秒）",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+QUERY_BUDGET_EXCEEDED = Counter(
+    "db_query_budget_exceeded_total",
+    "SQLクエリ数が上限を超えたリクエスト数",
+    ["method", "route"],
+)
+
+
+class QueryBudgetExceededError(Exception):
+    """SQLクエリ数が上限を超えた"""
+
+    def __init__(self, name: str, count: int, budget: int):
+        self.name = name
+        self.count = count
+        self.budget = budget
+        super().__init__(f"{name}: SQLクエリ数 {count} が上限 {budget} を超えました")
+
+
+class QueryStats:
+    """1リクエスト（または1ブロック）で発行されたSQLクエリの集計"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+
+    def server_timing(self) -> str:
+        """Server-Timingヘッダの値"""
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """エンジンにSQLクエリの件数・実行時間を数えるイベントを登録する"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(QUERY_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info[QUERY_START_KEY].pop()
+    QUERY_DURATION.observe(duration)
+
+    # AsyncSessionの同期処理はリクエストと同じコンテキストで実行されるため、
+    # コンテキスト変数からリクエストの集計を取得できる
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += duration
+
+    # 遅いリクエストの調査用に、発行したSQLを記録しておく
+    trace = current_trace()
+    if trace is not None:
+        trace.add_query(statement, parameters, duration, executemany)
+
+    # トレースしているリクエストでは、SQLクエリを呼び出し元のスパンの子として記録する
+    record_query_span(statement, duration)
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(QUERY_START_KEY):
+        connection.info[QUERY_START_KEY].pop()
+
+
+@contextmanager
+def query_budget(budget: int, name: str = "query_budget") -> Iterator[QueryStats]:
+    """ブロック内で発行されたSQLクエリを数え、上限を超えた場合は例外を送出する
+
+    テストでN+1が発生していないことを確認するために使う。
+
+        with query_budget(2) as stats:
+            await repository.get_latest_test_scores(conversation_id)
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+    if stats.count > budget:
+        raise QueryBudgetExceededError(name, stats.count, budget)
+
+
+class QueryMetricsMiddleware:
+    """リクエストごとのSQLクエリ数・DB時間を記録し、Server-Timingヘッダで返すASGIミドルウェア
+
+    QUERY_BUDGETS に「メソッド ルートのテンプレート」ごとのクエリ数の上限を設定すると、
+    超えたリクエストを QUERY_BUDGET_ACTION に応じてログに出力するか例外にする。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        budgets: Optional[Dict[str, int]] = None,
+        action: Optional[str] = None,
+    ):
+        self.app = app
+        self.budgets = settings.QUERY_BUDGETS if budgets is None else budgets
+        self.action = settings.QUERY_BUDGET_ACTION if action is None else action
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except BaseException:
+            _current_stats.reset(token)
+            # 処理中の例外を置き換えないよう、上限を超えていてもログの出力だけにする
+            self._record(scope, stats, can_raise=False)
+            raise
+        _current_stats.reset(token)
+        self._record(scope, stats, can_raise=True)
+
+    def _record(self, scope: Scope, stats: QueryStats, can_raise: bool) -> None:
+        method = scope["method"]
+        route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+        QUERIES_PER_REQUEST.labels(method, route).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(method, route).observe(stats.duration)
+
+        name = f"{method} {route}"
+        budget = self.budgets.get(name)
+        if budget is None or stats.count <= budget:
+            return
+
+        QUERY_BUDGET_EXCEEDED.labels(method, route).inc()
+        if can_raise and self.action == QUERY_BUDGET_ACTION_RAISE:
+            raise QueryBudgetExceededError(name, stats.count, budget)
+        logger.warning(
+            "%s: SQLクエリ数 %d が上限 %d を超えました", name, stats.count, budget
+        )
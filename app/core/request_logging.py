@@ -0,0 +1,282 @@
+import copy
+import json
+import logging
+import queue
+import random
+import re
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from prometheus_client import Counter
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# リクエストIDを受け取る・返すヘッダ
+REQUEST_ID_HEADER = "X-Request-ID"
+# 受け取ったリクエストIDをそのまま使う条件（ログに任意の文字列が混ざらないようにする）
+REQUEST_ID_PATTERN = re.compile(r"^[\w-]{1,64}$")
+
+ACCESS_LOGGER_NAME = "app.access"
+
+# LogRecordの標準の属性（これ以外の属性は extra で渡された項目としてJSONに含める）
+_RECORD_ATTRIBUTES = set(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+# RequestContextFilterが付与する項目
+_CONTEXT_FIELDS = ("request_id", "user_id", "method", "route")
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "キューが一杯のため破棄したログの件数",
+)
+
+
+class RequestContext:
+    """処理中のリクエストの情報（ログの各行に付与する）"""
+
+    def __init__(
+        self,
+        request_id: str,
+        scope: Scope,
+        sample_rates: Dict[str, float],
+    ):
+        self.request_id = request_id
+        self.scope = scope
+        self.sample_rates = sample_rates
+        self.user_id: Optional[str] = None
+        self._sampled: Optional[bool] = None
+
+    @property
+    def method(self) -> str:
+        return self.scope["method"]
+
+    @property
+    def route(self) -> Optional[str]:
+        # ルーティング後にStarletteが scope["route"] に一致したルートを設定する
+        return getattr(self.scope.get("route"), "path", None)
+
+    def sampled(self) -> bool:
+        """このリクエストのINFO以下のログを出力するか
+
+        ルートが決まってから「メソッド ルートのテンプレート」ごとの割合で一度だけ決める。
+        """
+        if self._sampled is None:
+            route = self.route
+            if route is None:
+                return True
+            rate = self.sample_rates.get(f"{self.method} {route}", 1.0)
+            self._sampled = rate >= 1 or random.random() < rate
+        return self._sampled
+
+
+_current_context: ContextVar[Optional[RequestContext]] = ContextVar(
+    "request_logging_context", default=None
+)
+
+
+def current_request_id() -> Optional[str]:
+    """処理中のリクエストのIDを取得する"""
+    context = _current_context.get()
+    return context.request_id if context else None
+
+
+def bind_user_id(user_id: Any) -> None:
+    """処理中のリクエストのログにユーザーIDを付与する"""
+    context = _current_context.get()
+    if context is not None:
+        context.user_id = str(user_id)
+
+
+class RequestContextFilter(logging.Filter):
+    """ログを出力したスレッド・タスクで、リクエストの情報を付与し、サンプリングする
+
+    キューの先のスレッドではコンテキスト変数を参照できないため、QueueHandlerに設定する。
+    サンプリングで選ばれなかったリクエストのINFO以下のログは出力しない。
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _current_context.get()
+        if context is None:
+            return True
+        if record.levelno < logging.WARNING and not context.sampled():
+            return False
+        for field in _CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, getattr(context, field))
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """ログを1行のJSONにする"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """キューが一杯の場合は待たずにログを破棄するQueueHandler"""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 標準のprepareはメッセージに例外を連結してしまうため、
+        # 引数の展開と例外の文字列化だけを行い、項目は別々のまま渡す
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def start_logging(
+    handlers: Optional[List[logging.Handler]] = None,
+    level: Optional[str] = None,
+    queue_size: Optional[int] = None,
+) -> QueueListener:
+    """ルートロガーの出力を、キュー経由で別スレッドから書き込むJSONログにする
+
+    ログを出力する側はキューに積むだけなので、書き込みでイベントループが止まらない。
+    handlers を省略した場合は標準出力に書き込む。
+    """
+    global _listener, _queue_handler
+    stop_logging()
+
+    if handlers is None:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(JsonFormatter())
+        handlers = [stream_handler]
+
+    queue_handler = NonBlockingQueueHandler(
+        queue.Queue(settings.LOG_QUEUE_SIZE if queue_size is None else queue_size)
+    )
+    queue_handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level or settings.LOG_LEVEL)
+
+    # 発行したSQLはLOG_SQLを指定した場合だけ出力する（旧 echo=True）
+    logging.getLogger("sqlalchemy.engine").setLevel(
+        logging.INFO if settings.LOG_SQL else logging.WARNING
+    )
+
+    _queue_handler = queue_handler
+    _listener = QueueListener(
+        queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """キューに残っているログを書き込んでからスレッドを止める"""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestLoggingMiddleware:
+    """リクエストIDを採番し、リクエストごとのアクセスログを出力するASGIミドルウェア
+
+    アクセスログにはリクエストID・ユーザーID・ルートのテンプレート・ステータス・処理時間を含める。
+    リクエストの多いルートは LOG_SAMPLE_RATES に「メソッド ルートのテンプレート」ごとの
+    割合を設定して間引く。エラーと LOG_SLOW_REQUEST_MS より遅いリクエストは常に出力する。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rates: Optional[Dict[str, float]] = None,
+        slow_request_ms: Optional[float] = None,
+    ):
+        self.app = app
+        self.sample_rates = (
+            settings.LOG_SAMPLE_RATES if sample_rates is None else sample_rates
+        )
+        self.slow_request_ms = (
+            settings.LOG_SLOW_REQUEST_MS if slow_request_ms is None else slow_request_ms
+        )
+        self.access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER, "")
+        if not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid4().hex
+        context = RequestContext(request_id, scope, self.sample_rates)
+        response: Dict[str, int] = {"status": 500}
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        token = _current_context.set(context)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self._log(scope, response["status"], duration_ms)
+            _current_context.reset(token)
+
+    def _log(self, scope: Scope, status: int, duration_ms: float) -> None:
+        if status >= 500:
+            level = logging.ERROR
+        elif duration_ms >= self.slow_request_ms:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+        self.access_logger.log(
+            level,
+            "%s %s %d",
+            scope["method"],
+            scope["path"],
+            status,
+            extra={"status": status, "duration_ms": round(duration_ms, 1)},
+        )
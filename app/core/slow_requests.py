@@ -0,0 +1,255 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Deque, Dict, List, Optional
+from uuid import UUID
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.request_logging import current_request_id
+
+logger = logging.getLogger(__name__)
+
+# 1リクエストで記録するSQLクエリの上限（超えた分は件数だけ数える）
+MAX_QUERIES_PER_REQUEST = 200
+# 値を伏せるクエリパラメータ・パスパラメータの名前
+SENSITIVE_PARAM_PATTERN = re.compile(
+    r"password|token|secret|code|email|key", re.IGNORECASE
+)
+REDACTED = "***"
+
+# そのまま残すSQLのパラメータの型（ID・数値・日時は調査に必要で、個人情報を含まない）
+_SAFE_PARAM_TYPES = (bool, int, float, Decimal, UUID, datetime, date)
+
+
+def redact_sql_parameters(parameters: Any) -> Any:
+    """SQLのパラメータから文字列・バイト列の値を伏せる
+
+    パスワードのハッシュ・メールアドレス・ユーザーの入力などは文字列のため、型と長さだけを残す。
+    """
+    if parameters is None or isinstance(parameters, _SAFE_PARAM_TYPES):
+        return parameters
+    if isinstance(parameters, dict):
+        return {key: redact_sql_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_sql_parameters(value) for value in parameters]
+    if isinstance(parameters, str):
+        return f"<str len={len(parameters)}>"
+    if isinstance(parameters, (bytes, bytearray, memoryview)):
+        return f"<bytes len={len(parameters)}>"
+    return f"<{type(parameters).__name__}>"
+
+
+def redact_request_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """名前から機密情報と判断したリクエストのパラメータの値を伏せる"""
+    return {
+        key: REDACTED if SENSITIVE_PARAM_PATTERN.search(key) else value
+        for key, value in params.items()
+    }
+
+
+class RequestTrace:
+    """1リクエストで発行したSQLクエリとLLMの呼び出しの記録"""
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.start = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc)
+        self.queries: List[Dict[str, Any]] = []
+        self.queries_truncated = 0
+        self.llm_calls: List[Dict[str, Any]] = []
+
+    def _offset_ms(self, started: float) -> float:
+        return round((started - self.start) * 1000, 1)
+
+    def add_query(
+        self,
+        statement: str,
+        parameters: Any,
+        duration: float,
+        executemany: bool = False,
+    ) -> None:
+        if len(self.queries) >= MAX_QUERIES_PER_REQUEST:
+            self.queries_truncated += 1
+            return
+        # 遅いリクエストだけを保存するため、パラメータを伏せるのは保存時に行う
+        self.queries.append(
+            {
+                "statement": statement,
+                "parameters": parameters,
+                "executemany": executemany,
+                "start_ms": self._offset_ms(time.perf_counter() - duration),
+                "duration_ms": round(duration * 1000, 2),
+            }
+        )
+
+    def add_llm_call(
+        self,
+        model: str,
+        started: float,
+        status: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+    ) -> None:
+        self.llm_calls.append(
+            {
+                "model": model,
+                "status": status,
+                "start_ms": self._offset_ms(started),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+            }
+        )
+
+    def to_dict(self, status: int, duration_ms: float) -> Dict[str, Any]:
+        """パラメータを伏せた、保存・公開用の形式にする"""
+        scope = self.scope
+        route = getattr(scope.get("route"), "path", None)
+        query_params = {
+            key: value
+            for key, _, value in (
+                part.partition("=")
+                for part in scope.get("query_string", b"").decode("latin-1").split("&")
+                if part
+            )
+        }
+        return {
+            "request_id": current_request_id(),
+            "started_at": self.started_at.isoformat(),
+            "method": scope["method"],
+            "route": route,
+            "path_params": redact_request_params(scope.get("path_params") or {}),
+            "query_params": redact_request_params(query_params),
+            "status": status,
+            "duration_ms": round(duration_ms, 1),
+            "db_time_ms": round(sum(q["duration_ms"] for q in self.queries), 1),
+            "llm_time_ms": round(sum(c["duration_ms"] for c in self.llm_calls), 1),
+            "queries": [
+                {**query, "parameters": redact_sql_parameters(query["parameters"])}
+                for query in self.queries
+            ],
+            "queries_truncated": self.queries_truncated,
+            "llm_calls": self.llm_calls,
+        }
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar(
+    "slow_request_trace", default=None
+)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """処理中のリクエストの記録を取得する（SlowRequestMiddlewareの外ではNone）"""
+    return _current_trace.get()
+
+
+class SlowRequestBuffer:
+    """処理時間が閾値を超えたリクエストを新しいものから一定件数だけ保持するリングバッファ"""
+
+    def __init__(self, size: int):
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        # 前回ファイルに書き込んでから追加があったか
+        self._dirty = False
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries.append(entry)
+            self._dirty = True
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """新しい順の一覧"""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def dump(self, path: str) -> bool:
+        """追加があった場合にJSONファイルへ書き込む（書き込み中のファイルを読まれないよう置き換える）"""
+        with self._lock:
+            if not self._dirty:
+                return False
+            entries = list(reversed(self._entries))
+            self._dirty = False
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        return True
+
+    async def run_dump_loop(self, path: str, interval: float) -> None:
+        """一定間隔でファイルに書き込む"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.dump, path)
+            except Exception:
+                logger.exception("遅いリクエストの記録の書き込みに失敗しました")
+
+
+def dump_path() -> str:
+    """ワーカーごとの書き込み先（複数ワーカーで同じファイルに書き込まないようにする）"""
+    return os.path.join(
+        settings.SLOW_REQUEST_DUMP_DIR, f"slow_requests-{os.getpid()}.json"
+    )
+
+
+class SlowRequestMiddleware:
+    """リクエストごとのSQLクエリ・LLMの呼び出しを記録し、遅いリクエストだけをバッファに残すASGIミドルウェア
+
+    記録は query_metrics のエンジンのイベントと llm_metrics のコールバックから追加される。
+    SLOW_REQUEST_THRESHOLD_MS 以上かかったリクエストを、パラメータを伏せて保存する。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        buffer: Optional[SlowRequestBuffer] = None,
+        threshold_ms: Optional[float] = None,
+    ):
+        self.app = app
+        self.buffer = slow_request_buffer if buffer is None else buffer
+        self.threshold_ms = (
+            settings.SLOW_REQUEST_THRESHOLD_MS if threshold_ms is None else threshold_ms
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(scope)
+        response: Dict[str, int] = {"status": 500}
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            await send(message)
+
+        token = _current_trace.set(trace)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current_trace.reset(token)
+            duration_ms = (time.perf_counter() - trace.start) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.buffer.add(trace.to_dict(response["status"], duration_ms))
+
+
+# アプリケーション全体で共有するインスタンス
+slow_request_buffer = SlowRequestBuffer(settings.SLOW_REQUEST_BUFFER_SIZE)
@@ -0,0 +1,680 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.request_logging import current_request_id
+
+logger = logging.getLogger(__name__)
+
+# このヘッダにADMIN_TOKENを指定したリクエストはサンプリングの割合に関わらずトレースする
+TRACE_HEADER = "X-Trace"
+# トレースしたリクエストのトレースIDを返すヘッダ
+TRACE_ID_HEADER = "X-Trace-Id"
+# W3C Trace Context。トレースする場合は呼び出し元のトレースIDと親スパンを引き継ぐ
+TRACEPARENT_HEADER = "traceparent"
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# スパンの種類（OpenTelemetryの SpanKind と同じ値）
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+STATUS_OK = "OK"
+STATUS_ERROR = "ERROR"
+
+# 記録するSQLの最大文字数
+MAX_STATEMENT_LENGTH = 1000
+# 1トレースで記録するスパンの上限（超えた分は破棄する）
+MAX_SPANS_PER_TRACE = 1000
+
+EXPORTER_JSONL = "jsonl"
+EXPORTER_OTLP = "otlp"
+
+
+class Span:
+    """処理の区間（OpenTelemetryのスパンと同じ項目を持つ）"""
+
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "name",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status",
+    )
+
+    def __init__(
+        self,
+        trace_id: str,
+        parent_span_id: Optional[str],
+        name: str,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        start_ns: Optional[int] = None,
+    ):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns() if start_ns is None else start_ns
+        self.end_ns = 0
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.status = STATUS_OK
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.attributes["exception.type"] = type(exception).__name__
+        self.attributes["exception.message"] = str(exception)[:MAX_STATEMENT_LENGTH]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id or "",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class _Trace:
+    """サンプリングで選ばれたリクエストで記録したスパンの一覧"""
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List[Span] = []
+
+    def add(self, span: Span) -> None:
+        if len(self.spans) < MAX_SPANS_PER_TRACE:
+            self.spans.append(span)
+
+
+_current_trace: ContextVar[Optional[_Trace]] = ContextVar("trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """処理中のスパンを取得する（トレースしていない場合はNone）"""
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(
+    name: str,
+    kind: int = SPAN_KIND_INTERNAL,
+    attributes: Optional[Dict[str, Any]] = None,
+) -> Iterator[Optional[Span]]:
+    """ブロックの処理をスパンとして記録する
+
+    トレースしていないリクエストではコンテキスト変数を1つ参照するだけで何もしない。
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    span = Span(
+        trace.trace_id, parent.span_id if parent else None, name, kind, attributes
+    )
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end_ns = time.time_ns()
+        trace.add(span)
+
+
+def add_completed_span(
+    name: str,
+    duration: float,
+    kind: int = SPAN_KIND_INTERNAL,
+    attributes: Optional[Dict[str, Any]] = None,
+) -> None:
+    """終わったばかりの処理を、処理中のスパンの子として記録する（SQLクエリなど）"""
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    parent = _current_span.get()
+    end_ns = time.time_ns()
+    span = Span(
+        trace.trace_id,
+        parent.span_id if parent else None,
+        name,
+        kind,
+        attributes,
+        start_ns=end_ns - int(duration * 1e9),
+    )
+    span.end_ns = end_ns
+    trace.add(span)
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _traced(function: F, name: str, layer: str) -> F:
+    attributes = {"code.layer": layer}
+
+    if inspect.iscoroutinefunction(function):
+
+        @functools.wraps(function)
+        async def async_wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return await function(*args, **kwargs)
+            with start_span(name, attributes=dict(attributes)):
+                return await function(*args, **kwargs)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if _current_trace.get() is None:
+            return function(*args, **kwargs)
+        with start_span(name, attributes=dict(attributes)):
+            return function(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def trace_methods(layer: str) -> Callable[[type], type]:
+    """クラスの公開メソッドをそれぞれ「クラス名.メソッド名」のスパンとして記録するデコレータ
+
+    ジェネレータ（ストリーミング）とコンテキストマネージャを返すメソッドは、
+    呼び出しの時点で処理が終わらないため対象にしない。
+    """
+
+    def decorate(cls: type) -> type:
+        for attribute, value in list(vars(cls).items()):
+            if attribute.startswith("_") or not inspect.isfunction(value):
+                continue
+            unwrapped = inspect.unwrap(value)
+            if (
+                inspect.isgeneratorfunction(unwrapped)
+                or inspect.isasyncgenfunction(unwrapped)
+                or unwrapped is not value
+            ):
+                continue
+            setattr(
+                cls, attribute, _traced(value, f"{cls.__name__}.{attribute}", layer)
+            )
+        return cls
+
+    return decorate
+
+
+def record_query_span(statement: str, duration: float) -> None:
+    """実行し終えたSQLクエリをスパンとして記録する"""
+    add_completed_span(
+        "db.query",
+        duration,
+        SPAN_KIND_CLIENT,
+        {"db.statement": statement[:MAX_STATEMENT_LENGTH]},
+    )
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """LangChainのチェーン・LLMの実行をスパンとして記録するコールバック
+
+    親のスパンは、入れ子の実行では親の実行のスパン、最も外側の実行では処理中のスパンにする。
+    """
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self._spans: Dict[UUID, Tuple[Span, _Trace]] = {}
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "chain"
+        self._start(run_id, parent_run_id, f"langchain.{name}", {})
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start_llm(run_id, parent_run_id, kwargs)
+
+    def on_llm_start(
+        self,
+        serialized: Dict[str, Any],
+        prompts: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start_llm(run_id, parent_run_id, kwargs)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, error)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, error)
+
+    def _start_llm(
+        self, run_id: UUID, parent_run_id: Optional[UUID], kwargs: Dict[str, Any]
+    ) -> None:
+        metadata = kwargs.get("metadata") or {}
+        invocation_params = kwargs.get("invocation_params") or {}
+        model = (
+            metadata.get("ls_model_name")
+            or invocation_params.get("model_name")
+            or invocation_params.get("model")
+            or "unknown"
+        )
+        self._start(run_id, parent_run_id, "llm", {"llm.model": model})
+
+    def _start(
+        self,
+        run_id: UUID,
+        parent_run_id: Optional[UUID],
+        name: str,
+        attributes: Dict[str, Any],
+    ) -> None:
+        parent = self._spans.get(parent_run_id) if parent_run_id else None
+        if parent is not None:
+            parent_span, trace = parent
+            parent_span_id: Optional[str] = parent_span.span_id
+        else:
+            trace = _current_trace.get()
+            if trace is None:
+                return
+            span = _current_span.get()
+            parent_span_id = span.span_id if span else None
+        kind = SPAN_KIND_CLIENT if name == "llm" else SPAN_KIND_INTERNAL
+        self._spans[run_id] = (
+            Span(trace.trace_id, parent_span_id, name, kind, attributes),
+            trace,
+        )
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> None:
+        entry = self._spans.pop(run_id, None)
+        if entry is None:
+            return
+        span, trace = entry
+        if error is not None:
+            span.record_exception(error)
+        span.end_ns = time.time_ns()
+        trace.add(span)
+
+
+class SpanExporter(ABC):
+    """記録したスパンの書き出し先"""
+
+    @abstractmethod
+    def export(self, spans: List[Span]) -> None:
+        """1トレース分のスパンを書き出す（書き出し用のスレッドから呼ばれる）"""
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+class JsonlSpanExporter(SpanExporter):
+    """スパンを1行ずつJSONでファイルに追記する（ローカルでの調査用）"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str))
+                f.write("\n")
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    """OTLP/HTTP（JSON）でOpenTelemetry Collectorなどに送信する"""
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str = "ai_app_backend",
+        timeout: float = 10.0,
+    ):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]) -> None:
+        import requests
+
+        response = requests.post(
+            self.url, json=self.to_otlp(spans), timeout=self.timeout
+        )
+        response.raise_for_status()
+
+    def to_otlp(self, spans: List[Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes(
+                            {"service.name": self.service_name}
+                        )
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [_otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    otlp: Dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _otlp_attributes(span.attributes),
+        "status": {"code": 2 if span.status == STATUS_ERROR else 1},
+    }
+    if span.parent_span_id:
+        otlp["parentSpanId"] = span.parent_span_id
+    return otlp
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            otlp_value: Dict[str, Any] = {"boolValue": value}
+        elif isinstance(value, int):
+            otlp_value = {"intValue": str(value)}
+        elif isinstance(value, float):
+            otlp_value = {"doubleValue": value}
+        else:
+            otlp_value = {"stringValue": str(value)}
+        result.append({"key": key, "value": otlp_value})
+    return result
+
+
+class SpanExportWorker:
+    """トレースごとのスパンをキューに積み、別スレッドから書き出す
+
+    書き出しでリクエストの処理が止まらないよう、キューが一杯の場合は破棄する。
+    """
+
+    def __init__(self, exporter: SpanExporter, queue_size: int = 1000):
+        self.exporter = exporter
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(queue_size)
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="span-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, spans: List[Span]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            logger.warning("スパンの書き出しが追いつかないため破棄しました")
+
+    def shutdown(self) -> None:
+        """キューに残っているスパンを書き出してからスレッドを止める"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self.exporter.shutdown()
+
+    def _run(self) -> None:
+        while True:
+            spans = self._queue.get()
+            if spans is None:
+                return
+            try:
+                self.exporter.export(spans)
+            except Exception:
+                logger.exception("スパンの書き出しに失敗しました")
+
+
+def create_exporter() -> Optional[SpanExporter]:
+    """設定に応じた書き出し先を作成する（未設定の場合はNone）"""
+    if settings.TRACING_EXPORTER == EXPORTER_JSONL:
+        return JsonlSpanExporter(settings.TRACING_JSONL_PATH)
+    if settings.TRACING_EXPORTER == EXPORTER_OTLP:
+        return OtlpHttpSpanExporter(settings.TRACING_OTLP_ENDPOINT)
+    return None
+
+
+class TracingMiddleware:
+    """サンプリングで選んだリクエストをトレースし、ルートのスパンを記録するASGIミドルウェア
+
+    トレースするのは、TRACE_HEADER にADMIN_TOKENを指定したリクエストと、
+    TRACING_SAMPLE_RATE の割合で無作為に選んだリクエスト。
+    リクエストが終わった時点で、そのトレースのスパンをまとめて書き出す。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        # 省略した場合は start_tracing で起動した書き出し用のスレッドに渡す
+        submit: Optional[Callable[[List[Span]], None]] = None,
+        sample_rate: Optional[float] = None,
+    ):
+        self.app = app
+        self.submit = submit
+        self.sample_rate = (
+            settings.TRACING_SAMPLE_RATE if sample_rate is None else sample_rate
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        submit = self.submit or (_worker.submit if _worker else None)
+        # 書き出し先が設定されていない場合はトレースしない
+        if scope["type"] != "http" or submit is None or not self._should_trace(scope):
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_span_id = _parse_traceparent(scope)
+        trace = _Trace(trace_id)
+        root = Span(
+            trace_id,
+            parent_span_id,
+            f"{scope['method']} {scope['path']}",
+            SPAN_KIND_SERVER,
+            {"http.method": scope["method"], "http.target": scope["path"]},
+        )
+
+        async def send_with_trace_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    root.status = STATUS_ERROR
+                MutableHeaders(scope=message).append(TRACE_ID_HEADER, trace_id)
+            await send(message)
+
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(root)
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        except BaseException as e:
+            root.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            root.end_ns = time.time_ns()
+            # ルーティング後にStarletteが scope["route"] に一致したルートを設定する
+            route = getattr(scope.get("route"), "path", None)
+            if route is not None:
+                root.name = f"{scope['method']} {route}"
+                root.set_attribute("http.route", route)
+            request_id = current_request_id()
+            if request_id:
+                root.set_attribute("request_id", request_id)
+            trace.add(root)
+            submit(trace.spans)
+
+    def _should_trace(self, scope: Scope) -> bool:
+        if settings.ADMIN_TOKEN:
+            token = Headers(scope=scope).get(TRACE_HEADER)
+            if token and secrets.compare_digest(token, settings.ADMIN_TOKEN):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+
+def _parse_traceparent(scope: Scope) -> Tuple[str, Optional[str]]:
+    """呼び出し元のトレースID・親スパンIDを取得する（ない場合は新しいトレースIDを採番する）"""
+    traceparent = Headers(scope=scope).get(TRACEPARENT_HEADER, "")
+    match = TRACEPARENT_PATTERN.match(traceparent)
+    if match:
+        return match.group(1), match.group(2)
+    return secrets.token_hex(16), None
+
+
+_worker: Optional[SpanExportWorker] = None
+
+tracing_handler = TracingCallbackHandler()
+
+# 既定値をハンドラにしたコンテキスト変数を登録すると、全てのLangChainの実行にハンドラが追加される
+_tracing_callback_var: ContextVar[Optional[BaseCallbackHandler]] = ContextVar(
+    "tracing_callback", default=tracing_handler
+)
+_registered = False
+
+
+def register_tracing_callback() -> None:
+    """LangChainの実行をスパンとして記録するコールバックを全ての実行に登録する"""
+    global _registered
+    if _registered:
+        return
+    register_configure_hook(_tracing_callback_var, inheritable=True)
+    _registered = True
+
+
+def start_tracing() -> None:
+    """書き出し用のスレッドを起動し、LangChainの実行を記録するコールバックを登録する"""
+    global _worker
+    exporter = create_exporter()
+    if exporter is None:
+        return
+    _worker = SpanExportWorker(exporter)
+    _worker.start()
+    register_tracing_callback()
+
+
+def stop_tracing() -> None:
+    """書き出し待ちのスパンを書き出してからスレッドを止める"""
+    global _worker
+    if _worker is not None:
+        _worker.shutdown()
+        _worker = None
+
+
+def render_waterfall(spans: List[Dict[str, Any]], width: int = 60) -> str:
+    """1トレース分のスパン（JsonlSpanExporterの形式）をテキストのウォーターフォールにする
+
+    クリティカルパス（ルートから、最も遅く終わる子スパンを順にたどった経路）には「*」を付ける。
+    """
+    if not spans:
+        return ""
+    ids = {span["spanId"] for span in spans}
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    roots = []
+    for span in sorted(spans, key=lambda span: span["startTimeUnixNano"]):
+        parent = span["parentSpanId"]
+        if parent in ids:
+            children.setdefault(parent, []).append(span)
+        else:
+            roots.append(span)
+
+    start = min(span["startTimeUnixNano"] for span in spans)
+    end = max(span["endTimeUnixNano"] for span in spans)
+    total = max(end - start, 1)
+
+    critical = set()
+    node: Optional[Dict[str, Any]] = max(roots, key=lambda s: s["endTimeUnixNano"])
+    while node is not None:
+        critical.add(node["spanId"])
+        node = max(
+            children.get(node["spanId"], []),
+            key=lambda s: s["endTimeUnixNano"],
+            default=None,
+        )
+
+    lines = [f"trace {spans[0]['traceId']} ({total / 1e6:.1f} ms)"]
+
+    def render(span: Dict[str, Any], depth: int) -> None:
+        offset = span["startTimeUnixNano"] - start
+        duration = span["endTimeUnixNano"] - span["startTimeUnixNano"]
+        left = int(offset / total * width)
+        bar = max(1, round(duration / total * width))
+        marker = "*" if span["spanId"] in critical else " "
+        error = " !" if span.get("status") == STATUS_ERROR else ""
+        label = ("  " * depth + span["name"])[:48]
+        lines.append(
+            f"{marker} {label:<48} {offset / 1e6:>9.1f} {duration / 1e6:>9.1f} ms "
+            f"|{' ' * left}{'█' * bar}{' ' * max(0, width - left - bar)}|{error}"
+        )
+        for child in children.get(span["spanId"], []):
+            render(child, depth + 1)
+
+    for root in roots:
+        render(root, 0)
+    return "\n".join(lines)
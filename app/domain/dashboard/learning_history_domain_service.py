@@ -1,8 +1,10 @@
 import datetime
 from typing import List
+from app.core.tracing import trace_methods
 from app.domain.dashboard.learning_history_entity import LearningHistoryEntity
 
 
+@trace_methods("domain_service")
 class LearningHistoryDomainService:
     """
     学習履歴のドメインサービス.
@@ -1,7 +1,11 @@
 import datetime
+from functools import cached_property
+from typing import List
 from uuid import UUID
 from pydantic import BaseModel, Field
 
+from app.domain.practice.similarity_engine import SimilarityEngine
+
 
 class MessageEntity(BaseModel):
     conversationId: UUID = Field(..., description="会話セットID")
@@ -11,6 +15,11 @@ class MessageEntity(BaseModel):
     messageJa: str = Field(..., description="日本語でのメッセージ")
     createdAt: datetime.datetime = Field(..., description="created at")
 
+    @cached_property
+    def messageEnTokens(self) -> List[str]:
+        """採点で使う英語メッセージのトークン列"""
+        return SimilarityEngine.tokenize(self.messageEn)
+
 
 class ConversationEntity(BaseModel):
     id: UUID = Field(..., description="id")
@@ -3,7 +3,10 @@ from typing import List, Optional
 from uuid import UUID
 
 from app.domain.practice.conversation_entity import ConversationEntity
-from app.domain.practice.test_result_entity import TestResultEntity
+from app.domain.practice.test_result_entity import (
+    LatestTestResultValueObject,
+    TestResultEntity,
+)
 from app.endpoint.practice.practice_model import MessageResponse
 
 
@@ -48,12 +51,12 @@ class PracticeRepository(ABC):
 
     @abstractmethod
     async def save_test_result(self, test_result: TestResultEntity) -> TestResultEntity:
-        """テスト結果をデータベースに保存する"""
+        """テスト結果をデータベースに保存する（最新のテスト結果も同時に更新する）"""
         pass
 
     @abstractmethod
-    async def get_latest_test_result(
+    async def get_latest_test_scores(
         self, conversation_id: UUID
-    ) -> Optional[TestResultEntity]:
-        """指定された会話の最新のテスト結果を取得する"""
+    ) -> Optional[LatestTestResultValueObject]:
+        """指定された会話の最新のテスト結果のスコアを取得する"""
         pass
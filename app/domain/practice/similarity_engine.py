@@ -0,0 +1,80 @@
+import difflib
+import re
+from functools import lru_cache
+from typing import Hashable, List, Sequence, Tuple
+
+# 単語（短縮形を含む）・句読点・その他の記号を1トークンとする
+TOKEN_PATTERN = re.compile(r"\b[\w\']+\b|[.,;!?]|\S")
+
+# トークン化結果をキャッシュする件数（正解の文は何度も採点されるため）
+TOKENIZE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=TOKENIZE_CACHE_SIZE)
+def _scan(text: str) -> Tuple[Tuple[str, ...], Tuple[Tuple[int, int], ...]]:
+    """1回の走査でトークンとその文字位置 (開始, 終了) を求める"""
+    # 前後の空白はどのパターンにも一致しないため、stripせずに探しても同じトークンになる
+    matches = list(TOKEN_PATTERN.finditer(text))
+    return (
+        tuple(match.group() for match in matches),
+        tuple(match.span() for match in matches),
+    )
+
+
+# difflib.SequenceMatcher.get_opcodes() の形式 (tag, i1, i2, j1, j2)
+Opcode = Tuple[str, int, int, int, int]
+
+
+class SimilarityEngine:
+    """練習機能の採点で使うトークン化・類似度計算・差分抽出
+
+    類似度と差分は保存済みのスコアや既存のクライアントに返す差分と一致するよう、
+    これまで通り difflib.SequenceMatcher で求める。トークン化の結果はキャッシュする。
+    """
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """テキストをトークンに分割する（同じ文字列の結果はキャッシュする）"""
+        return list(_scan(text)[0])
+
+    @staticmethod
+    def token_offsets(text: str) -> List[Tuple[int, int]]:
+        """tokenize() の各トークンの文字位置 (開始, 終了) を返す
+
+        tokenize() と同じ走査の結果をキャッシュから返すため、正規表現で探し直さない。
+        """
+        return list(_scan(text)[1])
+
+    @staticmethod
+    def locate_tokens(text: str, tokens: Sequence[str]) -> List[Tuple[int, int]]:
+        """tokens（保存済みのトークンなど）の各トークンの text での文字位置を返す
+
+        tokens が text のトークン化結果と同じなら token_offsets() と同じ位置になる。
+        見つからないトークンは直前の位置に空の範囲として置き、添字の対応を保つ。
+        """
+        scanned_tokens, spans = _scan(text)
+        if tuple(tokens) == scanned_tokens:
+            return list(spans)
+        offsets = []
+        position = 0
+        for token in tokens:
+            start = text.find(token, position)
+            if start < 0:
+                offsets.append((position, position))
+                continue
+            position = start + len(token)
+            offsets.append((start, position))
+        return offsets
+
+    @staticmethod
+    def similarity(a: Sequence[Hashable], b: Sequence[Hashable]) -> int:
+        """類似度（0〜100）を計算する
+
+        difflib.SequenceMatcher.ratio() を整数に丸めた値で、変更前のスコアと一致する。
+        """
+        return round(difflib.SequenceMatcher(None, a, b).ratio() * 100)
+
+    @staticmethod
+    def diff_opcodes(a: Sequence[Hashable], b: Sequence[Hashable]) -> List[Opcode]:
+        """aをbに変換するための差分を返す（difflib.SequenceMatcher.get_opcodes() と同じ）"""
+        return difflib.SequenceMatcher(None, a, b).get_opcodes()
@@ -1,11 +1,11 @@
 from datetime import datetime
+from functools import cached_property
 from uuid import UUID
-from typing import List, Dict
+from typing import Any, List, Dict, Optional
 from pydantic import BaseModel, Field, computed_field, field_validator
-import re
-import difflib
 
 from app.core.app_exception import BadRequestError
+from app.domain.practice.similarity_engine import SimilarityEngine
 
 
 class TestConstants:
@@ -23,41 +23,38 @@ class MessageScoreValueObject(BaseModel):
     isCorrect: bool
     userAnswer: str
     correctAnswer: str
+    correctTokens: Optional[List[str]] = Field(
+        default=None, exclude=True, description="保存時にトークン化済みの正解"
+    )
 
     @staticmethod
     def tokenize(text: str) -> List[str]:
-        # 前処理を追加
-        text = text.strip()
-        return re.findall(r"\b[\w\']+\b|[.,;!?]|\S", text)
-
-    @staticmethod
-    def get_matcher(user_answer: str, correct_answer: str):
-        return difflib.SequenceMatcher(None, user_answer, correct_answer)
+        return SimilarityEngine.tokenize(text)
 
     @staticmethod
     def calculate_similarity(user_answer: str, correct_answer: str) -> float:
         """ユーザーの回答と正解の類似度を計算する"""
-        matcher = MessageScoreValueObject.get_matcher(user_answer, correct_answer)
-        return round(matcher.ratio() * 100)
+        return SimilarityEngine.similarity(user_answer, correct_answer)
 
     @staticmethod
     def get_diff_blocks(
         user_answer: List[str], correct_answer: List[str]
     ) -> List[tuple]:
         """ユーザーの回答と正解の差分を取得する"""
-        matcher = difflib.SequenceMatcher(None, user_answer, correct_answer)
-        return matcher.get_opcodes()
+        return SimilarityEngine.diff_opcodes(user_answer, correct_answer)
 
     @computed_field
-    @property
+    @cached_property
     def get_tokenized_user_answer(self) -> List[str]:
-        """ユーザーの回答をトークン化して返す"""
+        """ユーザーの回答をトークン化して返す（初回のみ計算する）"""
         return self.tokenize(self.userAnswer)
 
     @computed_field
-    @property
+    @cached_property
     def get_tokenized_correct_answer(self) -> List[str]:
-        """正解の回答をトークン化して返す"""
+        """正解の回答をトークン化して返す（保存済みのトークンがあればそれを使う）"""
+        if self.correctTokens is not None:
+            return self.correctTokens
         return self.tokenize(self.correctAnswer)
 
     @classmethod
@@ -109,17 +106,43 @@ class TestResultEntity(BaseModel):
 
     @classmethod
     def factory(
-        cls, conversation_id: UUID, test_number: int, answers: List[Dict[str, str]]
+        cls, conversation_id: UUID, test_number: int, answers: List[Dict[str, Any]]
     ) -> "TestResultEntity":
         """ユーザーの回答リストからテスト結果を作成する"""
         result = cls(conversation_id=conversation_id, test_number=test_number)
 
         for answer in answers:
-            score = MessageScoreValueObject.factory(
-                message_order=int(answer["message_order"]),
-                user_answer=answer["user_answer"],
-                correct_answer=answer["correct_answer"],
+            score = MessageScoreValueObject.calculate_similarity(
+                answer["user_answer"], answer["correct_answer"]
+            )
+            result.message_scores.append(
+                MessageScoreValueObject(
+                    message_order=int(answer["message_order"]),
+                    score=score,
+                    isCorrect=score >= TestConstants.CORRECT_THRESHOLD,
+                    userAnswer=answer["user_answer"],
+                    correctAnswer=answer["correct_answer"],
+                    correctTokens=answer.get("correct_tokens"),
+                )
             )
-            result.message_scores.append(score)
 
         return result
+
+
+class LatestTestResultValueObject(BaseModel):
+    """会話セットごとの最新のテスト結果（前回のスコアの参照用）"""
+
+    model_config = {"frozen": True}
+
+    conversation_id: UUID
+    test_number: int
+    overall_score: float
+    message_scores: List[float] = Field(
+        default_factory=list, description="メッセージの順番に並べたスコア"
+    )
+
+    def get_message_score(self, message_order: int) -> Optional[float]:
+        """指定した順番のメッセージのスコアを返す（存在しない場合はNone）"""
+        if 1 <= message_order <= len(self.message_scores):
+            return self.message_scores[message_order - 1]
+        return None
@@ -0,0 +1,82 @@
+from types import MappingProxyType
+from typing import Hashable, Iterable, Mapping, Optional, Tuple
+from uuid import UUID
+
+from app.domain.quiz.quize_entity import QuizEntity
+from app.domain.quizType.quiz_type_entity import QuizTypeEntity
+
+
+class QuizCatalog:
+    """クイズとクイズの種類のイミュータブルなスナップショット
+
+    クイズのカタログはほとんど変更されないため、起動時に一度読み込んで
+    プロセス全体で共有する。更新時は新しいスナップショットに差し替える。
+    """
+
+    __slots__ = (
+        "_version",
+        "_quizzes",
+        "_quizzes_by_id",
+        "_quizzes_by_type_id",
+        "_quiz_types",
+        "_quiz_types_by_id",
+    )
+
+    def __init__(
+        self,
+        version: Hashable,
+        quizzes: Iterable[QuizEntity],
+        quiz_types: Iterable[QuizTypeEntity],
+    ):
+        self._version = version
+        self._quizzes: Tuple[QuizEntity, ...] = tuple(quizzes)
+        self._quiz_types: Tuple[QuizTypeEntity, ...] = tuple(quiz_types)
+        self._quizzes_by_id = MappingProxyType(
+            {quiz.quizId: quiz for quiz in self._quizzes}
+        )
+        self._quiz_types_by_id = MappingProxyType(
+            {quiz_type.quizTypeId: quiz_type for quiz_type in self._quiz_types}
+        )
+
+        quizzes_by_type_id: dict[UUID, list[QuizEntity]] = {}
+        for quiz in self._quizzes:
+            quizzes_by_type_id.setdefault(quiz.quizTypeId, []).append(quiz)
+        self._quizzes_by_type_id = MappingProxyType(
+            {
+                quiz_type_id: tuple(quizzes)
+                for quiz_type_id, quizzes in quizzes_by_type_id.items()
+            }
+        )
+
+    @property
+    def version(self) -> Hashable:
+        """スナップショットを作成した時点のカタログのバージョン"""
+        return self._version
+
+    @property
+    def quizzes(self) -> Tuple[QuizEntity, ...]:
+        """全てのクイズ"""
+        return self._quizzes
+
+    @property
+    def quiz_types(self) -> Tuple[QuizTypeEntity, ...]:
+        """全てのクイズの種類"""
+        return self._quiz_types
+
+    @property
+    def quizzes_by_id(self) -> Mapping[UUID, QuizEntity]:
+        """クイズIDをキーにしたクイズ"""
+        return self._quizzes_by_id
+
+    @property
+    def quiz_types_by_id(self) -> Mapping[UUID, QuizTypeEntity]:
+        """クイズの種類IDをキーにしたクイズの種類"""
+        return self._quiz_types_by_id
+
+    def get_quiz(self, quiz_id: UUID) -> Optional[QuizEntity]:
+        """指定されたIDのクイズを取得する"""
+        return self._quizzes_by_id.get(quiz_id)
+
+    def get_quizzes_by_type_id(self, quiz_type_id: UUID) -> Tuple[QuizEntity, ...]:
+        """指定された種類のクイズを取得する"""
+        return self._quizzes_by_type_id.get(quiz_type_id, ())
@@ -14,6 +14,9 @@ class DifficultyEnum(IntEnum):
 class QuizEntity(BaseModel):
     """ユーザー情報レスポンス用のスキーマ"""
 
+    # クイズカタログのインスタンスをリクエスト間で共有するため、frozen=Trueでイミュータブルにする
+    model_config = {"frozen": True}
+
     quizId: UUID = Field(..., description="クイズ種類ID")
     question: str = Field(..., min_length=1, max_length=300, description="内容")
     modelAnswer: str = Field(..., min_length=1, max_length=300, description="模範解答")
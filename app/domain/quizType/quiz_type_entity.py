@@ -5,6 +5,9 @@ from pydantic import BaseModel, Field
 class QuizTypeEntity(BaseModel):
     """ユーザー情報レスポンス用のスキーマ"""
 
+    # クイズカタログのインスタンスをリクエスト間で共有するため、frozen=Trueでイミュータブルにする
+    model_config = {"frozen": True}
+
     quizTypeId: UUID = Field(..., description="クイズ種類ID")
     name: str = Field(..., min_length=1, max_length=30, description="名前")
     abbreviation: str = Field(..., min_length=1, max_length=100, description="略語")
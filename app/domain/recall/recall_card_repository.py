@@ -1,5 +1,6 @@
+import datetime
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional, Tuple
 from uuid import UUID
 from app.domain.recall.reacall_card_entity import RecallCardEntity
 
@@ -19,11 +20,32 @@ class RecallCardrepository(ABC):
         """復習カードIDに紐づく復習カードを取得する"""
         pass
 
+    @abstractmethod
+    async def getAllByRecallCardIdsAndUserId(
+        self, recall_card_ids: List[UUID], user_id: UUID
+    ) -> List[RecallCardEntity]:
+        """複数の復習カードIDに紐づく復習カードをまとめて取得する"""
+        pass
+
     @abstractmethod
     async def getMostOverdueDeadline(self, user_id: UUID) -> RecallCardEntity | None:
         """期限が最も過ぎている復習カードを取得する"""
         pass
 
+    @abstractmethod
+    async def getDueByUserId(
+        self,
+        user_id: UUID,
+        now: datetime.datetime,
+        limit: int,
+        after: Optional[Tuple[datetime.datetime, UUID]] = None,
+    ) -> List[RecallCardEntity]:
+        """復習期限が来た復習カードを期限の古い順に最大limit件取得する
+
+        afterには前回取得した最後のカードの(復習期限, 復習カードID)を指定する
+        """
+        pass
+
     @abstractmethod
     async def updateAll(self, recall_cards: List[RecallCardEntity]) -> None:
         """復習カードを更新する"""
@@ -1,12 +1,14 @@
 import datetime
 from typing import List
 from uuid import UUID
+from app.core.tracing import trace_methods
 from app.domain.reviewSchedule.review_schedule_entity import ReviewScheduleEntity
 from app.domain.reviewSchedule.review_schedule_repository import (
     ReviewScheduleRepository,
 )
 
 
+@trace_methods("domain_service")
 class ReviewScheduleDomainService:
     def __init__(
         self,
@@ -1,6 +1,6 @@
 import datetime
-from typing import List, Self
-from uuid import UUID
+from typing import Callable, List, Optional, Self
+from uuid import UUID, uuid4
 from pydantic import BaseModel, Field
 
 
@@ -9,6 +9,10 @@ class RecallCardConstants:
 
     BASIC_ADD_DEADLINE: datetime.timedelta = datetime.timedelta(days=3)
 
+    # 連続高得点・連続低得点とみなすスコア
+    HIGH_SCORE = 80
+    LOW_SCORE = 50
+
     # 最新スコア係数
     LATEST_SCORE_MULTIPLIERS = {
         (90, 100): 3.0,
@@ -26,16 +30,77 @@ class ReviewScheduleEntity(BaseModel):
     userId: UUID = Field(..., description="ユーザーID")
     quizId: UUID = Field(..., description="クイズID")
     reviewDeadLine: datetime.datetime = Field(..., description="復習期限")
+    answerCount: int = Field(default=0, description="回答数")
+    scoreSum: int = Field(default=0, description="スコアの合計")
+    highScoreStreak: int = Field(default=0, description="直近の連続高得点の回数")
+    lowScoreStreak: int = Field(default=0, description="直近の連続低得点の回数")
+    lastScore: Optional[int] = Field(default=None, description="最新スコア")
+
+    @classmethod
+    def create_first(cls, userId: UUID, quizId: UUID, score: int) -> Self:
+        """最初の回答から復習スケジュールを作成する（復習期限は1秒後）"""
+        return cls(
+            reviewScheduleId=uuid4(),
+            userId=userId,
+            quizId=quizId,
+            reviewDeadLine=datetime.datetime.now() + datetime.timedelta(seconds=1),
+            answerCount=1,
+            scoreSum=score,
+            highScoreStreak=1 if score >= RecallCardConstants.HIGH_SCORE else 0,
+            lowScoreStreak=1 if score < RecallCardConstants.LOW_SCORE else 0,
+            lastScore=score,
+        )
 
     def update(self, scores: List[int]) -> Self:
-        """復習スケジュールを更新する"""
+        """回答履歴の全スコアから復習スケジュールを更新する"""
         if not scores:
             return self
 
+        return self._reschedule(
+            answer_count=len(scores),
+            score_sum=sum(scores),
+            high_score_streak=self._count_streak(
+                scores, lambda score: score >= RecallCardConstants.HIGH_SCORE
+            ),
+            low_score_streak=self._count_streak(
+                scores, lambda score: score < RecallCardConstants.LOW_SCORE
+            ),
+            last_score=scores[-1],
+        )
+
+    def reschedule(self) -> Self:
+        """保持している集計値から復習期限を求め直す
+
+        集計値をデータベース側で加算した後に使う。最初の回答（回答数が1以下）の場合は
+        create_first の復習期限のままにする。
+        """
+        if self.answerCount <= 1:
+            return self
+
+        return self._reschedule(
+            answer_count=self.answerCount,
+            score_sum=self.scoreSum,
+            high_score_streak=self.highScoreStreak,
+            low_score_streak=self.lowScoreStreak,
+            last_score=self.lastScore,
+        )
+
+    def _reschedule(
+        self,
+        answer_count: int,
+        score_sum: int,
+        high_score_streak: int,
+        low_score_streak: int,
+        last_score: int,
+    ) -> Self:
         # 復習期限のプラス = 基本期間 × 最新スコア係数 × 連続性係数 × 平均補正係数
-        latest_score_multiplier = self._get_latest_score_multiplier(scores[-1])
-        continuity_multiplier = self._get_continuity_multiplier(scores)
-        average_correction_multiplier = self._get_average_correction_multiplier(scores)
+        latest_score_multiplier = self._get_latest_score_multiplier(last_score)
+        continuity_multiplier = self._get_streak_multiplier(
+            answer_count, high_score_streak, low_score_streak
+        )
+        average_correction_multiplier = self._get_average_multiplier(
+            score_sum / answer_count
+        )
 
         # 追加期間を計算
         multiplier = (
@@ -49,7 +114,16 @@ class ReviewScheduleEntity(BaseModel):
         new_deadline = datetime.date.today() + add_deadline_timedelta
 
         # 新しいインスタンスを返す
-        return self.model_copy(update={"reviewDeadLine": new_deadline})
+        return self.model_copy(
+            update={
+                "reviewDeadLine": new_deadline,
+                "answerCount": answer_count,
+                "scoreSum": score_sum,
+                "highScoreStreak": high_score_streak,
+                "lowScoreStreak": low_score_streak,
+                "lastScore": last_score,
+            }
+        )
 
     def _get_latest_score_multiplier(self, latest_score: int) -> float:
         """最新スコアに基づく係数を取得"""
@@ -61,26 +135,23 @@ class ReviewScheduleEntity(BaseModel):
                 return multiplier
         return RecallCardConstants.LATEST_SCORE_MULTIPLIERS[(0, 29)]  # デフォルト
 
-    def _get_continuity_multiplier(self, scores: List[int]) -> float:
-        """連続性に基づく係数を取得"""
-        if len(scores) < 2:
-            return 1.0
-
-        # 連続高得点（80点以上）をチェック
-        high_score_streak = 0
+    @staticmethod
+    def _count_streak(scores: List[int], condition: Callable[[int], bool]) -> int:
+        """末尾から条件を満たすスコアが連続している回数を数える"""
+        streak = 0
         for score in reversed(scores):
-            if score >= 80:
-                high_score_streak += 1
+            if condition(score):
+                streak += 1
             else:
                 break
+        return streak
 
-        # 連続低得点（50点未満）をチェック
-        low_score_streak = 0
-        for score in reversed(scores):
-            if score < 50:
-                low_score_streak += 1
-            else:
-                break
+    def _get_streak_multiplier(
+        self, answer_count: int, high_score_streak: int, low_score_streak: int
+    ) -> float:
+        """直近の連続高得点・連続低得点の回数に基づく係数を取得"""
+        if answer_count < 2:
+            return 1.0
 
         # 連続高得点の場合
         if high_score_streak >= 4:
@@ -98,13 +169,8 @@ class ReviewScheduleEntity(BaseModel):
 
         return 1.0
 
-    def _get_average_correction_multiplier(self, scores: List[int]) -> float:
-        """平均スコアに基づく補正係数を取得"""
-        if not scores:
-            return 1.0
-
-        average_score = sum(scores) / len(scores)
-
+    def _get_average_multiplier(self, average_score: float) -> float:
+        """平均スコアの値に基づく補正係数を取得"""
         if average_score >= 80:
             return 1.2
         elif average_score >= 60:
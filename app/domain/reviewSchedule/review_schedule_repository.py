@@ -32,3 +32,21 @@ class ReviewScheduleRepository(ABC):
     ) -> ReviewScheduleEntity:
         """既存の復習スケジュールを更新する"""
         pass
+
+    @abstractmethod
+    async def upsert(
+        self, reviewSchedule: ReviewScheduleEntity
+    ) -> ReviewScheduleEntity:
+        """復習スケジュールを登録し、既に存在する場合は1回分の回答の値を集計値に加算する
+
+        reviewSchedule には ReviewScheduleEntity.create_first で作成した値を渡す。
+        既に存在する場合の復習期限は更新しないため、返り値の集計値から update_deadline で更新する。
+        """
+        pass
+
+    @abstractmethod
+    async def update_deadline(
+        self, reviewSchedule: ReviewScheduleEntity
+    ) -> ReviewScheduleEntity:
+        """復習スケジュールの復習期限だけを更新する"""
+        pass
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import AsyncContextManager
+
+
+class UnitOfWork(ABC):
+    """複数のリポジトリへの書き込みを1つのトランザクションにまとめるインターフェース"""
+
+    @abstractmethod
+    def transaction(self) -> AsyncContextManager[None]:
+        """ブロック内の書き込みを正常終了時にまとめてコミットし、例外時はロールバックする
+
+        ブロック内ではリポジトリ個別のコミットは行わない。入れ子にした場合は外側に合流する。
+        """
+        pass
@@ -4,6 +4,7 @@ from uuid import UUID
 
 from sqlalchemy import Enum
 from app.core.app_exception import NotFoundError
+from app.core.tracing import trace_methods
 from app.domain.quiz.quize_entity import QuizEntity
 from app.domain.quiz.quize_repostiroy import QuizRepository
 from app.domain.reviewSchedule.review_schedule_repository import (
@@ -20,6 +21,7 @@ class QuestionType(str, Enum):
     MIXED = "mixed"
 
 
+@trace_methods("domain_service")
 class UserAnswerDomainService:
     def __init__(
         self,
@@ -0,0 +1,47 @@
+# 管理者用API（ADMIN_TOKENを設定した場合のみ利用可能）
+
+import secrets
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+
+from app.core.app_exception import UnauthorizedError
+from app.core.config import settings
+from app.core.slow_requests import slow_request_buffer
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def verify_admin_token(authorization: Optional[str] = Header(default=None)) -> None:
+    # トークンが未設定の場合は誰にも公開しない
+    if not settings.ADMIN_TOKEN or not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.ADMIN_TOKEN}"
+    ):
+        raise UnauthorizedError()
+
+
+@router.get(
+    "/slow-requests",
+    include_in_schema=False,
+    dependencies=[Depends(verify_admin_token)],
+)
+async def get_slow_requests(
+    limit: int = Query(default=20, ge=1),
+    route: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """遅いリクエストの記録を新しい順に取得する（route を指定した場合はそのルートのみ）"""
+    entries = slow_request_buffer.snapshot()
+    if route:
+        entries = [entry for entry in entries if entry["route"] == route]
+    return entries[:limit]
+
+
+@router.delete(
+    "/slow-requests",
+    include_in_schema=False,
+    status_code=204,
+    dependencies=[Depends(verify_admin_token)],
+)
+async def clear_slow_requests() -> None:
+    """遅いリクエストの記録を削除する"""
+    slow_request_buffer.clear()
@@ -0,0 +1,24 @@
+# メトリクスAPI（Prometheusのスクレイプ用）
+
+import secrets
+
+from fastapi import APIRouter, Header, Response
+from typing import Optional
+
+from app.core.app_exception import UnauthorizedError
+from app.core.config import settings
+from app.core.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(default=None)) -> Response:
+    # トークンが設定されている場合はBearerトークンが一致するスクレイパーにのみ公開する
+    if settings.METRICS_TOKEN and not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise UnauthorizedError()
+
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
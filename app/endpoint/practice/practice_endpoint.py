@@ -1,6 +1,6 @@
-from typing import Annotated
+from typing import Annotated, Optional, Union
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from fastapi.security import OAuth2PasswordBearer
 from app.core.dependencies.repositories import (
     get_auth_repository,
@@ -8,12 +8,14 @@ from app.core.dependencies.repositories import (
     get_english_recall_repository,
     get_english_repository,
     get_mail_repository,
+    get_unit_of_work,
 )
 from app.domain.auth.auth_repository import AuthRepository
 from app.domain.email.emai_repository import EmailRepository
 from app.domain.practice.practice_api_repotiroy import PracticeApiRepository
 from app.domain.practice.practice_repository import PracticeRepository
 from app.domain.recall.recall_card_repository import RecallCardrepository
+from app.domain.unit_of_work import UnitOfWork
 from app.services.auth_service import AuthService
 from app.endpoint.practice.practice_model import (
     ConversationCreatedResponse,
@@ -23,6 +25,8 @@ from app.endpoint.practice.practice_model import (
     ConversationSetCreateRequest,
     MessageResponse,
     MessageCreate,
+    DIFF_SPANS_MEDIA_TYPE,
+    MessageTestDiffResultSummary,
     MessageTestResultSummary,
     RecallTestRequest,
 )
@@ -45,8 +49,11 @@ def get_practice_service(
     apiRepository: Annotated[
         PracticeApiRepository, Depends(get_english_api_repository)
     ],
+    unitOfWork: Annotated[UnitOfWork, Depends(get_unit_of_work)],
 ) -> PracticeService:
-    return PracticeService(dbPracticeRepository, dbRecallCardRepository, apiRepository)
+    return PracticeService(
+        dbPracticeRepository, dbRecallCardRepository, apiRepository, unitOfWork
+    )
 
 
 def get_auth_service(
@@ -103,17 +110,101 @@ async def get_conversation(
     return await chat_service.get_conversation(conversation_id, current_user.id)
 
 
-@router.post("/test_result", response_model=MessageTestResultSummary)
+def _accept_quality(accept: str, media_type: str, explicit: bool = False) -> float:
+    """Acceptヘッダーでmedia_typeに指定された品質値（q）を返す
+
+    最も具体的に一致するメディアレンジ（type/subtype > type/* > */*）の値を使い、
+    一致しない場合は0を返す。explicit が真の場合はワイルドカードでの一致を無視する。
+    """
+    media_type_name, _, media_subtype = media_type.lower().partition("/")
+    best_specificity, quality = -1, 0.0
+    for media_range in accept.split(","):
+        name, *params = (part.strip() for part in media_range.split(";"))
+        range_type, _, range_subtype = name.lower().partition("/")
+        if (range_type, range_subtype) == (media_type_name, media_subtype):
+            specificity = 2
+        elif explicit:
+            continue
+        elif range_type == media_type_name and range_subtype == "*":
+            specificity = 1
+        elif (range_type, range_subtype) == ("*", "*"):
+            specificity = 0
+        else:
+            continue
+
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    q = 0.0
+        if specificity > best_specificity:
+            best_specificity, quality = specificity, q
+    return quality
+
+
+def _accepts_diff_spans(accept: Optional[str]) -> bool:
+    """構造化された差分で返すか
+
+    application/vnd.eigoat.diff+json が明示され（q=0 は除く）、その品質値が
+    application/json 以上の場合だけ選ぶ。*/* などのワイルドカードでは選ばない。
+    """
+    if not accept:
+        return False
+    diff_quality = _accept_quality(accept, DIFF_SPANS_MEDIA_TYPE, explicit=True)
+    return diff_quality > 0 and diff_quality >= _accept_quality(
+        accept, "application/json"
+    )
+
+
+@router.post(
+    "/test_result",
+    response_model=Union[MessageTestResultSummary, MessageTestDiffResultSummary],
+    responses={
+        200: {
+            "content": {
+                DIFF_SPANS_MEDIA_TYPE: {
+                    "schema": {
+                        "$ref": "#/components/schemas/MessageTestDiffResultSummary"
+                    }
+                }
+            }
+        }
+    },
+)
 async def post_test_results(
     request: RecallTestRequest,
+    response: Response,
     token: Annotated[str, Depends(oauth2_scheme)],
     chat_service: Annotated[PracticeService, Depends(get_practice_service)],
     auth_service: Annotated[AuthService, Depends(get_auth_service)],
-) -> MessageTestResultSummary:
-    """ログインユーザーのテスト結果を取得する"""
+    accept: Annotated[Optional[str], Header()] = None,
+) -> Union[MessageTestResultSummary, MessageTestDiffResultSummary]:
+    """ログインユーザーのテスト結果を取得する
+
+    Acceptヘッダーで application/vnd.eigoat.diff+json が選ばれた場合は、
+    差分をHTMLではなく文字位置の範囲で返す（Content-Typeも同じメディアタイプにする）。
+    """
     # 現在のユーザー情報を取得
     current_user = await auth_service.get_current_user(token)
-    return await chat_service.post_test_results(current_user.id, request)
+    structured_diff = _accepts_diff_spans(accept)
+    result = await chat_service.post_test_results(
+        current_user.id, request, structured_diff=structured_diff
+    )
+
+    # Acceptヘッダーによって形式が変わることをキャッシュに伝える
+    if structured_diff:
+        # Responseを直接返すとresponse_modelでの検証が行われないため、ここで検証する
+        body = MessageTestDiffResultSummary.model_validate(result.model_dump())
+        return Response(
+            content=body.model_dump_json(),
+            media_type=DIFF_SPANS_MEDIA_TYPE,
+            headers={"Vary": "Accept"},
+        )
+    response.headers["Vary"] = "Accept"
+    return result
 
 
 @router.post("/conversation/ai-registration")
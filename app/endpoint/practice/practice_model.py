@@ -1,5 +1,5 @@
 import datetime
-from typing import List
+from typing import List, Optional, Tuple
 from uuid import UUID
 from pydantic import BaseModel, Field
 
@@ -42,6 +42,9 @@ class MessageResponse(BaseModel):
     message_en: str = Field(..., description="message in english")
     message_ja: str = Field(..., description="message in japanese")
     created_at: datetime.datetime = Field(..., description="created at")
+    message_en_tokens: Optional[List[str]] = Field(
+        default=None, exclude=True, description="tokens of message in english"
+    )
 
 
 class ConversationResponse(BaseModel):
@@ -85,6 +88,31 @@ class MessageTestResultSummary(BaseModel):
     result: List[MessageTestResult] = Field(..., description="テスト結果")
 
 
+# HTMLの代わりに構造化された差分を受け取る場合に Accept ヘッダーで指定するメディアタイプ
+DIFF_SPANS_MEDIA_TYPE = "application/vnd.eigoat.diff+json"
+
+# (操作コード, ユーザーの解答の開始, 終了, 英語の答案の開始, 終了)
+# 位置はユーザーが送信した解答と会話セットの message_en での文字位置。操作コードは
+# d: 余分なトークン, i: 不足しているトークン, r: 置換（一致している範囲は含めない）
+DiffSpan = Tuple[str, int, int, int, int]
+
+
+class MessageTestDiffResult(BaseModel):
+    message_order: int = Field(..., description="メッセージの順序")
+    spans: List[DiffSpan] = Field(..., description="文字位置で表した差分")
+    is_correct: bool = Field(..., description="正解かどうか")
+    similarity_to_correct: float = Field(..., description="正解との類似度")
+    last_similarity_to_correct: float | None = Field(
+        ..., description="前回の正解との類似度"
+    )
+
+
+class MessageTestDiffResultSummary(BaseModel):
+    correct_rate: float = Field(..., description="正解率")
+    last_correct_rate: float | None = Field(..., description="前回の正解率")
+    result: List[MessageTestDiffResult] = Field(..., description="テスト結果")
+
+
 # app/model/practice/practice.py に追加
 class ConversationCreatedResponse(BaseModel):
     id: UUID = Field(..., description="作成された会話のID")
@@ -1,5 +1,5 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.security import OAuth2PasswordBearer
 
 from app.core.dependencies.repositories import (
@@ -13,6 +13,8 @@ from app.domain.recall.recall_card_repository import RecallCardrepository
 from app.endpoint.recall.recall_model import (
     NextRecallCardResponse,
     RecallCardAnswerRequest,
+    RecallCardAnswersRequest,
+    RecallCardQueueResponse,
 )
 from app.services.auth_service import AuthService
 from app.services.recall_card_service import RecallCardService
@@ -56,6 +58,24 @@ async def get_next_reacall_card(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/get_recall_card_queue")
+async def get_recall_card_queue(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    recall_card_service: Annotated[RecallCardService, Depends(get_service)],
+    auth_service: Annotated[AuthService, Depends(get_auth_service)],
+    limit: Annotated[int, Query(ge=1, le=100, description="取得件数")] = 20,
+    cursor: Annotated[
+        Optional[str], Query(description="前回のレスポンスのnext_cursor")
+    ] = None,
+) -> RecallCardQueueResponse:
+    """復習期限が来た暗記カードを期限の古い順にまとめて取得する"""
+    # 現在のユーザー情報を取得
+    current_user = await auth_service.get_current_user(token)
+    return await recall_card_service.get_recall_card_queue(
+        current_user.id, limit, cursor
+    )
+
+
 @router.post("/answer_recall_card")
 async def answer_recall_card(
     token: Annotated[str, Depends(oauth2_scheme)],
@@ -73,3 +93,18 @@ async def answer_recall_card(
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/answer_recall_cards")
+async def answer_recall_cards(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    recall_card_service: Annotated[RecallCardService, Depends(get_service)],
+    auth_service: Annotated[AuthService, Depends(get_auth_service)],
+    recall_card_answers_request: RecallCardAnswersRequest,
+) -> None:
+    """複数の暗記カードの回答をまとめて処理する"""
+    # 現在のユーザー情報を取得
+    current_user = await auth_service.get_current_user(token)
+    await recall_card_service.update_recall_cards(
+        current_user.id, recall_card_answers_request
+    )
@@ -1,3 +1,4 @@
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 
@@ -14,3 +15,23 @@ class RecallCardAnswerRequest(BaseModel):
 
     recall_card_id: UUID = Field(..., description="暗記カードID")
     answer: str = Field(..., description="回答内容")
+
+
+class RecallCardAnswersRequest(BaseModel):
+    """暗記カードの一括回答リクエスト"""
+
+    answers: List[RecallCardAnswerRequest] = Field(
+        ..., min_length=1, description="暗記カードごとの回答一覧"
+    )
+
+
+class RecallCardQueueResponse(BaseModel):
+    """復習期限が来た暗記カードのキューのレスポンス"""
+
+    recall_cards: List[NextRecallCardResponse] = Field(
+        ..., description="復習期限の古い順の暗記カード一覧"
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="次の暗記カードを取得するためのカーソル（続きがない場合はnull）",
+    )
@@ -12,6 +12,7 @@ from app.core.dependencies.repositories import (
     get_quiz_type_repository,
     get_review_schedule_repository,
     get_study_ai_api_repository,
+    get_unit_of_work,
     get_user_answer_repository,
 )
 from app.domain.auth.auth_repository import AuthRepository
@@ -21,6 +22,7 @@ from app.domain.quizType.quiz_type_repository import QuizTypeRepository
 from app.domain.reviewSchedule.review_schedule_repository import (
     ReviewScheduleRepository,
 )
+from app.domain.unit_of_work import UnitOfWork
 from app.domain.userAnswer.study_ai_api_repository import StudyAiApiRepository
 from app.domain.userAnswer.user_answer_repository import UserAnswerRepository
 from app.endpoint.study.study_model import (
@@ -55,6 +57,7 @@ def get_service(
     aiAPIRepository: Annotated[
         StudyAiApiRepository, Depends(get_study_ai_api_repository)
     ],
+    unitOfWork: Annotated[UnitOfWork, Depends(get_unit_of_work)],
 ) -> StudyService:
     return StudyService(
         quizRepository=quizRepository,
@@ -62,6 +65,7 @@ def get_service(
         quiZTypeRepository=quizTypeRepository,
         reviewScheduleRepository=reviewScheduleRepository,
         aiAPIRepository=aiAPIRepository,
+        unitOfWork=unitOfWork,
     )
 
 
@@ -1,18 +1,92 @@
+import asyncio
+from contextlib import asynccontextmanager
+import logging
 from fastapi import FastAPI
 from app.core.app_exception import setup_exception_handlers
+from app.endpoint.admin import admin_endpoint
 from app.endpoint.health_check import health_check
 
 # from app.endpoint.search_event import search_event_endpoint
 from app.endpoint.auth import auth_endpoint
 from app.endpoint.home import home_endpoint
+from app.endpoint.metrics import metrics_endpoint
 from app.endpoint.practice import practice_endpoint
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 from app.core.config import settings
+from app.core.cpu_executor import cpu_executor
+from app.core.llm_metrics import register_llm_metrics
+from app.core.metrics import MetricsMiddleware, mark_process_dead
+from app.core.profiler import ProfilerMiddleware
+from app.core.query_metrics import QueryMetricsMiddleware
+from app.core.request_logging import (
+    RequestLoggingMiddleware,
+    start_logging,
+    stop_logging,
+)
+from app.core.slow_requests import SlowRequestMiddleware, dump_path, slow_request_buffer
+from app.core.tracing import TracingMiddleware, start_tracing, stop_tracing
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from app.endpoint.recall import recall_endpoint
 from app.endpoint.study import study_endpoint
+from app.core.database import async_session
+from app.repository.quiz_catalog_store import quiz_catalog_store
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """起動時・終了時の処理"""
+    # ログをJSON形式にし、別スレッドから書き込む
+    start_logging()
+
+    # サンプリングしたリクエストのスパンを書き出すスレッドを起動する
+    start_tracing()
+
+    # LLMの呼び出しごとの処理時間・トークン数・推定料金を記録する
+    register_llm_metrics()
+
+    # 採点用のワーカープロセスを起動しておく
+    await asyncio.to_thread(cpu_executor.start)
+
+    # クイズカタログをメモリに読み込む（失敗した場合はDBから都度取得する）
+    try:
+        async with async_session() as db:
+            await quiz_catalog_store.load(db)
+    except Exception:
+        logger.exception("クイズカタログの読み込みに失敗しました")
+
+    refresh_task = None
+    if settings.QUIZ_CATALOG_REFRESH_INTERVAL_SECONDS > 0:
+        refresh_task = asyncio.create_task(
+            quiz_catalog_store.run_refresh_loop(
+                async_session, settings.QUIZ_CATALOG_REFRESH_INTERVAL_SECONDS
+            )
+        )
+
+    # 遅いリクエストの記録を定期的にファイルへ書き込む
+    dump_task = None
+    if settings.SLOW_REQUEST_DUMP_INTERVAL_SECONDS > 0:
+        dump_task = asyncio.create_task(
+            slow_request_buffer.run_dump_loop(
+                dump_path(), settings.SLOW_REQUEST_DUMP_INTERVAL_SECONDS
+            )
+        )
+
+    yield
+
+    if refresh_task:
+        refresh_task.cancel()
+    if dump_task:
+        dump_task.cancel()
+        await asyncio.to_thread(slow_request_buffer.dump, dump_path())
+
+    await asyncio.to_thread(cpu_executor.shutdown)
+    mark_process_dead()
+    stop_tracing()
+    stop_logging()
 
 
 if settings.ENVIRONMENT == "production":
@@ -23,13 +97,16 @@ if settings.ENVIRONMENT == "production":
         version="1.0.0",
         docs_url=None,  # 本番環境ではSwaggerUIを無効化
         redoc_url=None,  # 本番環境ではRedocを無効化
+        lifespan=lifespan,
     )
     app.add_middleware(HTTPSRedirectMiddleware)
 else:
     # 開発環境以外の設定
     # HTTPSリダイレクトを強制（本番環境用）
     # FastAPIインスタンスの作成
-    app = FastAPI(title="EIGOAT API", description="", version="1.0.0")
+    app = FastAPI(
+        title="EIGOAT API", description="", version="1.0.0", lifespan=lifespan
+    )
 
 
 app.add_middleware(
@@ -49,6 +126,24 @@ app.add_middleware(
     ],
 )
 
+# 管理者のヘッダまたは一定の割合で選んだリクエストのプロファイルを保存する
+app.add_middleware(ProfilerMiddleware)
+
+# リクエストごとのSQLクエリ数・DB時間を記録し、Server-Timingヘッダで返す
+app.add_middleware(QueryMetricsMiddleware)
+
+# サンプリングしたリクエストのエンドポイント〜サービス〜リポジトリ〜LLMのスパンを記録する
+app.add_middleware(TracingMiddleware)
+
+# 遅いリクエストのSQLクエリ・LLMの呼び出しを記録する
+app.add_middleware(SlowRequestMiddleware)
+
+# ルートごとのリクエスト数・処理時間を記録する（他のミドルウェアの処理時間も含めるため外側に追加する）
+app.add_middleware(MetricsMiddleware)
+
+# リクエストIDを採番し、アクセスログを出力する（全てのログにリクエストIDを付与するため最も外側に追加する）
+app.add_middleware(RequestLoggingMiddleware)
+
 setup_exception_handlers(app)
 
 app.include_router(health_check.router)
@@ -57,4 +152,6 @@ app.include_router(auth_endpoint.router)  # 認証エンドポイントを追加
 app.include_router(recall_endpoint.router)  # 暗記カードエンドポイントを追加
 app.include_router(study_endpoint.router)  # 学習エンドポイントを追加
 app.include_router(home_endpoint.router)  # ホームエンドポイントを追加
+app.include_router(metrics_endpoint.router)  # メトリクスエンドポイントを追加
+app.include_router(admin_endpoint.router)  # 管理者用エンドポイントを追加
 # app.include_router(search_event_endpoint.router, tags=["auth"])
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import and_, select
 from app.core.app_exception import ConflictError, NotFoundError, UnauthorizedError
 from app.core.security import SecurityUtils
+from app.core.tracing import trace_methods
 from app.domain.auth.auth_repository import AuthRepository
 from app.domain.auth.login_information_value_object import LoginInformationValueObject
 from app.domain.auth.refresh_token_value_object import RefreshTokenValueObject
@@ -18,6 +19,7 @@ from app.core.config import settings
 import secrets
 
 
+@trace_methods("repository")
 class AuthPostgresRepository(AuthRepository):
     """PostgreSQLを使用した認証リポジトリの実装"""
 
@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# この行数以上はCOPYで登録する（少ない行数ではINSERTの方が速いため）
+COPY_THRESHOLD_ROWS = 500
+
+
+async def bulk_insert(
+    db: AsyncSession,
+    table: Table,
+    rows: Sequence[Dict[str, Any]],
+    copy_threshold: int = COPY_THRESHOLD_ROWS,
+) -> None:
+    """ORMを経由せずに複数行をまとめて登録する
+
+    少ない行数は複数行のINSERT、多い行数はasyncpgのCOPYで登録する。
+    どちらもセッションのトランザクション内で実行するため、コミットは呼び出し側で行う。
+    """
+    if not rows:
+        return
+
+    if len(rows) >= copy_threshold:
+        await copy_insert(db, table, rows)
+    else:
+        # SQLAlchemyが複数行のVALUESにまとめて送信する（insertmanyvalues）
+        await db.execute(insert(table), list(rows))
+
+
+async def copy_insert(
+    db: AsyncSession, table: Table, rows: Sequence[Dict[str, Any]]
+) -> None:
+    """asyncpgの copy_records_to_table で複数行を登録する
+
+    COPYではSQLAlchemy側のデフォルト値が適用されないため、ここで補完する。
+    """
+    columns = [column for column in table.columns if _has_value(column, rows[0])]
+    records: List[tuple] = [
+        tuple(_value(column, row) for column in columns) for row in rows
+    ]
+
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(  # type: ignore
+        table.name,
+        records=records,
+        columns=[column.name for column in columns],
+        schema_name=table.schema,
+    )
+
+
+def _has_value(column, row: Dict[str, Any]) -> bool:
+    # シーケンスやSQL式のデフォルト値はPython側で計算できないため、DBに任せる
+    default = column.default
+    return column.key in row or (
+        default is not None
+        and not default.is_sequence
+        and not default.is_clause_element
+    )
+
+
+def _value(column, row: Dict[str, Any]) -> Any:
+    if column.key in row:
+        return row[column.key]
+    default = column.default
+    if default.is_callable:
+        return default.arg(None)
+    return default.arg
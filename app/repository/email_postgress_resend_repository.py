@@ -1,8 +1,10 @@
+from app.core.tracing import trace_methods
 from app.domain.email.emai_repository import EmailRepository
 import resend
 from app.core.config import settings
 
 
+@trace_methods("repository")
 class EmailResendRepository(EmailRepository):
     """EmailRepositoryの実装クラス"""
 
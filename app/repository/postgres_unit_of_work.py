@@ -0,0 +1,48 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.unit_of_work import UnitOfWork
+
+# 作業単位の実行中であることをセッションに記録するキー
+UNIT_OF_WORK_KEY = "unit_of_work"
+
+
+class PostgresUnitOfWork(UnitOfWork):
+    """リクエストごとのAsyncSessionを使った作業単位の実装
+
+    リポジトリは同じリクエスト内で同じセッションを共有しているため、
+    セッションに作業単位の実行中であることを記録し、コミットを最後の1回にまとめる。
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        # 既に作業単位の中であれば外側のトランザクションに合流する
+        if self.db.info.get(UNIT_OF_WORK_KEY):
+            yield
+            return
+
+        self.db.info[UNIT_OF_WORK_KEY] = True
+        try:
+            yield
+            await self.db.commit()
+        except BaseException:
+            await self.db.rollback()
+            raise
+        finally:
+            self.db.info.pop(UNIT_OF_WORK_KEY, None)
+
+
+async def commit(db: AsyncSession) -> None:
+    """リポジトリの書き込みを確定する
+
+    作業単位の中ではフラッシュのみ行い、コミットは作業単位の終了時にまとめて行う。
+    """
+    if db.info.get(UNIT_OF_WORK_KEY):
+        await db.flush()
+    else:
+        await db.commit()
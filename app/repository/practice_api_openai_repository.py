@@ -1,6 +1,7 @@
 from langchain_core.language_models.chat_models import (
     BaseChatModel,
 )
+from app.core.tracing import trace_methods
 from app.domain.practice.geneerated_conversation_value_object import (
     GeneratedConversationValueObject,
     GeneratedMessageValueObject,
@@ -9,6 +10,7 @@ from app.domain.practice.practice_api_repotiroy import PracticeApiRepository
 from langchain_core.prompts import ChatPromptTemplate
 
 
+@trace_methods("repository")
 class PracticeApiOpenAiRepository(PracticeApiRepository):
     """PostgreSQLを使用した練習機能のリポジトリ実装"""
 
@@ -64,7 +66,7 @@ class PracticeApiOpenAiRepository(PracticeApiRepository):
             title=generated_conversation.title,  # type: ignore
             messages=[
                 GeneratedMessageValueObject(
-                    messageEn=message.message_en, messageJa=message.message_ja
+                    messageEn=message.messageEn, messageJa=message.messageJa
                 )
                 for message in generated_conversation.messages  # type: ignore
             ],
@@ -3,23 +3,30 @@ from uuid import UUID
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, desc
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
 
+from app.core.tracing import trace_methods
 from app.domain.practice.conversation_entity import ConversationEntity
+from app.domain.practice.similarity_engine import SimilarityEngine
 from app.domain.practice.test_result_entity import (
-    MessageScoreValueObject,
+    LatestTestResultValueObject,
     TestResultEntity,
 )
 from app.domain.practice.practice_repository import PracticeRepository
 from app.endpoint.practice.practice_model import MessageResponse
+from app.repository.bulk_insert import bulk_insert
+from app.repository.postgres_unit_of_work import commit
 from app.schema.models import (
     Conversations,
+    ConversationLatestTestResults,
     Messages,
     ConversationTestScores,
     MessageTestScores,
 )
 
 
+@trace_methods("repository")
 class PracticePostgresRepository(PracticeRepository):
     """PostgreSQLを使用した練習機能のリポジトリ実装"""
 
@@ -84,10 +91,9 @@ class PracticePostgresRepository(PracticeRepository):
                     .values(order=order)
                 )
 
-            await self.db.commit()
+            await commit(self.db)
 
         except Exception as e:
-            await self.db.rollback()
             raise
 
     async def fetch(
@@ -123,6 +129,7 @@ class PracticePostgresRepository(PracticeRepository):
                     message_en=message.message_en,  # type: ignore
                     message_ja=message.message_ja,  # type: ignore
                     created_at=message.created_at,  # type: ignore
+                    message_en_tokens=message.message_en_tokens,  # type: ignore
                 )
                 for message in messages
             ]
@@ -139,17 +146,17 @@ class PracticePostgresRepository(PracticeRepository):
                 speaker_number=message.speaker_number,
                 message_en=message.message_en,
                 message_ja=message.message_ja,
+                message_en_tokens=SimilarityEngine.tokenize(message.message_en),
                 created_at=message.created_at,
             )
 
             self.db.add(new_message)
-            await self.db.commit()
+            await commit(self.db)
             await self.db.refresh(new_message)
 
             return message
 
         except Exception as e:
-            await self.db.rollback()
             raise
 
     async def create(self, conversation_set: ConversationEntity) -> None:
@@ -163,6 +170,7 @@ class PracticePostgresRepository(PracticeRepository):
                     speaker_number=message.speakerNumber,
                     message_en=message.messageEn,
                     message_ja=message.messageJa,
+                    message_en_tokens=message.messageEnTokens,
                     created_at=message.createdAt,
                 )
                 for message in conversation_set.messages  # type: ignore
@@ -178,90 +186,89 @@ class PracticePostgresRepository(PracticeRepository):
             )
 
             self.db.add(new_conversation)
-            await self.db.commit()
+            await commit(self.db)
 
         except Exception as e:
-            await self.db.rollback()
             raise
 
     async def save_test_result(self, test_result: TestResultEntity) -> TestResultEntity:
         """テスト結果をデータベースに保存する"""
         try:
             # 会話テストスコアを保存
-            conversation_score = ConversationTestScores(
-                conversation_id=test_result.conversation_id,
-                test_number=test_result.test_number,
-                test_score=test_result.overall_score,
-                is_pass=test_result.is_passing,
-                created_at=test_result.created_at,
+            await self.db.execute(
+                insert(ConversationTestScores).values(
+                    conversation_id=test_result.conversation_id,
+                    test_number=test_result.test_number,
+                    test_score=test_result.overall_score,
+                    is_pass=test_result.is_passing,
+                    created_at=test_result.created_at,
+                )
             )
 
-            self.db.add(conversation_score)
+            # メッセージごとのスコアをまとめて保存
+            await bulk_insert(
+                self.db,
+                MessageTestScores.__table__,  # type: ignore
+                [
+                    {
+                        "conversation_id": test_result.conversation_id,
+                        "test_number": test_result.test_number,
+                        "message_order": score.message_order,
+                        "score": score.score,
+                        "user_answer": score.userAnswer,  # Save user answer
+                    }
+                    for score in test_result.message_scores
+                ],
+            )
 
-            # メッセージごとのスコアを保存
-            for score in test_result.message_scores:
-                message_score = MessageTestScores(
-                    conversation_id=test_result.conversation_id,
-                    test_number=test_result.test_number,
-                    message_order=score.message_order,
-                    score=score.score,
-                    user_answer=score.userAnswer,  # Save user answer
+            # 最新のテスト結果を同じトランザクションで更新する
+            latest = {
+                "test_number": test_result.test_number,
+                "test_score": test_result.overall_score,
+                "message_scores": [
+                    score.score
+                    for score in sorted(
+                        test_result.message_scores, key=lambda s: s.message_order
+                    )
+                ],
+                "updated_at": test_result.created_at,
+            }
+            statement = insert(ConversationLatestTestResults).values(
+                conversation_id=test_result.conversation_id, **latest
+            )
+            await self.db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[ConversationLatestTestResults.conversation_id],
+                    set_=latest,
+                    # 並行して古いテスト結果が保存された場合は上書きしない
+                    where=ConversationLatestTestResults.test_number
+                    < statement.excluded.test_number,
                 )
-                self.db.add(message_score)
+            )
 
-            await self.db.commit()
+            await commit(self.db)
             return test_result
 
         except Exception as e:
-            await self.db.rollback()
             raise
 
-    async def get_latest_test_result(
+    async def get_latest_test_scores(
         self, conversation_id: UUID
-    ) -> Optional[TestResultEntity]:
-        """指定された会話の最新のテスト結果を取得する"""
-        try:
-            # 最新のテスト結果を取得（メッセージスコアも含めて）
-            result = await self.db.execute(
-                select(ConversationTestScores)
-                .options(selectinload(ConversationTestScores.message_scores))
-                .where(ConversationTestScores.conversation_id == conversation_id)
-                .order_by(desc(ConversationTestScores.test_number))
-                .limit(1)
-            )
-            latest_test = result.scalar_one_or_none()
-
-            if not latest_test:
-                return None
-
-            # メッセージスコアのリストを作成
-            message_scores = []
-            for item in latest_test.message_scores:
-                # メッセージの詳細を取得
-                msg_result = await self.db.execute(
-                    select(Messages)
-                    .where(Messages.conversation_id == conversation_id)
-                    .where(Messages.message_order == item.message_order)
-                )
-                msg = msg_result.scalar_one_or_none()
-
-                if msg:
-                    score = MessageScoreValueObject(
-                        message_order=item.message_order,
-                        score=item.score,
-                        isCorrect=item.score >= 90.0,
-                        userAnswer=item.user_answer,  # Retrieve user answer
-                        correctAnswer=msg.message_en,  # type: ignore
-                    )
-                    message_scores.append(score)
-
-            # TestResultエンティティを作成して返す
-            return TestResultEntity(
-                conversation_id=latest_test.conversation_id,  # type: ignore
-                test_number=latest_test.test_number,  # type: ignore
-                message_scores=message_scores,
-                created_at=latest_test.created_at,  # type: ignore
+    ) -> Optional[LatestTestResultValueObject]:
+        """指定された会話の最新のテスト結果のスコアを取得する"""
+        result = await self.db.execute(
+            select(ConversationLatestTestResults).where(
+                ConversationLatestTestResults.conversation_id == conversation_id
             )
-
-        except Exception as e:
-            raise
+        )
+        latest = result.scalar_one_or_none()
+
+        if not latest:
+            return None
+
+        return LatestTestResultValueObject(
+            conversation_id=latest.conversation_id,  # type: ignore
+            test_number=latest.test_number,  # type: ignore
+            overall_score=latest.test_score,  # type: ignore
+            message_scores=latest.message_scores,  # type: ignore
+        )
@@ -0,0 +1,43 @@
+from typing import List
+from uuid import UUID
+from app.core.tracing import trace_methods
+from app.domain.quiz.quize_entity import QuizEntity
+from app.domain.quiz.quize_repostiroy import QuizRepository
+from app.repository.quiz_catalog_store import QuizCatalogStore, quiz_catalog_store
+
+
+@trace_methods("repository")
+class QuizCatalogRepository(QuizRepository):
+    """メモリ上のクイズカタログを使用したクイズのリポジトリ実装
+
+    カタログが未読み込みの場合や、カタログにないクイズはrepositoryから取得する
+    """
+
+    def __init__(
+        self, repository: QuizRepository, store: QuizCatalogStore = quiz_catalog_store
+    ):
+        self.repository = repository
+        self.store = store
+
+    async def getById(self, quizId: UUID) -> QuizEntity:
+        """指定されたIDのクイズを取得する"""
+        catalog = self.store.catalog
+        quiz = catalog.get_quiz(quizId) if catalog else None
+        if quiz is None:
+            # 前回の更新以降に追加されたクイズの可能性があるため、DBから取得する
+            return await self.repository.getById(quizId)
+        return quiz
+
+    async def getAll(self) -> List[QuizEntity]:
+        """全てのクイズを取得する"""
+        catalog = self.store.catalog
+        if catalog is None:
+            return await self.repository.getAll()
+        return list(catalog.quizzes)
+
+    async def getAllByQuizTypeId(self, quizTypeId: UUID) -> List[QuizEntity]:
+        """指定されたタイプの全てのクイズを取得する"""
+        catalog = self.store.catalog
+        if catalog is None:
+            return await self.repository.getAllByQuizTypeId(quizTypeId)
+        return list(catalog.get_quizzes_by_type_id(quizTypeId))
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from typing import Hashable, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.domain.quiz.quiz_catalog import QuizCatalog
+from app.repository.quiz_postgres_repository import QuizPostgresRepository
+from app.repository.quiz_type_postgres_repository import QuizTypePostgresRepository
+from app.schema.models import Quiz, QuizType
+
+logger = logging.getLogger(__name__)
+
+
+class QuizCatalogStore:
+    """プロセス全体で共有するクイズカタログのスナップショットを保持する"""
+
+    def __init__(self):
+        self._catalog: Optional[QuizCatalog] = None
+
+    @property
+    def catalog(self) -> Optional[QuizCatalog]:
+        """現在のスナップショット（未読み込みの場合はNone）"""
+        return self._catalog
+
+    async def fetch_version(self, db: AsyncSession) -> Hashable:
+        """カタログのバージョンを取得する
+
+        件数と最終更新日時の組をバージョンとし、追加・削除・更新のいずれでも変化する
+        """
+        result = await db.execute(
+            select(
+                select(func.count(Quiz.quiz_id)).scalar_subquery(),
+                select(func.max(Quiz.updated_at)).scalar_subquery(),
+                select(func.count(QuizType.quiz_type_id)).scalar_subquery(),
+                select(func.max(QuizType.updated_at)).scalar_subquery(),
+            )
+        )
+        return tuple(result.one())
+
+    async def load(self, db: AsyncSession) -> QuizCatalog:
+        """データベースからカタログを読み込み、スナップショットを差し替える"""
+        version = await self.fetch_version(db)
+        quizzes = await QuizPostgresRepository(db).getAll()
+        quiz_types = await QuizTypePostgresRepository(db).getAll()
+
+        self._catalog = QuizCatalog(
+            version=version, quizzes=quizzes, quiz_types=quiz_types
+        )
+        return self._catalog
+
+    async def refresh(self, db: AsyncSession) -> bool:
+        """バージョンが変わっていればカタログを読み込み直す"""
+        if self._catalog is not None:
+            version = await self.fetch_version(db)
+            if version == self._catalog.version:
+                return False
+
+        await self.load(db)
+        return True
+
+    async def run_refresh_loop(
+        self, session_factory: async_sessionmaker[AsyncSession], interval: float
+    ) -> None:
+        """一定間隔でバージョンを確認し、変更があればカタログを更新する"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with session_factory() as db:
+                    if await self.refresh(db):
+                        logger.info("クイズカタログを更新しました")
+            except Exception:
+                logger.exception("クイズカタログの更新に失敗しました")
+
+
+# アプリケーション全体で共有するインスタンス
+quiz_catalog_store = QuizCatalogStore()
@@ -2,11 +2,13 @@ from typing import List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.core.tracing import trace_methods
 from app.domain.quiz.quize_entity import QuizEntity, DifficultyEnum
 from app.domain.quiz.quize_repostiroy import QuizRepository
 from app.schema.models import Quiz
 
 
+@trace_methods("repository")
 class QuizPostgresRepository(QuizRepository):
     """PostgreSQLを使用したクイズのリポジトリ実装"""
 
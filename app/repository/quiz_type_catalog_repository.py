@@ -0,0 +1,28 @@
+from typing import List
+from app.core.tracing import trace_methods
+from app.domain.quizType.quiz_type_entity import QuizTypeEntity
+from app.domain.quizType.quiz_type_repository import QuizTypeRepository
+from app.repository.quiz_catalog_store import QuizCatalogStore, quiz_catalog_store
+
+
+@trace_methods("repository")
+class QuizTypeCatalogRepository(QuizTypeRepository):
+    """メモリ上のクイズカタログを使用したクイズの種類のリポジトリ実装
+
+    カタログが未読み込みの場合はrepositoryから取得する
+    """
+
+    def __init__(
+        self,
+        repository: QuizTypeRepository,
+        store: QuizCatalogStore = quiz_catalog_store,
+    ):
+        self.repository = repository
+        self.store = store
+
+    async def getAll(self) -> List[QuizTypeEntity]:
+        """全てのクイズの種類を取得する"""
+        catalog = self.store.catalog
+        if catalog is None:
+            return await self.repository.getAll()
+        return list(catalog.quiz_types)
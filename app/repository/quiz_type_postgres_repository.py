@@ -1,11 +1,13 @@
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.core.tracing import trace_methods
 from app.domain.quizType.quiz_type_entity import QuizTypeEntity
 from app.domain.quizType.quiz_type_repository import QuizTypeRepository
 from app.schema.models import QuizType
 
 
+@trace_methods("repository")
 class QuizTypePostgresRepository(QuizTypeRepository):
     """PostgreSQLを使用したクイズの種類のリポジトリ実装"""
 
@@ -1,13 +1,21 @@
-from typing import List, Optional
+import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, desc
+from sqlalchemy import column, select, tuple_, update, desc, values
+from app.core.tracing import trace_methods
 from app.domain.recall.reacall_card_entity import RecallCardEntity
 from app.domain.recall.recall_card_repository import RecallCardrepository
+from app.repository.bulk_insert import bulk_insert
+from app.repository.postgres_unit_of_work import commit
 from app.schema.models import RecallCards
 
+# 一括更新1文あたりの最大行数（1行5パラメータのため、PostgreSQLの上限32767に収まる値）
+BULK_UPDATE_CHUNK_SIZE = 1000
 
+
+@trace_methods("repository")
 class RecallCardPostgresRepository(RecallCardrepository):
     """PostgreSQLを使用した練習機能のリポジトリ実装"""
 
@@ -63,6 +71,33 @@ class RecallCardPostgresRepository(RecallCardrepository):
         except Exception as e:
             raise
 
+    async def getAllByRecallCardIdsAndUserId(
+        self, recall_card_ids: List[UUID], user_id: UUID
+    ) -> List[RecallCardEntity]:
+        """複数の復習カードIDに紐づく復習カードを1回のクエリで取得する"""
+        if not recall_card_ids:
+            return []
+
+        try:
+            result = await self.db.execute(
+                select(RecallCards)
+                .where(RecallCards.recall_card_id.in_(recall_card_ids))
+                .where(RecallCards.user_id == user_id)
+            )
+            return [
+                RecallCardEntity(
+                    recallCardId=recall_card.recall_card_id,  # type: ignore
+                    userId=recall_card.user_id,  # type: ignore
+                    question=recall_card.question,  # type: ignore
+                    answer=recall_card.answer,  # type: ignore
+                    correctPoint=recall_card.correct_point,  # type: ignore
+                    reviewDeadline=recall_card.review_deadline,  # type: ignore
+                )
+                for recall_card in result.scalars().all()
+            ]
+        except Exception as e:
+            raise
+
     async def getMostOverdueDeadline(self, user_id: UUID) -> Optional[RecallCardEntity]:
         """期限が最も過ぎている復習カードを1つだけ取得する"""
         try:
@@ -86,24 +121,95 @@ class RecallCardPostgresRepository(RecallCardrepository):
         except Exception as e:
             raise
 
+    async def getDueByUserId(
+        self,
+        user_id: UUID,
+        now: datetime.datetime,
+        limit: int,
+        after: Optional[Tuple[datetime.datetime, UUID]] = None,
+    ) -> List[RecallCardEntity]:
+        """復習期限が来た復習カードを期限の古い順に最大limit件取得する"""
+        try:
+            stmt = (
+                select(RecallCards)
+                .where(RecallCards.user_id == user_id)
+                .where(RecallCards.review_deadline <= now)
+            )
+            if after is not None:
+                # キーセットページネーション（期限が同じカードはIDで順序を確定させる）
+                stmt = stmt.where(
+                    tuple_(RecallCards.review_deadline, RecallCards.recall_card_id)
+                    > tuple_(*after)
+                )
+            result = await self.db.execute(
+                stmt.order_by(
+                    RecallCards.review_deadline, RecallCards.recall_card_id
+                ).limit(limit)
+            )
+            return [
+                RecallCardEntity(
+                    recallCardId=recall_card.recall_card_id,  # type: ignore
+                    userId=recall_card.user_id,  # type: ignore
+                    question=recall_card.question,  # type: ignore
+                    answer=recall_card.answer,  # type: ignore
+                    correctPoint=recall_card.correct_point,  # type: ignore
+                    reviewDeadline=recall_card.review_deadline,  # type: ignore
+                )
+                for recall_card in result.scalars().all()
+            ]
+        except Exception as e:
+            raise
+
     async def updateAll(self, recall_cards: List[RecallCardEntity]) -> None:
         """復習カードを更新する"""
+        if not recall_cards:
+            return
+
+        # 同じカードが複数含まれる場合は後勝ちにする
+        latest_cards = list(
+            {
+                recall_card.recallCardId: recall_card for recall_card in recall_cards
+            }.values()
+        )
+
         try:
-            for recall_card in recall_cards:
+            # UPDATE ... FROM (VALUES ...) でカード枚数によらず1往復で更新する
+            for start in range(0, len(latest_cards), BULK_UPDATE_CHUNK_SIZE):
+                chunk = latest_cards[start : start + BULK_UPDATE_CHUNK_SIZE]
+                rows = values(
+                    column("recall_card_id", RecallCards.recall_card_id.type),
+                    column("question", RecallCards.question.type),
+                    column("answer", RecallCards.answer.type),
+                    column("correct_point", RecallCards.correct_point.type),
+                    column("review_deadline", RecallCards.review_deadline.type),
+                    name="v",
+                ).data(
+                    [
+                        (
+                            recall_card.recallCardId,
+                            recall_card.question,
+                            recall_card.answer,
+                            recall_card.correctPoint,
+                            recall_card.reviewDeadline,
+                        )
+                        for recall_card in chunk
+                    ]
+                )
                 stmt = (
                     update(RecallCards)
-                    .where(RecallCards.recall_card_id == recall_card.recallCardId)
+                    .where(RecallCards.recall_card_id == rows.c.recall_card_id)
                     .values(
-                        question=recall_card.question,
-                        answer=recall_card.answer,
-                        correct_point=recall_card.correctPoint,
-                        review_deadline=recall_card.reviewDeadline,
+                        question=rows.c.question,
+                        answer=rows.c.answer,
+                        correct_point=rows.c.correct_point,
+                        review_deadline=rows.c.review_deadline,
                     )
+                    .execution_options(synchronize_session=False)
                 )
                 await self.db.execute(stmt)
-            await self.db.commit()
+            # トランザクション内で呼ばれた場合はコミット・ロールバックをトランザクションに任せる
+            await commit(self.db)
         except Exception as e:
-            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to update recall cards",
@@ -112,18 +218,18 @@ class RecallCardPostgresRepository(RecallCardrepository):
     async def createAll(self, recall_cards: List[RecallCardEntity]) -> None:
         """復習カードを作成する"""
         try:
-            models = [
-                RecallCards(
-                    recall_card_id=recall_card.recallCardId,
-                    user_id=recall_card.userId,
-                    question=recall_card.question,
-                    answer=recall_card.answer,
-                    correct_point=recall_card.correctPoint,
-                    review_deadline=recall_card.reviewDeadline,
-                )
+            rows = [
+                {
+                    "recall_card_id": recall_card.recallCardId,
+                    "user_id": recall_card.userId,
+                    "question": recall_card.question,
+                    "answer": recall_card.answer,
+                    "correct_point": recall_card.correctPoint,
+                    "review_deadline": recall_card.reviewDeadline,
+                }
                 for recall_card in recall_cards
             ]
-            self.db.add_all(models)
-            await self.db.commit()
+            await bulk_insert(self.db, RecallCards.__table__, rows)  # type: ignore
+            await commit(self.db)
         except Exception as e:
             raise
@@ -1,14 +1,19 @@
-from typing import List, Optional
+import datetime
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import case, select, update
+from sqlalchemy.dialects.postgresql import insert
+from app.core.tracing import trace_methods
 from app.domain.reviewSchedule.review_schedule_entity import ReviewScheduleEntity
 from app.domain.reviewSchedule.review_schedule_repository import (
     ReviewScheduleRepository,
 )
+from app.repository.postgres_unit_of_work import commit
 from app.schema.models import ReviewSchedules
 
 
+@trace_methods("repository")
 class ReviewSchedulePostgresRepository(ReviewScheduleRepository):
     """PostgreSQL用の学習記録リポジトリ実装"""
 
@@ -26,18 +31,9 @@ class ReviewSchedulePostgresRepository(ReviewScheduleRepository):
             review_schedules = result.scalars().all()
 
             # SQLAlchemyモデルをエンティティに変換
-            return [
-                ReviewScheduleEntity(
-                    reviewScheduleId=schedule.review_schedule_id,  # type: ignore
-                    userId=schedule.user_id,  # type: ignore
-                    quizId=schedule.quiz_id,  # type: ignore
-                    reviewDeadLine=schedule.review_deadline.date(),  # type: ignore
-                )
-                for schedule in review_schedules
-            ]
+            return [_to_entity(schedule) for schedule in review_schedules]
 
         except Exception:
-            await self.db.rollback()
             raise
 
     async def get_schedule(
@@ -59,15 +55,9 @@ class ReviewSchedulePostgresRepository(ReviewScheduleRepository):
                 return None
 
             # SQLAlchemyモデルをエンティティに変換
-            return ReviewScheduleEntity(
-                reviewScheduleId=schedule.review_schedule_id,  # type: ignore
-                userId=schedule.user_id,  # type: ignore
-                quizId=schedule.quiz_id,  # type: ignore
-                reviewDeadLine=schedule.review_deadline.date(),  # type: ignore
-            )
+            return _to_entity(schedule)
 
         except Exception:
-            await self.db.rollback()
             raise
 
     async def create(
@@ -76,26 +66,15 @@ class ReviewSchedulePostgresRepository(ReviewScheduleRepository):
         """新しい復習スケジュールを作成する"""
         try:
             # SQLAlchemyモデルをエンティティに変換
-            new_schedule = ReviewSchedules(
-                review_schedule_id=reviewSchedule.reviewScheduleId,
-                user_id=reviewSchedule.userId,
-                quiz_id=reviewSchedule.quizId,
-                review_deadline=reviewSchedule.reviewDeadLine,
-            )
+            new_schedule = ReviewSchedules(**_to_values(reviewSchedule))
 
             self.db.add(new_schedule)
-            await self.db.commit()
+            await commit(self.db)
             await self.db.refresh(new_schedule)
 
-            return ReviewScheduleEntity(
-                reviewScheduleId=new_schedule.review_schedule_id,  # type: ignore
-                userId=new_schedule.user_id,  # type: ignore
-                quizId=new_schedule.quiz_id,  # type: ignore
-                reviewDeadLine=new_schedule.review_deadline.date(),  # type: ignore
-            )
+            return _to_entity(new_schedule)
 
         except Exception:
-            await self.db.rollback()
             raise
 
     async def update(
@@ -116,19 +95,119 @@ class ReviewSchedulePostgresRepository(ReviewScheduleRepository):
             if schedule is None:
                 raise ValueError("復習スケジュールが見つかりません")
 
-            # 復習期限を更新
-            schedule.review_deadline = reviewSchedule.reviewDeadLine  # type: ignore
+            # 復習期限とスコアの集計値を更新
+            for key, value in _to_values(reviewSchedule).items():
+                if key != "review_schedule_id":
+                    setattr(schedule, key, value)
 
-            await self.db.commit()
+            await commit(self.db)
             await self.db.refresh(schedule)
 
-            return ReviewScheduleEntity(
-                reviewScheduleId=schedule.review_schedule_id,  # type: ignore
-                userId=schedule.user_id,  # type: ignore
-                quizId=schedule.quiz_id,  # type: ignore
-                reviewDeadLine=schedule.review_deadline.date(),  # type: ignore
+            return _to_entity(schedule)
+
+        except Exception:
+            raise
+
+    async def upsert(
+        self, reviewSchedule: ReviewScheduleEntity
+    ) -> ReviewScheduleEntity:
+        """復習スケジュールを登録し、既に存在する場合は1回分の回答の値を集計値に加算する
+
+        存在確認・登録・更新を INSERT ... ON CONFLICT DO UPDATE の1回の往復で行う。
+        加算は読み込んだ値からではなくSQLで行うため、同じクイズへの回答が同時に保存されても
+        回答数・スコアの合計が失われない（更新した行のロックはトランザクションの終了まで保持される）。
+        """
+        try:
+            statement = insert(ReviewSchedules).values(**_to_values(reviewSchedule))
+            excluded = statement.excluded
+            statement = statement.on_conflict_do_update(
+                index_elements=[ReviewSchedules.user_id, ReviewSchedules.quiz_id],
+                set_={
+                    "answer_count": ReviewSchedules.answer_count + 1,
+                    "score_sum": ReviewSchedules.score_sum + excluded.last_score,
+                    # 今回の回答が高得点・低得点の場合は連続回数を加算し、それ以外は0に戻す
+                    "high_score_streak": case(
+                        (
+                            excluded.high_score_streak > 0,
+                            ReviewSchedules.high_score_streak + 1,
+                        ),
+                        else_=0,
+                    ),
+                    "low_score_streak": case(
+                        (
+                            excluded.low_score_streak > 0,
+                            ReviewSchedules.low_score_streak + 1,
+                        ),
+                        else_=0,
+                    ),
+                    "last_score": excluded.last_score,
+                    "updated_at": datetime.datetime.now(datetime.timezone.utc),
+                },
+            ).returning(*ReviewSchedules.__table__.columns)
+            result = await self.db.execute(statement)
+            schedule = result.one()
+            await commit(self.db)
+
+            return _to_entity(schedule)
+
+        except Exception:
+            raise
+
+    async def update_deadline(
+        self, reviewSchedule: ReviewScheduleEntity
+    ) -> ReviewScheduleEntity:
+        """復習スケジュールの復習期限だけを更新する"""
+        try:
+            result = await self.db.execute(
+                update(ReviewSchedules)
+                .where(
+                    ReviewSchedules.review_schedule_id
+                    == reviewSchedule.reviewScheduleId
+                )
+                .values(
+                    review_deadline=reviewSchedule.reviewDeadLine,
+                    updated_at=datetime.datetime.now(datetime.timezone.utc),
+                )
+                .returning(*ReviewSchedules.__table__.columns)
             )
+            schedule = result.one_or_none()
+
+            if schedule is None:
+                raise ValueError("復習スケジュールが見つかりません")
+
+            await commit(self.db)
+
+            return _to_entity(schedule)
 
         except Exception:
-            await self.db.rollback()
             raise
+
+
+def _to_values(reviewSchedule: ReviewScheduleEntity) -> Dict[str, Any]:
+    """エンティティをテーブルの列の値に変換する"""
+    return {
+        "review_schedule_id": reviewSchedule.reviewScheduleId,
+        "user_id": reviewSchedule.userId,
+        "quiz_id": reviewSchedule.quizId,
+        "review_deadline": reviewSchedule.reviewDeadLine,
+        "answer_count": reviewSchedule.answerCount,
+        "score_sum": reviewSchedule.scoreSum,
+        "high_score_streak": reviewSchedule.highScoreStreak,
+        "low_score_streak": reviewSchedule.lowScoreStreak,
+        "last_score": reviewSchedule.lastScore,
+    }
+
+
+def _to_entity(schedule: Any) -> ReviewScheduleEntity:
+    """SQLAlchemyモデル（またはRETURNINGの行）をエンティティに変換する"""
+    return ReviewScheduleEntity(
+        reviewScheduleId=schedule.review_schedule_id,
+        userId=schedule.user_id,
+        quizId=schedule.quiz_id,
+        reviewDeadLine=schedule.review_deadline.date(),
+        answerCount=schedule.answer_count,
+        scoreSum=schedule.score_sum,
+        highScoreStreak=schedule.high_score_streak,
+        lowScoreStreak=schedule.low_score_streak,
+        lastScore=schedule.last_score,
+    )
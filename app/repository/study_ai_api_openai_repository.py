@@ -4,10 +4,12 @@ from langchain_core.language_models.chat_models import (
 
 from langchain_core.prompts import ChatPromptTemplate
 
+from app.core.tracing import trace_methods
 from app.domain.userAnswer.ai_evaluation_value_object import AIEvaluationValueObject
 from app.domain.userAnswer.study_ai_api_repository import StudyAiApiRepository
 
 
+@trace_methods("repository")
 class StudyAIAPIOpenAIRepository(StudyAiApiRepository):
     """"""
 
@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
+from app.core.tracing import trace_methods
 from app.domain.studyRecord.study_record_entity import StudyRecordEntity
 from app.domain.studyRecord.study_record_repository import StudyRecordRepository
 from app.domain.studyRecord.dailyt_study_record_value_object import (
@@ -11,6 +12,7 @@ from app.domain.studyRecord.dailyt_study_record_value_object import (
 from app.schema.models import StudyRecords
 
 
+@trace_methods("repository")
 class StudyRecordPostgresRepository(StudyRecordRepository):
     """PostgreSQL用の学習記録リポジトリ実装"""
 
@@ -2,12 +2,15 @@ from typing import List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.core.tracing import trace_methods
 from app.domain.userAnswer.user_answer_entity import UserAnswerEntity
 from app.domain.userAnswer.user_answer_repository import UserAnswerRepository
 from app.domain.userAnswer.ai_evaluation_value_object import AIEvaluationValueObject
+from app.repository.postgres_unit_of_work import commit
 from app.schema.models import UserAnswers
 
 
+@trace_methods("repository")
 class UserAnswerPostgresRepository(UserAnswerRepository):
     """PostgreSQLを使用したユーザーの回答のリポジトリ実装"""
 
@@ -106,7 +109,6 @@ class UserAnswerPostgresRepository(UserAnswerRepository):
                 model_answer=userAnswerEntity.aiEvaluation.modelAnswer,
             )
             self.db.add(new_user_answer)
-            await self.db.commit()
+            await commit(self.db)
         except Exception as e:
-            await self.db.rollback()
             raise e
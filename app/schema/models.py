@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from app.core.database import Base
 from sqlalchemy.orm import relationship
 import uuid
@@ -10,6 +10,7 @@ from sqlalchemy import (
     Float,
     ForeignKey,
     ForeignKeyConstraint,
+    Index,
     String,
     Integer,
     Boolean,
@@ -56,6 +57,16 @@ class VerificationCodes(Base):
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
 
+    __table_args__ = (
+        # 有効な認証コードの検索用
+        Index(
+            "ix_verification_codes_email_is_used_expires_at",
+            "email",
+            "is_used",
+            "expires_at",
+        ),
+    )
+
 
 class PasswordResetTokens(Base):
     __tablename__ = "password_reset_tokens"
@@ -199,6 +210,11 @@ class UserAnswers(Base):
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
+    __table_args__ = (
+        # ユーザーごと・クイズごとの回答履歴の検索用
+        Index("ix_user_answers_user_id_quiz_id", "user_id", "quiz_id"),
+    )
+
     # リレーションシップ
     quiz = relationship("Quiz", back_populates="user_answers")
     user = relationship("Users", back_populates="user_answers")
@@ -217,6 +233,28 @@ class ReviewSchedules(Base):
         UUID(as_uuid=True), ForeignKey("quizzes.quiz_id"), nullable=False, index=True
     )
     review_deadline = Column(DateTime(timezone=True), nullable=False)
+    # 回答履歴を読み直さずに復習期限を計算するための集計値
+    answer_count = Column(
+        Integer, nullable=False, default=0, server_default="0", comment="回答数"
+    )
+    score_sum = Column(
+        Integer, nullable=False, default=0, server_default="0", comment="スコアの合計"
+    )
+    high_score_streak = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="直近の連続高得点の回数",
+    )
+    low_score_streak = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="直近の連続低得点の回数",
+    )
+    last_score = Column(Integer, nullable=True, comment="最新スコア")
     created_at = Column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -226,6 +264,16 @@ class ReviewSchedules(Base):
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
+    __table_args__ = (
+        # ユーザーごと・クイズごとの復習スケジュールの検索用
+        # 回答時に INSERT ... ON CONFLICT で登録・更新するため一意にする
+        Index("ix_review_schedules_user_id_quiz_id", "user_id", "quiz_id", unique=True),
+        # 期限切れの復習スケジュールの検索用
+        Index(
+            "ix_review_schedules_user_id_review_deadline", "user_id", "review_deadline"
+        ),
+    )
+
     # リレーションシップ
     quiz = relationship("Quiz", back_populates="review_schedules")
     user = relationship("Users", back_populates="review_schedules")
@@ -244,6 +292,11 @@ class Conversations(Base):
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
 
+    __table_args__ = (
+        # ユーザーの会話セットを新しい順に取得するためのインデックス
+        Index("ix_conversations_user_id_created_at", "user_id", created_at.desc()),
+    )
+
     # リレーションシップ
     messages = relationship("Messages", back_populates="conversation")
     test_scores = relationship("ConversationTestScores", back_populates="conversation")
@@ -260,6 +313,10 @@ class Messages(Base):
     speaker_number = Column(Integer, nullable=False)
     message_en = Column(String, nullable=False)
     message_ja = Column(String, nullable=False)
+    # 採点時に再計算しないよう、保存時に message_en をトークン化しておく
+    message_en_tokens = Column(
+        ARRAY(String), nullable=True, comment="英語メッセージのトークン列"
+    )
     created_at = Column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -309,6 +366,24 @@ class MessageTestScores(Base):
     test = relationship("ConversationTestScores", back_populates="message_scores")
 
 
+class ConversationLatestTestResults(Base):
+    """会話セットごとの最新のテスト結果（前回のスコアを1回の読み込みで取得するため）"""
+
+    __tablename__ = "conversation_latest_test_results"
+
+    conversation_id = Column(
+        UUID(as_uuid=True), ForeignKey("conversations.id"), primary_key=True
+    )
+    test_number = Column(Integer, nullable=False)
+    test_score = Column(Float, nullable=False)
+    message_scores = Column(
+        ARRAY(Float), nullable=False, comment="メッセージの順番に並べたスコア"
+    )
+    updated_at = Column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+
 class LearningHistories(Base):
     __tablename__ = "learning_histories"
 
@@ -351,5 +426,15 @@ class RecallCards(Base):
         comment="作成日時",
     )
 
+    __table_args__ = (
+        # 期限が来たカードをユーザーごとに期限順（同じ期限はID順）で取得するためのインデックス
+        Index(
+            "ix_recall_cards_user_id_review_deadline_recall_card_id",
+            "user_id",
+            "review_deadline",
+            "recall_card_id",
+        ),
+    )
+
     # リレーションシップ
     user = relationship("Users", back_populates="recall_cards")
@@ -1,5 +1,7 @@
 from pydantic import ValidationError
 from app.core.app_exception import BadRequestError
+from app.core.request_logging import bind_user_id
+from app.core.tracing import trace_methods
 from app.domain.auth.auth_repository import AuthRepository
 from app.domain.auth.login_information_value_object import LoginInformationValueObject
 from app.domain.email.emai_repository import EmailRepository
@@ -11,6 +13,7 @@ from app.endpoint.auth.auth_model import (
 )
 
 
+@trace_methods("service")
 class AuthService:
     """認証サービスクラス"""
 
@@ -88,6 +91,8 @@ class AuthService:
         """現在のユーザー情報を取得"""
         try:
             entity = await self.dbRepository.get_current_user(token)
+            # このリクエストのログにユーザーIDを付与する
+            bind_user_id(entity.userId)
             return UserResponse(
                 id=entity.userId, email=entity.email, is_active=entity.isActive
             )
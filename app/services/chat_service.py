@@ -14,8 +14,10 @@ from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
 from langchain_core.output_parsers import StrOutputParser
 from app.core.config import settings
+from app.core.tracing import trace_methods
 
 
+@trace_methods("service")
 class ChatService:
     def __init__(self):
         self.llm = ChatOpenAI(
@@ -1,5 +1,6 @@
 import datetime
 from uuid import UUID
+from app.core.tracing import trace_methods
 from app.domain.quiz.quize_repostiroy import QuizRepository
 
 from app.domain.reviewSchedule.review_schedule_domain_service import (
@@ -14,6 +15,7 @@ from app.domain.userAnswer.user_answer_repository import UserAnswerRepository
 from app.endpoint.home.home_model import HomeResponse
 
 
+@trace_methods("service")
 class HomeService:
     def __init__(
         self,
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List, Tuple, Union
 from uuid import UUID, uuid4
 import re
 from typing import List
@@ -7,15 +7,19 @@ from typing import List
 from pydantic import ValidationError
 
 from app.core.app_exception import BadRequestError, ConflictError, NotFoundError
+from app.core.cpu_executor import cpu_executor
+from app.core.tracing import trace_methods
 from app.domain.practice.conversation_entity import ConversationEntity, MessageEntity
 from app.domain.practice.practice_api_repotiroy import PracticeApiRepository
 from app.domain.practice.practice_repository import PracticeRepository
+from app.domain.practice.similarity_engine import SimilarityEngine
 from app.domain.practice.test_result_entity import (
     MessageScoreValueObject,
     TestResultEntity,
 )
 from app.domain.recall.reacall_card_entity import RecallCardEntity
 from app.domain.recall.recall_card_repository import RecallCardrepository
+from app.domain.unit_of_work import UnitOfWork
 from app.endpoint.practice.practice_model import (
     Conversation,
     ConversationCreatedResponse,
@@ -23,23 +27,35 @@ from app.endpoint.practice.practice_model import (
     ConversationSetCreateRequest,
     ConversationsResponse,
     MessageResponse,
+    DiffSpan,
+    MessageTestDiffResult,
+    MessageTestDiffResultSummary,
     MessageTestResult,
     MessageTestResultSummary,
     RecallTestRequest,
 )
 
+# 句読点（前にスペースを入れないトークン）
+PUNCTUATION_PATTERN = re.compile(r"[.,;!?]")
+
+# difflib形式のタグと、構造化された差分で使う操作コードの対応（一致は返さない）
+DIFF_OP_CODES = {"delete": "d", "insert": "i", "replace": "r"}
+
 
+@trace_methods("service")
 class PracticeService:
     def __init__(
         self,
         practiceRepository: PracticeRepository,
         recallCardRepository: RecallCardrepository,
         apiRepository: PracticeApiRepository,
+        unitOfWork: UnitOfWork,
     ):
         # 何もしない
         self.dbRepository = practiceRepository
         self.dbRecallCardRepository = recallCardRepository
         self.apiRepository = apiRepository
+        self.unitOfWork = unitOfWork
 
     async def ai_registration(
         self, user_id: UUID, request: ConversationSetCreateRequest
@@ -79,10 +95,7 @@ class PracticeService:
                 ],
             )
 
-            # データベースに保存
-            await self.dbRepository.create(conversation_set)
-
-            # 暗記カードに保存
+            # 暗記カードを作成
             recall_cards = [
                 RecallCardEntity(
                     recallCardId=uuid4(),
@@ -94,7 +107,11 @@ class PracticeService:
                 )
                 for message in valueObject.messages
             ]
-            await self.dbRecallCardRepository.createAll(recall_cards)
+
+            # 会話セットと暗記カードを1つのトランザクションで保存する
+            async with self.unitOfWork.transaction():
+                await self.dbRepository.create(conversation_set)
+                await self.dbRecallCardRepository.createAll(recall_cards)
 
             # Pydanticモデルを返す
             return ConversationCreatedResponse(id=conversation_id)
@@ -228,15 +245,16 @@ class PracticeService:
     # トークンを連結する際に適切なスペースを入れる
     @staticmethod
     def join_tokens(tokens: List[str]) -> str:
-        result = ""
+        parts = []
         for i, token in enumerate(tokens):
             # 句読点の前にはスペースを入れない
-            if i > 0 and not re.match(r"[.,;!?]", token):
-                result += " "
-            result += token
-        return result
+            if i > 0 and not PUNCTUATION_PATTERN.match(token):
+                parts.append(" ")
+            parts.append(token)
+        return "".join(parts)
 
-    def _generate_diff_html(self, user_tokens: List[str], correct_tokens: List[str]):
+    @staticmethod
+    def _generate_diff_html(user_tokens: List[str], correct_tokens: List[str]):
         """差分に基づいてHTMLマークアップを生成する"""
         diff_blocks = MessageScoreValueObject.get_diff_blocks(
             user_tokens, correct_tokens
@@ -246,34 +264,97 @@ class PracticeService:
         for tag, i1, i2, j1, j2 in diff_blocks:
             if tag == "equal":
                 # 両方に存在するトークン
-                for k in range(i1, i2):
-                    user_html.append(user_tokens[k])
-                for k in range(j1, j2):
-                    correct_html.append(correct_tokens[k])
-            elif tag == "delete":
-                # ユーザーの解答にあって正解にないトークン（余分なトークン）
-                for k in range(i1, i2):
-                    user_html.append(f"<del>{user_tokens[k]}</del>")
-            elif tag == "insert":
-                # 正解にあってユーザーの解答にないトークン（不足しているトークン）
-                for k in range(j1, j2):
-                    correct_html.append(
-                        f'<span style="color:red">{correct_tokens[k]}</span>'
-                    )
-            elif tag == "replace":
-                # 置換されたトークン
-                for k in range(i1, i2):
-                    user_html.append(f"<del>{user_tokens[k]}</del>")
-                for k in range(j1, j2):
-                    correct_html.append(
-                        f'<span style="color:red">{correct_tokens[k]}</span>'
-                    )
-        return self.join_tokens(user_html), self.join_tokens(correct_html)
+                user_html += user_tokens[i1:i2]
+                correct_html += correct_tokens[j1:j2]
+            if tag in ("delete", "replace"):
+                # ユーザーの解答にあって正解にないトークン（余分・置換されたトークン）
+                user_html += [f"<del>{token}</del>" for token in user_tokens[i1:i2]]
+            if tag in ("insert", "replace"):
+                # 正解にあってユーザーの解答にないトークン（不足・置換されたトークン）
+                correct_html += [
+                    f'<span style="color:red">{token}</span>'
+                    for token in correct_tokens[j1:j2]
+                ]
+        return (
+            PracticeService.join_tokens(user_html),
+            PracticeService.join_tokens(correct_html),
+        )
+
+    @staticmethod
+    def _generate_diff_spans(
+        user_answer: str,
+        correct_answer: str,
+        user_tokens: List[str],
+        correct_tokens: List[str],
+    ) -> List[DiffSpan]:
+        """差分を操作コードと元の文字列での文字位置の範囲で表す
+
+        文字位置は差分を求めたトークン列（保存済みのトークンを含む）から求めるため、
+        差分の添字と文字位置が同じトークンを指す。
+        """
+        user_offsets = SimilarityEngine.locate_tokens(user_answer, user_tokens)
+        correct_offsets = SimilarityEngine.locate_tokens(correct_answer, correct_tokens)
+
+        def char_range(offsets, text: str, start: int, end: int) -> Tuple[int, int]:
+            # トークンを含まない範囲は、次のトークンの開始位置（末尾なら文字列の長さ）
+            if start == end:
+                position = offsets[start][0] if start < len(offsets) else len(text)
+                return position, position
+            return offsets[start][0], offsets[end - 1][1]
+
+        return [
+            (
+                DIFF_OP_CODES[tag],
+                *char_range(user_offsets, user_answer, i1, i2),
+                *char_range(correct_offsets, correct_answer, j1, j2),
+            )
+            for tag, i1, i2, j1, j2 in MessageScoreValueObject.get_diff_blocks(
+                user_tokens, correct_tokens
+            )
+            if tag != "equal"
+        ]
+
+    @staticmethod
+    def _grade(
+        conversation_id: UUID,
+        test_number: int,
+        answers: List[Dict[str, Any]],
+        structured_diff: bool = False,
+    ) -> Tuple[TestResultEntity, List[Any]]:
+        """採点と差分の生成を行う（ワーカープロセスでも実行できるようにしている）
+
+        差分は structured_diff が真なら文字位置の範囲、偽ならHTMLで返す。
+        """
+        test_result = TestResultEntity.factory(
+            conversation_id=conversation_id,
+            test_number=test_number,
+            answers=answers,
+        )
+        diffs = [
+            (
+                PracticeService._generate_diff_spans(
+                    score.userAnswer,
+                    score.correctAnswer,
+                    score.get_tokenized_user_answer,
+                    score.get_tokenized_correct_answer,
+                )
+                if structured_diff
+                else PracticeService._generate_diff_html(
+                    score.get_tokenized_user_answer,
+                    score.get_tokenized_correct_answer,
+                )
+            )
+            for score in test_result.message_scores
+        ]
+        return test_result, diffs
 
     async def post_test_results(
-        self, user_id: UUID, request: RecallTestRequest
-    ) -> MessageTestResultSummary:
-        """テスト結果を処理し、データベースに保存する"""
+        self, user_id: UUID, request: RecallTestRequest, structured_diff: bool = False
+    ) -> Union[MessageTestResultSummary, MessageTestDiffResultSummary]:
+        """テスト結果を処理し、データベースに保存する
+
+        structured_diff が真の場合は、差分をHTMLではなく文字位置の範囲で返す。
+        """
         try:
             # リクエストの会話IDから会話セットを取得
             conversation = await self.dbRepository.fetch(
@@ -281,7 +362,7 @@ class PracticeService:
             )
 
             # 前回のテスト結果を取得
-            last_test_result = await self.dbRepository.get_latest_test_result(
+            last_test_result = await self.dbRepository.get_latest_test_scores(
                 request.conversation_id
             )
 
@@ -306,35 +387,63 @@ class PracticeService:
                             message.message_order - 1
                         ].user_answer,
                         "correct_answer": message.message_en,
+                        # 保存時にトークン化済みの正解（古いデータはNone）
+                        "correct_tokens": message.message_en_tokens,
                     }
                 )
 
-            # ドメインエンティティを作成
-            test_result = TestResultEntity.factory(
-                conversation_id=request.conversation_id,
-                test_number=test_number,
-                answers=answers,
+            # 採点する（長い会話はイベントループを止めないようワーカープロセスで行う）
+            test_result, diffs = await cpu_executor.run(
+                sum(
+                    len(answer["user_answer"]) + len(answer["correct_answer"])
+                    for answer in answers
+                ),
+                self._grade,
+                request.conversation_id,
+                test_number,
+                answers,
+                structured_diff,
             )
 
             # テスト結果をデータベースに保存
             saved_result = await self.dbRepository.save_test_result(test_result)
 
-            result_items = []
-            for score in test_result.message_scores:
-                # ユーザーの解答と正解をHTMLとしてフォーマット
-                user_html, correct_html = self._generate_diff_html(
-                    score.get_tokenized_user_answer,
-                    score.get_tokenized_correct_answer,
+            # 前回のスコアを検索
+            last_scores = [
+                (
+                    last_test_result.get_message_score(score.message_order)
+                    if last_test_result
+                    else None
                 )
+                for score in test_result.message_scores
+            ]
 
-                # 前回のスコアを検索
-                last_score = None
-                if last_test_result:
-                    last_score = last_test_result.message_scores[
-                        score.message_order - 1
-                    ].score
+            last_correct_rate = (
+                last_test_result.overall_score if last_test_result else None
+            )
 
-                result_items.append(
+            if structured_diff:
+                return MessageTestDiffResultSummary(
+                    correct_rate=test_result.overall_score,
+                    last_correct_rate=last_correct_rate,
+                    result=[
+                        MessageTestDiffResult(
+                            message_order=score.message_order,
+                            spans=spans,
+                            is_correct=score.isCorrect,
+                            similarity_to_correct=score.score,
+                            last_similarity_to_correct=last_score,
+                        )
+                        for score, spans, last_score in zip(
+                            test_result.message_scores, diffs, last_scores
+                        )
+                    ],
+                )
+
+            return MessageTestResultSummary(
+                correct_rate=test_result.overall_score,
+                last_correct_rate=last_correct_rate,
+                result=[
                     MessageTestResult(
                         message_order=score.message_order,
                         user_answer=user_html,
@@ -343,14 +452,10 @@ class PracticeService:
                         similarity_to_correct=score.score,
                         last_similarity_to_correct=last_score,
                     )
-                )
-
-            return MessageTestResultSummary(
-                correct_rate=test_result.overall_score,
-                last_correct_rate=(
-                    last_test_result.overall_score if last_test_result else None
-                ),
-                result=result_items,
+                    for score, (user_html, correct_html), last_score in zip(
+                        test_result.message_scores, diffs, last_scores
+                    )
+                ],
             )
 
         except ValidationError as e:
@@ -1,14 +1,23 @@
+import base64
+import datetime
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
-from app.core.app_exception import NotFoundError
+from app.core.app_exception import BadRequestError, NotFoundError
+from app.core.cpu_executor import cpu_executor
+from app.core.tracing import trace_methods
 
+from app.domain.recall.reacall_card_entity import RecallCardEntity
 from app.domain.recall.recall_card_repository import RecallCardrepository
 
 from app.endpoint.recall.recall_model import (
     NextRecallCardResponse,
     RecallCardAnswerRequest,
+    RecallCardAnswersRequest,
+    RecallCardQueueResponse,
 )
 
 
+@trace_methods("service")
 class RecallCardService:
     def __init__(self, repository: RecallCardrepository):
         self.dbRepository = repository
@@ -25,6 +34,54 @@ class RecallCardService:
             question=recall_card.question,
         )
 
+    async def get_recall_card_queue(
+        self, user_id: UUID, limit: int, cursor: Optional[str] = None
+    ) -> RecallCardQueueResponse:
+        """復習期限が来た暗記カードを期限の古い順にまとめて取得する"""
+
+        after = self._decode_cursor(cursor) if cursor else None
+        recall_cards = await self.dbRepository.getDueByUserId(
+            user_id,
+            now=datetime.datetime.now(datetime.timezone.utc),
+            limit=limit,
+            after=after,
+        )
+
+        # 取得件数がlimitに満たない場合は続きがない
+        next_cursor = None
+        if len(recall_cards) == limit:
+            last = recall_cards[-1]
+            next_cursor = self._encode_cursor(last.reviewDeadline, last.recallCardId)
+
+        return RecallCardQueueResponse(
+            recall_cards=[
+                NextRecallCardResponse(
+                    recall_card_id=recall_card.recallCardId,
+                    question=recall_card.question,
+                )
+                for recall_card in recall_cards
+            ],
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    def _encode_cursor(review_deadline: datetime.datetime, recall_card_id: UUID) -> str:
+        """最後に取得したカードの(復習期限, ID)をカーソル文字列に変換する"""
+        raw = f"{review_deadline.isoformat()}|{recall_card_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime.datetime, UUID]:
+        """カーソル文字列を(復習期限, ID)に戻す"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            review_deadline, recall_card_id = raw.split("|")
+            return datetime.datetime.fromisoformat(review_deadline), UUID(
+                recall_card_id
+            )
+        except ValueError as e:
+            raise BadRequestError("カーソルが不正です。") from e
+
     async def update_recall_card(
         self, user_id: UUID, request: RecallCardAnswerRequest
     ) -> None:
@@ -37,7 +94,55 @@ class RecallCardService:
         if not recall_card:
             raise NotFoundError("指定された暗記カードが見つかりません。")
 
-        # 回答の更新
-        new_recall_card = recall_card.update_by_user_answer(user_answer=request.answer)
+        # 回答の更新（長い回答はワーカープロセスで採点する）
+        new_recall_card = await cpu_executor.run(
+            len(request.answer) + len(recall_card.answer),
+            recall_card.update_by_user_answer,
+            user_answer=request.answer,
+        )
 
         await self.dbRepository.updateAll([new_recall_card])
+
+    async def update_recall_cards(
+        self, user_id: UUID, request: RecallCardAnswersRequest
+    ) -> None:
+        """複数の暗記カードの回答をまとめて更新する"""
+        # 同じカードへの回答が複数ある場合は順番に適用する
+        recall_card_ids = list(
+            dict.fromkeys(answer.recall_card_id for answer in request.answers)
+        )
+        recall_cards = await self.dbRepository.getAllByRecallCardIdsAndUserId(
+            recall_card_ids, user_id=user_id
+        )
+        recall_card_map = {
+            recall_card.recallCardId: recall_card for recall_card in recall_cards
+        }
+
+        if len(recall_card_map) != len(recall_card_ids):
+            raise NotFoundError("指定された暗記カードが見つかりません。")
+
+        # 回答の更新（メモリ上で適用し、最後にまとめて保存する）
+        answers = [(answer.recall_card_id, answer.answer) for answer in request.answers]
+        recall_card_map = await cpu_executor.run(
+            sum(
+                len(answer) + len(recall_card_map[recall_card_id].answer)
+                for recall_card_id, answer in answers
+            ),
+            self._apply_answers,
+            recall_card_map,
+            answers,
+        )
+
+        await self.dbRepository.updateAll(list(recall_card_map.values()))
+
+    @staticmethod
+    def _apply_answers(
+        recall_card_map: Dict[UUID, RecallCardEntity], answers: List[Tuple[UUID, str]]
+    ) -> Dict[UUID, RecallCardEntity]:
+        """回答を順番に適用した暗記カードを返す（ワーカープロセスでも実行できる）"""
+        recall_card_map = dict(recall_card_map)
+        for recall_card_id, answer in answers:
+            recall_card_map[recall_card_id] = recall_card_map[
+                recall_card_id
+            ].update_by_user_answer(user_answer=answer)
+        return recall_card_map
@@ -1,6 +1,7 @@
 import datetime
 from typing import Optional
 from uuid import UUID, uuid4
+from app.core.tracing import trace_methods
 from app.domain.quiz.quize_repostiroy import QuizRepository
 
 from app.domain.quizType.quiz_type_repository import QuizTypeRepository
@@ -8,6 +9,7 @@ from app.domain.reviewSchedule.review_schedule_entity import ReviewScheduleEntit
 from app.domain.reviewSchedule.review_schedule_repository import (
     ReviewScheduleRepository,
 )
+from app.domain.unit_of_work import UnitOfWork
 from app.domain.userAnswer.ai_evaluation_value_object import AIEvaluationValueObject
 from app.domain.userAnswer.study_ai_api_repository import StudyAiApiRepository
 from app.domain.userAnswer.user_answer_domain_service import UserAnswerDomainService
@@ -27,6 +29,7 @@ from app.endpoint.study.study_model import (
 )
 
 
+@trace_methods("service")
 class StudyService:
     def __init__(
         self,
@@ -35,12 +38,14 @@ class StudyService:
         quiZTypeRepository: QuizTypeRepository,
         reviewScheduleRepository: ReviewScheduleRepository,
         aiAPIRepository: StudyAiApiRepository,
+        unitOfWork: UnitOfWork,
     ):
         self.quizRepository = quizRepository
         self.userAnswerRepository = userAnswerRepository
         self.quiZTypeRepository = quiZTypeRepository
         self.reviewScheduleRepository = reviewScheduleRepository
         self.aiAPIRepository = aiAPIRepository
+        self.unitOfWork = unitOfWork
 
     async def get_quiz_type(self) -> QuizTypesResponse:
         """クイズの種類選択画面の情報を取得する。"""
@@ -151,6 +156,8 @@ class StudyService:
             user_id, quiz.quizId
         )
 
+        quiz_types = await self.quiZTypeRepository.getAll()
+
         return QuizStudyRecordResponse(
             user_answers=[
                 UserAnswerResponse(
@@ -168,7 +175,7 @@ class StudyService:
                 type=next(
                     (
                         quiz_type.name
-                        for quiz_type in await self.quiZTypeRepository.getAll()
+                        for quiz_type in quiz_types
                         if quiz_type.quizTypeId == quiz.quizTypeId
                     ),
                     "",
@@ -203,43 +210,25 @@ class StudyService:
             answeredAt=datetime.datetime.now(),
         )
 
-        # ユーザーの回答、及びAIの回答を保存する
-        await self.userAnswerRepository.create(userAnswerEntity=user_answer_entity)
-
-        # ユーザーの復習日程を更新する
-        # 現在のユーザーの復習日程を取得する
-        review_schedule = await self.reviewScheduleRepository.get_schedule(
-            user_id, quiz.quizId
-        )
+        # 回答の保存と復習日程の更新を1つのトランザクションで行う
+        async with self.unitOfWork.transaction():
+            # ユーザーの回答、及びAIの回答を保存する
+            await self.userAnswerRepository.create(userAnswerEntity=user_answer_entity)
 
-        # 復習日程が存在しない場合は新規作成
-        if review_schedule is None:
-            review_schedule_entity = ReviewScheduleEntity(
-                reviewScheduleId=uuid4(),
-                userId=user_id,
-                quizId=quiz.quizId,
-                reviewDeadLine=datetime.datetime.now()
-                + datetime.timedelta(seconds=1),  # 1秒後を設定
-            )
-            review_schedule_entity = await self.reviewScheduleRepository.create(
-                reviewSchedule=review_schedule_entity
-            )
-        else:
-            # 今までのユーザーの回答を取得
-            user_answers = await self.userAnswerRepository.getAllByQuizIdUserId(
-                user_id, quiz.quizId
+            # 復習日程が存在しない場合は新規作成し、存在する場合は
+            # 今回の点数をデータベース側でスコアの集計値に加える
+            review_schedule = await self.reviewScheduleRepository.upsert(
+                reviewSchedule=ReviewScheduleEntity.create_first(
+                    userId=user_id, quizId=quiz.quizId, score=evaluation.score
+                )
             )
 
-            # 点数のリストを取得
-            scores = [answer.aiEvaluation.score for answer in user_answers]
-
-            # 復習日程が存在する場合は更新
-            review_schedule_entity = review_schedule_entity = review_schedule.update(
-                scores=scores
-            )
-            review_schedule_entity = await self.reviewScheduleRepository.update(
-                reviewSchedule=review_schedule_entity
-            )
+            # 加算後の集計値から復習期限を更新する
+            # （upsertで更新した行はトランザクションの終了までロックされている）
+            if review_schedule.answerCount > 1:
+                await self.reviewScheduleRepository.update_deadline(
+                    reviewSchedule=review_schedule.reschedule()
+                )
 
         return QuizAnswerResponse(
             score=evaluation.score,
@@ -0,0 +1,105 @@
+"""暗記カードの一括登録のベンチマーク（ORM・Core・COPYの比較）
+
+実行方法:
+    python -m benchmarks.bulk_insert
+
+ASYNC_DATABASE_URL で指定したデータベースにベンチマーク用のユーザーと
+暗記カードを作成し、計測後に削除する。
+"""
+
+import asyncio
+import datetime
+from typing import Any, Dict, List
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.repository.bulk_insert import copy_insert
+from app.schema.models import RecallCards, Users
+from benchmarks.utils import measure_async, print_table
+
+ROW_COUNTS = [10, 100, 1000]
+REPEAT = 5
+
+
+def generate_rows(user_id: UUID, count: int) -> List[Dict[str, Any]]:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return [
+        {
+            "recall_card_id": uuid4(),
+            "user_id": user_id,
+            "question": f"質問{i}",
+            "answer": f"Answer {i}",
+            "correct_point": 0,
+            "review_deadline": now,
+            "created_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+async def insert_with_orm(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """変更前の実装と同じくORMオブジェクトを追加してコミットする"""
+    db.add_all([RecallCards(**row) for row in rows])
+    await db.commit()
+
+
+async def insert_with_core(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    await db.execute(insert(RecallCards), rows)
+    await db.commit()
+
+
+async def insert_with_copy(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    await copy_insert(db, RecallCards.__table__, rows)  # type: ignore
+    await db.commit()
+
+
+async def main() -> None:
+    engine = create_async_engine(settings.ASYNC_DATABASE_URL)
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    user_id = uuid4()
+    rows = []
+    async with session_factory() as db:
+        db.add(
+            Users(
+                id=user_id,
+                email=f"bench-{user_id}@example.com",
+                hashed_password="benchmark",
+            )
+        )
+        await db.commit()
+
+        try:
+            for count in ROW_COUNTS:
+                result: Dict[str, Any] = {"rows": count}
+                for name, method in [
+                    ("orm", insert_with_orm),
+                    ("core", insert_with_core),
+                    ("copy", insert_with_copy),
+                ]:
+                    measured = await measure_async(
+                        lambda: method(db, generate_rows(user_id, count)), REPEAT
+                    )
+                    result[f"{name}_median_ms"] = measured["median_ms"]
+                    # 毎回同じ件数のテーブルに登録するよう削除しておく
+                    await db.execute(
+                        delete(RecallCards).where(RecallCards.user_id == user_id)
+                    )
+                    await db.commit()
+                rows.append(result)
+        finally:
+            await db.execute(delete(RecallCards).where(RecallCards.user_id == user_id))
+            await db.execute(delete(Users).where(Users.id == user_id))
+            await db.commit()
+
+    await engine.dispose()
+    print_table("暗記カードの一括登録", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
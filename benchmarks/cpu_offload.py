@@ -0,0 +1,112 @@
+"""採点処理のプロセスプールへのオフロードのベンチマーク
+
+長い会話の採点を同時に行っている間に、短いリクエストの応答時間が
+どれだけ悪化するかを、イベントループ上で採点する場合と比較する。
+
+実行方法:
+    python -m benchmarks.cpu_offload
+
+アプリケーションでのオフロードは既定で無効（CPU_EXECUTOR_WORKERS=0）のため、
+この結果を見てワーカー数を環境変数で指定する。
+"""
+
+import asyncio
+import random
+import statistics
+import time
+from typing import Dict, List, Tuple
+from uuid import uuid4
+
+from app.core.cpu_executor import CpuExecutor
+from app.services.practice_service import PracticeService
+from benchmarks.practice_scoring import generate_conversation
+from benchmarks.utils import print_table
+
+# 長い会話（1メッセージあたりの単語数, メッセージ数）と同時に採点する件数
+HEAVY_CONVERSATION = (300, 40)
+HEAVY_REQUESTS = 8
+# 短いリクエストの件数と送信間隔（秒）
+LIGHT_REQUESTS = 200
+LIGHT_INTERVAL = 0.002
+THRESHOLD = 4000
+WORKERS = 2
+
+
+def to_answers(pairs: List[Tuple[str, str]]) -> List[Dict[str, object]]:
+    return [
+        {"message_order": i + 1, "user_answer": user, "correct_answer": correct}
+        for i, (user, correct) in enumerate(pairs)
+    ]
+
+
+async def grade(
+    executor: CpuExecutor, answers: List[Dict[str, object]], arrived: float
+) -> float:
+    """post_test_results と同じ方法で採点し、受け付けてからの時間（ミリ秒）を返す
+
+    イベントループが塞がれて実行が始まるまで待たされた時間も含めて計測する。
+    """
+    await executor.run(
+        sum(len(a["user_answer"]) + len(a["correct_answer"]) for a in answers),  # type: ignore
+        PracticeService._grade,
+        uuid4(),
+        1,
+        answers,
+    )
+    return (time.perf_counter() - arrived) * 1000
+
+
+async def run_scenario(
+    executor: CpuExecutor,
+    heavy: List[Dict[str, object]],
+    light: List[Dict[str, object]],
+) -> Dict[str, float]:
+    # 短いリクエストを一定間隔で送りながら、途中で長い会話の採点を割り込ませる
+    heavy_every = LIGHT_REQUESTS // HEAVY_REQUESTS
+    light_tasks = []
+    heavy_tasks = []
+    for i in range(LIGHT_REQUESTS):
+        if i % heavy_every == 0 and len(heavy_tasks) < HEAVY_REQUESTS:
+            heavy_tasks.append(
+                asyncio.create_task(grade(executor, heavy, time.perf_counter()))
+            )
+        light_tasks.append(
+            asyncio.create_task(grade(executor, light, time.perf_counter()))
+        )
+        await asyncio.sleep(LIGHT_INTERVAL)
+
+    light_durations = await asyncio.gather(*light_tasks)
+    heavy_durations = await asyncio.gather(*heavy_tasks)
+
+    light_durations = sorted(light_durations)
+    return {
+        "light_p50_ms": statistics.median(light_durations),
+        "light_p99_ms": light_durations[int(len(light_durations) * 0.99) - 1],
+        "light_max_ms": light_durations[-1],
+        "heavy_median_ms": statistics.median(heavy_durations),
+    }
+
+
+def main() -> None:
+    rng = random.Random(0)
+    heavy = to_answers(generate_conversation(rng, *HEAVY_CONVERSATION))
+    light = to_answers(generate_conversation(rng, 8, 6))
+
+    rows = []
+    for name, workers in [("event loop", 0), ("process pool", WORKERS)]:
+        executor = CpuExecutor(max_workers=workers, threshold=THRESHOLD)
+        executor.start()
+        try:
+            result = asyncio.run(run_scenario(executor, heavy, light))
+        finally:
+            executor.shutdown()
+        rows.append({"grading": name, **result})
+
+    print_table(
+        f"長い会話{HEAVY_REQUESTS}件の採点中の短いリクエスト{LIGHT_REQUESTS}件の応答時間",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
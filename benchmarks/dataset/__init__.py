@@ -0,0 +1,12 @@
+"""本番規模の合成データの作成
+
+ベンチマーク・負荷試験・EXPLAINのテストのデータとして使う。
+
+    generator = DatasetGenerator(DatasetSizes.for_rows(100_000), seed=0)
+    counts = await load_dataset(engine, generator)
+"""
+
+from benchmarks.dataset.generator import DatasetGenerator, DatasetSizes, user_email
+from benchmarks.dataset.loader import load_dataset
+
+__all__ = ["DatasetGenerator", "DatasetSizes", "load_dataset", "user_email"]
@@ -0,0 +1,80 @@
+"""合成データをデータベースに登録する
+
+実行方法:
+    python -m benchmarks.dataset --rows 100000 --seed 0 --reset
+    python -m benchmarks.dataset --rows 100000 --now 2026-10-01T00:00:00+00:00
+
+ASYNC_DATABASE_URL で指定したデータベースに、--rows 件程度の回答を持つ規模
+（1,000〜1,000,000）のユーザー・クイズ・回答・復習スケジュール・会話セット・
+テスト結果・暗記カード・学習記録をCOPYで登録する。同じ --seed・--now からは同じデータを作成する。
+回答日時などは --now（省略時は DEFAULT_NOW の固定の日時）を基準にするため、
+実行した日を基準にしたい場合は現在日時を指定する。
+--reset を指定した場合はテーブルを削除して作り直すため、使い捨てのデータベースを指定すること。
+指定しない場合はマイグレーション済みの空のデータベースに登録する。
+"""
+
+import argparse
+import asyncio
+import datetime
+from collections import Counter
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base
+from benchmarks.dataset.generator import DEFAULT_NOW, DatasetGenerator, DatasetSizes
+from benchmarks.dataset.loader import BATCH_USERS, load_dataset
+from benchmarks.utils import print_table
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="合成データをデータベースに登録する")
+    parser.add_argument(
+        "--rows", type=int, default=10_000, help="回答のおよその件数（データの規模）"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--now",
+        type=datetime.datetime.fromisoformat,
+        default=DEFAULT_NOW,
+        help="日時の基準（ISO 8601、タイムゾーンの省略時はUTC）",
+    )
+    parser.add_argument("--batch-users", type=int, default=BATCH_USERS)
+    parser.add_argument(
+        "--reset", action="store_true", help="テーブルを削除して作り直す"
+    )
+    return parser.parse_args()
+
+
+def print_progress(counts: Counter, elapsed: float) -> None:
+    total = sum(counts.values())
+    print(f"{total:>12,} 行 ({total / elapsed:,.0f} 行/秒)", flush=True)
+
+
+async def main() -> None:
+    args = parse_args()
+    generator = DatasetGenerator(
+        DatasetSizes.for_rows(args.rows), seed=args.seed, now=args.now
+    )
+
+    engine = create_async_engine(settings.ASYNC_DATABASE_URL)
+    try:
+        if args.reset:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                await conn.run_sync(Base.metadata.create_all)
+
+        counts = await load_dataset(
+            engine, generator, args.batch_users, progress=print_progress
+        )
+    finally:
+        await engine.dispose()
+
+    print_table(
+        f"登録件数（seed={args.seed}, now={generator.now.isoformat()}）",
+        [{"table": table, "rows": count} for table, count in counts.items()],
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
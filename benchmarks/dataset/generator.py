@@ -0,0 +1,450 @@
+import datetime
+import math
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Table
+
+from app.domain.practice.similarity_engine import SimilarityEngine
+from app.domain.practice.test_result_entity import TestConstants
+from app.domain.reviewSchedule.review_schedule_entity import ReviewScheduleEntity
+from app.schema.models import (
+    ConversationLatestTestResults,
+    Conversations,
+    ConversationTestScores,
+    DailyStudyRecords,
+    LearningHistories,
+    Messages,
+    MessageTestScores,
+    Quiz,
+    QuizType,
+    RecallCards,
+    ReviewSchedules,
+    StudyRecords,
+    UserAnswers,
+    Users,
+)
+
+Rows = List[Dict[str, Any]]
+
+# 日時の基準（実行した日によってデータが変わらないよう固定する）
+DEFAULT_NOW = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+# 初期データ（696490ef5f6d）と同じクイズの種類
+QUIZ_TYPES = [
+    ("シチュエーション対応", "SIT", "日常生活で起こりそうなシチュエーションに対応する"),
+    ("英文法", "GRM", "英語の文法ルールを学習する"),
+    ("リスニング", "LIS", "英語の聞き取り能力を向上させる"),
+    ("長文読解", "RDG", "英語の長文を読んで理解力を鍛える"),
+    ("発音", "PRN", "正しい英語の発音を身につける"),
+]
+
+VOCABULARY = (
+    "I you we they it is are was were have has do does did can could will would "
+    "the a an to of in on at for with about from this that these those my your "
+    "meeting tomorrow morning project schedule really think maybe please thanks "
+    "coffee station weekend travel restaurant reservation order sure okay "
+    "yesterday friend family work office train ticket weather busy happy"
+).split()
+
+
+@dataclass
+class DatasetSizes:
+    """作成するデータの件数（users・quizzes以外はユーザーごとの平均）"""
+
+    users: int
+    quizzes: int
+    answers_per_user: int = 40
+    conversations_per_user: int = 10
+    messages_per_conversation: int = 6
+    recall_cards_per_user: int = 50
+    study_days: int = 90
+
+    @classmethod
+    def for_rows(cls, rows: int) -> "DatasetSizes":
+        """回答（最も多いテーブルの1つ）がおよそrows行になる件数"""
+        answers_per_user = cls.answers_per_user
+        return cls(
+            users=max(1, rows // answers_per_user),
+            quizzes=min(max(rows // 20, 50), 5000),
+        )
+
+
+def _sentence(rng: random.Random, min_words: int, max_words: int) -> str:
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def _perturb(rng: random.Random, sentence: str, rate: float) -> str:
+    """単語の削除・置換を加えてユーザーの回答らしくする"""
+    words = []
+    for word in sentence.split():
+        roll = rng.random()
+        if roll < rate / 2:
+            continue
+        words.append(rng.choice(VOCABULARY) if roll < rate else word)
+    return " ".join(words) or sentence
+
+
+def _clamp_score(value: float) -> int:
+    return min(100, max(0, round(value)))
+
+
+def _to_datetime(value: Any) -> datetime.datetime:
+    """エンティティの復習期限（date または naive な datetime）をUTCのdatetimeにする"""
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+class DatasetGenerator:
+    """本番に近い分布の合成データを作成する
+
+    同じseed・件数・nowからは常に同じデータ（IDを含む）を作成する。
+    ユーザーごとに乱数を初期化するため、まとめて作成するユーザー数を変えても結果は変わらない。
+    """
+
+    def __init__(
+        self,
+        sizes: DatasetSizes,
+        seed: int = 0,
+        now: Optional[datetime.datetime] = None,
+    ):
+        self.sizes = sizes
+        self.seed = seed
+        # 回答日時・作成日時などはnow（省略時は DEFAULT_NOW）を基準にする
+        self.now = _to_datetime(now or DEFAULT_NOW)
+        self.today = self.now.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.quiz_types, self.quizzes = self._catalog()
+
+    def _rng(self, *key: int) -> random.Random:
+        return random.Random(":".join(map(str, (self.seed, *key))))
+
+    @staticmethod
+    def _uuid(rng: random.Random) -> uuid.UUID:
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    def _catalog(self) -> Tuple[Rows, Rows]:
+        rng = self._rng(-1)
+        quiz_types = [
+            {
+                "quiz_type_id": self._uuid(rng),
+                "name": name,
+                "abbreviation": abbreviation,
+                "description": description,
+            }
+            for name, abbreviation, description in QUIZ_TYPES
+        ]
+        quizzes = []
+        for i in range(self.sizes.quizzes):
+            # 種類ごとの問題数に偏りを持たせる（シチュエーション対応が最も多い）
+            quiz_type = rng.choices(quiz_types, weights=[5, 3, 2, 2, 1])[0]
+            quizzes.append(
+                {
+                    "quiz_id": self._uuid(rng),
+                    "question": _sentence(rng, 6, 20),
+                    "quiz_type_id": quiz_type["quiz_type_id"],
+                    "difficulty": rng.choices([1, 2, 3], weights=[5, 3, 2])[0],
+                    "model_answer": _sentence(rng, 6, 20),
+                }
+            )
+        return quiz_types, quizzes
+
+    def catalog(self) -> List[Tuple[Table, Rows]]:
+        """全ユーザーで共有するクイズの種類・クイズ"""
+        return [(QuizType.__table__, self.quiz_types), (Quiz.__table__, self.quizzes)]
+
+    def user_batches(self, batch_size: int) -> Iterator[List[Tuple[Table, Rows]]]:
+        """batch_size人ずつ、外部キーの参照先から順にテーブルごとの行を返す"""
+        for start in range(0, self.sizes.users, batch_size):
+            tables: Dict[Table, Rows] = {table: [] for table in USER_TABLES}
+            for index in range(start, min(start + batch_size, self.sizes.users)):
+                for table, rows in self.user(index).items():
+                    tables[table] += rows
+            yield [(table, tables[table]) for table in USER_TABLES if tables[table]]
+
+    def user(self, index: int) -> Dict[Table, Rows]:
+        """index番目のユーザーと、そのユーザーの全データ"""
+        rng = self._rng(index)
+        user_id = self._uuid(rng)
+        rows: Dict[Table, Rows] = {
+            Users.__table__: [
+                {
+                    "id": user_id,
+                    "email": user_email(index),
+                    "hashed_password": "not-used",
+                    "is_active": True,
+                    "created_at": self.today
+                    - datetime.timedelta(days=self.sizes.study_days),
+                }
+            ]
+        }
+
+        # 学習した日（継続している人・時々の人・たまにの人が混在する）
+        diligence = rng.betavariate(2, 1.5)
+        study_days = [
+            self.today - datetime.timedelta(days=day)
+            for day in range(self.sizes.study_days)
+            if rng.random() < diligence
+        ] or [self.today]
+
+        rows.update(self._answers(rng, user_id, study_days))
+        rows.update(self._conversations(rng, user_id))
+        rows[RecallCards.__table__] = self._recall_cards(rng, user_id)
+        rows.update(self._study_records(rng, user_id, study_days))
+        return rows
+
+    def _answers(
+        self,
+        rng: random.Random,
+        user_id: uuid.UUID,
+        study_days: List[datetime.datetime],
+    ) -> Dict[Table, Rows]:
+        # 回答数は人によって大きく異なる（平均 answers_per_user の指数分布）
+        count = max(1, round(rng.expovariate(1 / self.sizes.answers_per_user)))
+        # 同じクイズに繰り返し回答する（復習）ため、回答するクイズは回答数より少なくする
+        answered = rng.sample(
+            self.quizzes, min(len(self.quizzes), max(1, math.ceil(count / 2)))
+        )
+        ability = rng.betavariate(5, 2) * 100
+
+        attempts: Dict[uuid.UUID, int] = {}
+        last_answered: Dict[uuid.UUID, datetime.datetime] = {}
+        score_history: Dict[uuid.UUID, List[int]] = {}
+        schedules: Dict[uuid.UUID, ReviewScheduleEntity] = {}
+        answers: Rows = []
+        for answered_at in sorted(
+            min(
+                self.now,
+                rng.choice(study_days)
+                + datetime.timedelta(seconds=rng.randint(0, 86399)),
+            )
+            for _ in range(count)
+        ):
+            quiz = rng.choice(answered)
+            quiz_id = quiz["quiz_id"]
+            attempt = attempts.get(quiz_id, 0)
+            attempts[quiz_id] = attempt + 1
+            last_answered[quiz_id] = answered_at
+            # 難しいクイズほど低く、同じクイズを繰り返すほど高くなる
+            score = _clamp_score(
+                rng.gauss(ability - 10 * (quiz["difficulty"] - 1) + 8 * attempt, 12)
+            )
+            answers.append(
+                {
+                    "user_answer_id": self._uuid(rng),
+                    "user_id": user_id,
+                    "quiz_id": quiz_id,
+                    "answer": _perturb(rng, quiz["model_answer"], 0.3),
+                    "score": score,
+                    "feedback": "良い回答です。時制に注意しましょう。",
+                    "model_answer": quiz["model_answer"],
+                    "created_at": answered_at,
+                    "updated_at": answered_at,
+                }
+            )
+            history = score_history.setdefault(quiz_id, [])
+            history.append(score)
+            schedules[quiz_id] = (
+                ReviewScheduleEntity.create_first(
+                    userId=user_id, quizId=quiz_id, score=score
+                )
+                if len(history) == 1
+                else schedules[quiz_id].update(history)
+            )
+
+        review_schedules = [
+            {
+                "review_schedule_id": self._uuid(rng),
+                "user_id": user_id,
+                "quiz_id": schedule.quizId,
+                "review_deadline": self._review_deadline(
+                    schedule, last_answered[schedule.quizId]
+                ),
+                "answer_count": schedule.answerCount,
+                "score_sum": schedule.scoreSum,
+                "high_score_streak": schedule.highScoreStreak,
+                "low_score_streak": schedule.lowScoreStreak,
+                "last_score": schedule.lastScore,
+            }
+            for schedule in schedules.values()
+        ]
+        return {
+            UserAnswers.__table__: answers,
+            ReviewSchedules.__table__: review_schedules,
+        }
+
+    @staticmethod
+    def _review_deadline(
+        schedule: ReviewScheduleEntity, answered_at: datetime.datetime
+    ) -> datetime.datetime:
+        """最後に回答した日時を起点にした復習期限
+
+        エンティティは現在日時を起点に計算するため、同じ期間だけ回答日時からずらす。
+        """
+        if schedule.answerCount == 1:
+            # create_first と同じく、最初の回答の直後から復習の対象にする
+            return answered_at + datetime.timedelta(seconds=1)
+        today = _to_datetime(datetime.date.today())
+        return answered_at + (_to_datetime(schedule.reviewDeadLine) - today)
+
+    def _conversations(
+        self, rng: random.Random, user_id: uuid.UUID
+    ) -> Dict[Table, Rows]:
+        conversations: Rows = []
+        messages: Rows = []
+        test_scores: Rows = []
+        message_test_scores: Rows = []
+        latest_test_results: Rows = []
+
+        count = rng.randint(0, 2 * self.sizes.conversations_per_user)
+        for order in range(count):
+            conversation_id = self._uuid(rng)
+            conversations.append(
+                {
+                    "id": conversation_id,
+                    "user_id": user_id,
+                    "title": f"会話 {order + 1}",
+                    "order": order,
+                    "created_at": self.now
+                    - datetime.timedelta(
+                        minutes=rng.randint(0, self.sizes.study_days * 1440)
+                    ),
+                }
+            )
+            message_count = max(
+                2, round(rng.gauss(self.sizes.messages_per_conversation, 1))
+            )
+            message_ens = []
+            for message_order in range(1, message_count + 1):
+                message_en = _sentence(rng, 6, 25)
+                message_ens.append(message_en)
+                messages.append(
+                    {
+                        "conversation_id": conversation_id,
+                        "message_order": message_order,
+                        "speaker_number": 1 + (message_order + 1) % 2,
+                        "message_en": message_en,
+                        "message_ja": "これはテスト用のメッセージです。",
+                        "message_en_tokens": SimilarityEngine.tokenize(message_en),
+                    }
+                )
+
+            # テストは受けていない会話も多く、受けた会話は合格するまで繰り返す
+            message_scores: List[float] = []
+            test_number = 0
+            for test_number in range(1, rng.choice([0, 0, 1, 1, 2, 3, 5]) + 1):
+                message_scores = [
+                    float(_clamp_score(rng.gauss(60 + 8 * test_number, 15)))
+                    for _ in message_ens
+                ]
+                test_score = sum(message_scores) / len(message_scores)
+                test_scores.append(
+                    {
+                        "conversation_id": conversation_id,
+                        "test_number": test_number,
+                        "test_score": test_score,
+                        "is_pass": test_score >= TestConstants.PASSING_THRESHOLD,
+                    }
+                )
+                message_test_scores += [
+                    {
+                        "conversation_id": conversation_id,
+                        "test_number": test_number,
+                        "message_order": message_order,
+                        "score": score,
+                        "user_answer": _perturb(rng, message_en, 0.2),
+                    }
+                    for message_order, (message_en, score) in enumerate(
+                        zip(message_ens, message_scores), start=1
+                    )
+                ]
+            if test_number:
+                latest_test_results.append(
+                    {
+                        "conversation_id": conversation_id,
+                        "test_number": test_number,
+                        "test_score": test_scores[-1]["test_score"],
+                        "message_scores": message_scores,
+                        "updated_at": self.now,
+                    }
+                )
+
+        return {
+            Conversations.__table__: conversations,
+            Messages.__table__: messages,
+            ConversationTestScores.__table__: test_scores,
+            MessageTestScores.__table__: message_test_scores,
+            ConversationLatestTestResults.__table__: latest_test_results,
+        }
+
+    def _recall_cards(self, rng: random.Random, user_id: uuid.UUID) -> Rows:
+        count = rng.randint(0, 2 * self.sizes.recall_cards_per_user)
+        return [
+            {
+                "recall_card_id": self._uuid(rng),
+                "user_id": user_id,
+                "question": "これはテスト用の問題です。",
+                "answer": _sentence(rng, 2, 12),
+                # 正解ポイントが高いカードほど少ない
+                "correct_point": min(20, int(rng.expovariate(0.4))),
+                "review_deadline": self.now
+                + datetime.timedelta(minutes=rng.randint(-30 * 1440, 60 * 1440)),
+                "created_at": self.now
+                - datetime.timedelta(
+                    minutes=rng.randint(0, self.sizes.study_days * 1440)
+                ),
+            }
+            for _ in range(count)
+        ]
+
+    def _study_records(
+        self,
+        rng: random.Random,
+        user_id: uuid.UUID,
+        study_days: List[datetime.datetime],
+    ) -> Dict[Table, Rows]:
+        study_record_id = self._uuid(rng)
+        # 1日の学習時間（秒）は対数正規分布（中央値はおよそ15分）
+        study_times = [
+            min(86400, int(rng.lognormvariate(math.log(900), 0.8))) for _ in study_days
+        ]
+        return {
+            StudyRecords.__table__: [
+                {"study_record_id": study_record_id, "user_id": user_id}
+            ],
+            DailyStudyRecords.__table__: [
+                {"study_record_id": study_record_id, "date": date, "study_time": time}
+                for date, time in zip(study_days, study_times)
+            ],
+            LearningHistories.__table__: [
+                {"date": date, "user_id": user_id, "learning_time": time}
+                for date, time in zip(study_days, study_times)
+            ],
+        }
+
+
+def user_email(index: int) -> str:
+    """index番目のユーザーのメールアドレス"""
+    return f"user{index}@example.com"
+
+
+# ユーザーごとのデータのテーブル（外部キーの参照先から順に並べる）
+USER_TABLES: List[Table] = [
+    Users.__table__,
+    UserAnswers.__table__,
+    ReviewSchedules.__table__,
+    Conversations.__table__,
+    Messages.__table__,
+    ConversationTestScores.__table__,
+    MessageTestScores.__table__,
+    ConversationLatestTestResults.__table__,
+    RecallCards.__table__,
+    StudyRecords.__table__,
+    DailyStudyRecords.__table__,
+    LearningHistories.__table__,
+]
@@ -0,0 +1,53 @@
+import time
+from collections import Counter
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.repository.bulk_insert import copy_insert
+from benchmarks.dataset.generator import DatasetGenerator, Rows
+
+# 1回のCOPY・コミットでまとめて登録するユーザー数
+BATCH_USERS = 500
+
+
+async def _copy_tables(
+    session_factory: async_sessionmaker[AsyncSession],
+    tables: List[Tuple[Table, Rows]],
+    counts: Counter,
+) -> None:
+    async with session_factory() as db:
+        for table, rows in tables:
+            await copy_insert(db, table, rows)
+            counts[table.name] += len(rows)
+        await db.commit()
+
+
+async def load_dataset(
+    engine: AsyncEngine,
+    generator: DatasetGenerator,
+    batch_users: int = BATCH_USERS,
+    progress: Optional[Callable[[Counter, float], None]] = None,
+) -> Counter:
+    """合成データをCOPYで登録し、テーブルごとの登録件数を返す
+
+    メモリ使用量を抑えるため、batch_users人ずつ作成・登録する。
+    登録後にANALYZEして、実行計画が実データに近い統計情報で作られるようにする。
+    """
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    counts: Counter = Counter()
+    start = time.perf_counter()
+
+    await _copy_tables(session_factory, generator.catalog(), counts)
+    for tables in generator.user_batches(batch_users):
+        await _copy_tables(session_factory, tables, counts)
+        if progress:
+            progress(counts, time.perf_counter() - start)
+
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("ANALYZE")
+
+    return counts
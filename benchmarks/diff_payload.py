@@ -0,0 +1,70 @@
+"""会話テストの差分の形式（HTMLと構造化された差分）の比較
+
+実行方法:
+    python -m benchmarks.diff_payload
+"""
+
+import json
+import random
+from typing import List, Tuple
+
+from app.domain.practice.similarity_engine import SimilarityEngine
+from app.endpoint.practice.practice_model import DiffSpan
+from app.services.practice_service import PracticeService
+from benchmarks.practice_scoring import CONVERSATION_SIZES, generate_conversation
+from benchmarks.utils import measure, print_table
+
+REPEAT = 5
+
+
+def html_diffs(pairs: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    return [
+        PracticeService._generate_diff_html(
+            SimilarityEngine.tokenize(user), SimilarityEngine.tokenize(correct)
+        )
+        for user, correct in pairs
+    ]
+
+
+def structured_diffs(pairs: List[Tuple[str, str]]) -> List[List[DiffSpan]]:
+    return [
+        PracticeService._generate_diff_spans(
+            user,
+            correct,
+            SimilarityEngine.tokenize(user),
+            SimilarityEngine.tokenize(correct),
+        )
+        for user, correct in pairs
+    ]
+
+
+def payload_size(value: object) -> int:
+    """FastAPIのJSONレスポンスと同じ形式にした場合のバイト数"""
+    return len(
+        json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    )
+
+
+def main() -> None:
+    rng = random.Random(0)
+    rows = []
+    for word_count, message_count in CONVERSATION_SIZES:
+        pairs = generate_conversation(rng, word_count, message_count)
+
+        html_result = measure(lambda: html_diffs(pairs), REPEAT)
+        spans_result = measure(lambda: structured_diffs(pairs), REPEAT)
+        rows.append(
+            {
+                "words/message": word_count,
+                "messages": message_count,
+                "html_median_ms": html_result["median_ms"],
+                "spans_median_ms": spans_result["median_ms"],
+                "html_bytes": payload_size(html_diffs(pairs)),
+                "spans_bytes": payload_size(structured_diffs(pairs)),
+            }
+        )
+    print_table("差分の生成時間とレスポンスサイズ（1会話あたり）", rows)
+
+
+if __name__ == "__main__":
+    main()
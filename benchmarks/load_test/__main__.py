@@ -0,0 +1,221 @@
+"""APIの負荷試験
+
+実行方法:
+    python -m benchmarks.load_test --reset --profile mixed --output baseline.json
+    python -m benchmarks.load_test --reset --profile mixed --compare baseline.json
+
+ASYNC_DATABASE_URL で指定したデータベースのテーブルを作り直して合成データ（benchmarks.dataset）を登録し、
+ChatOpenAIを FakeChatModel に置き換えたアプリケーションをuvicornで起動して、
+プロファイルの重みに従ったリクエストを仮想ユーザーから並行して送信する。
+テーブルを削除するため、必ず使い捨てのデータベース（ローカルのPostgresやコンテナ）を指定すること。
+
+リクエストの種類ごとのスループットと p50/p95/p99 をJSONで保存し、
+--compare を指定した場合はベースラインと比較して悪化していれば終了コード1で終了する。
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base
+from app.schema import models  # noqa: F401  テーブル定義を読み込む
+from benchmarks.load_test import report
+from benchmarks.load_test.fake_llm import LLM_LATENCY_ENV
+from benchmarks.dataset import DatasetSizes
+from benchmarks.load_test.seed import SeedResult, seed
+from benchmarks.load_test.traffic import PROFILES, TrafficMix
+from benchmarks.utils import print_table
+
+# サーバーの起動を待つ時間（秒）
+STARTUP_TIMEOUT = 60
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="APIの負荷試験")
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="テーブルを削除して作り直す（使い捨てのデータベースであることの確認）",
+    )
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=20, help="仮想ユーザー数")
+    parser.add_argument("--duration", type=float, default=60, help="計測時間（秒）")
+    parser.add_argument(
+        "--warmup", type=float, default=5, help="計測前の送信時間（秒）"
+    )
+    parser.add_argument(
+        "--llm-latency-ms", type=float, default=800, help="LLMの応答にかかる時間"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="uvicornのワーカー数")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--rows", type=int, default=20_000, help="合成データの回答のおよその件数"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="load_test_result.json")
+    parser.add_argument("--compare", help="比較するベースラインのJSON")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="悪化とみなす割合（0.2 = 20%%）"
+    )
+    return parser.parse_args()
+
+
+async def prepare_database(sizes: DatasetSizes, seed_value: int) -> SeedResult:
+    engine = create_async_engine(settings.ASYNC_DATABASE_URL)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        return await seed(engine, sizes, seed_value)
+    finally:
+        await engine.dispose()
+
+
+def start_server(args: argparse.Namespace) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        LLM_LATENCY_ENV: str(args.llm_latency_ms),
+        # 無作為に選んだリクエストのプロファイルで計測がゆがまないようにする
+        "PROFILER_SAMPLE_RATE": "0",
+    }
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "benchmarks.load_test.server:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(args.port),
+            "--workers",
+            str(args.workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env=env,
+    )
+
+
+async def wait_for_server(base_url: str, server: subprocess.Popen) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError("サーバーの起動に失敗しました")
+            try:
+                response = await client.get("/health_check/")
+                if response.status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError("サーバーの起動がタイムアウトしました")
+
+
+async def run_traffic(
+    base_url: str, data: SeedResult, args: argparse.Namespace
+) -> Tuple[List[Tuple[str, float, bool]], float]:
+    """仮想ユーザーからリクエストを送信し、計測期間中の (種類, 応答時間, 成功したか) を返す"""
+    mix = TrafficMix(args.profile, data)
+    samples: List[Tuple[str, float, bool]] = []
+    start = time.perf_counter()
+    measure_start = start + args.warmup
+    measure_end = measure_start + args.duration
+
+    async def virtual_user(index: int, client: httpx.AsyncClient) -> None:
+        rng = random.Random(args.seed * 1_000_003 + index)
+        user = data.users[index % len(data.users)]
+        headers = {"Authorization": f"Bearer {user.access_token}"}
+        while True:
+            name, request = mix.next(user, rng)
+            sent = time.perf_counter()
+            if sent >= measure_end:
+                return
+            try:
+                response = await client.request(
+                    request.method, request.url, json=request.json, headers=headers
+                )
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if sent >= measure_start:
+                samples.append((name, time.perf_counter() - sent, ok))
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        await asyncio.gather(
+            *(virtual_user(index, client) for index in range(args.concurrency))
+        )
+
+    # 計測期間の終了後に返ってきた応答も含めるため、実際の経過時間で割る
+    return samples, max(time.perf_counter(), measure_end) - measure_start
+
+
+async def main() -> int:
+    args = parse_args()
+    if not args.reset:
+        print(
+            "テーブルを作り直すため、使い捨てのデータベースを指定して "
+            "--reset を付けて実行してください",
+            file=sys.stderr,
+        )
+        return 2
+
+    data = await prepare_database(DatasetSizes.for_rows(args.rows), args.seed)
+
+    base_url = f"http://localhost:{args.port}"
+    server = start_server(args)
+    try:
+        await wait_for_server(base_url, server)
+        samples, elapsed = await run_traffic(base_url, data, args)
+    finally:
+        server.terminate()
+        server.wait()
+
+    endpoints = report.summarize(samples, elapsed)
+    result: Dict[str, Any] = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "profile": args.profile,
+        "concurrency": args.concurrency,
+        "duration_seconds": elapsed,
+        "llm_latency_ms": args.llm_latency_ms,
+        "workers": args.workers,
+        "rows": args.rows,
+        "seed": args.seed,
+        "endpoints": endpoints,
+    }
+    report.save(args.output, result)
+
+    print_table(
+        f"負荷試験 ({args.profile}, 仮想ユーザー{args.concurrency})",
+        [{"endpoint": name, **values} for name, values in endpoints.items()],
+    )
+    print(f"\n結果を {args.output} に保存しました")
+
+    if args.compare:
+        regressions = report.compare(report.load(args.compare), result, args.threshold)
+        print_table(
+            f"ベースライン（{args.compare}）からの悪化",
+            [{"regression": regression} for regression in regressions],
+        )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,101 @@
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable, RunnableLambda
+from pydantic import BaseModel
+
+from app.domain.practice.geneerated_conversation_value_object import (
+    GeneratedConversationValueObject,
+    GeneratedMessageValueObject,
+)
+from app.domain.userAnswer.ai_evaluation_value_object import AIEvaluationValueObject
+
+# 負荷試験のサーバーで FakeChatModel の応答時間（ミリ秒）を指定する環境変数
+LLM_LATENCY_ENV = "LOAD_TEST_LLM_LATENCY_MS"
+
+# 1回の呼び出しで返す出力トークン数（LLMのメトリクスの推定料金に使われる）
+FAKE_COMPLETION_TOKENS = 200
+
+
+def _fake_ai_evaluation(seed: int) -> AIEvaluationValueObject:
+    return AIEvaluationValueObject(
+        score=seed % 101,
+        modelAnswer="This is a model answer.",
+        feedback="良い回答です。時制に注意しましょう。",
+    )
+
+
+def _fake_generated_conversation(seed: int) -> GeneratedConversationValueObject:
+    return GeneratedConversationValueObject(
+        title=f"会話 {seed % 1000}",
+        messages=[
+            GeneratedMessageValueObject(
+                messageEn=f"This is message number {order} of the conversation.",
+                messageJa=f"これは会話の{order}番目のメッセージです。",
+            )
+            for order in range(1, 4 + seed % 3)
+        ],
+    )
+
+
+# 構造化出力のスキーマごとに、プロンプトから決まる値で応答を作成する
+FAKE_RESPONSES: Dict[Type[BaseModel], Callable[[int], BaseModel]] = {
+    AIEvaluationValueObject: _fake_ai_evaluation,
+    GeneratedConversationValueObject: _fake_generated_conversation,
+}
+
+
+class FakeChatModel(BaseChatModel):
+    """負荷試験用にChatOpenAIの代わりに使う、決まった応答を返すチャットモデル
+
+    latency秒待ってから応答する。リポジトリは同期のinvokeで呼び出すため、
+    実際のChatOpenAIと同じくイベントループを止めて待つ。
+    同じプロンプトには常に同じ応答を返す。
+    """
+
+    latency: float = 0.0
+    model_name: str = "gpt-4.1-mini"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "latency": self.latency}
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        prompt = "".join(str(message.content) for message in messages)
+        message = AIMessage(
+            content=str(zlib.crc32(prompt.encode())),
+            usage_metadata={
+                "input_tokens": len(prompt) // 4,
+                "output_tokens": FAKE_COMPLETION_TOKENS,
+                "total_tokens": len(prompt) // 4 + FAKE_COMPLETION_TOKENS,
+            },
+            response_metadata={"model_name": self.model_name},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> Runnable[Any, Any]:
+        """FAKE_RESPONSES に登録したスキーマの応答を返す"""
+        if schema not in FAKE_RESPONSES:
+            raise NotImplementedError(f"{schema} の応答は登録されていません")
+        build = FAKE_RESPONSES[schema]
+
+        def parse(message: BaseMessage) -> BaseModel:
+            return build(int(str(message.content)))
+
+        return self | RunnableLambda(parse)
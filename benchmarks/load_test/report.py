@@ -0,0 +1,85 @@
+import json
+import math
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+# 全リクエストの集計のキー
+TOTAL = "TOTAL"
+
+# エラー率の悪化とみなさない増加幅
+ERROR_RATE_TOLERANCE = 0.01
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """ソート済みの値のqパーセンタイル（最近傍順位法）"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(
+    samples: List[Tuple[str, float, bool]], duration: float
+) -> Dict[str, Dict[str, float]]:
+    """(リクエストの種類, 応答時間（秒）, 成功したか) の一覧をリクエストの種類ごとに集計する"""
+    groups: Dict[str, List[Tuple[float, bool]]] = defaultdict(list)
+    for name, latency, ok in samples:
+        groups[name].append((latency, ok))
+        groups[TOTAL].append((latency, ok))
+
+    summary: Dict[str, Dict[str, float]] = {}
+    for name, results in sorted(groups.items()):
+        latencies = sorted(latency * 1000 for latency, _ in results)
+        errors = sum(1 for _, ok in results if not ok)
+        summary[name] = {
+            "count": len(results),
+            "errors": errors,
+            "error_rate": errors / len(results),
+            "throughput_rps": len(results) / duration,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+        }
+    return summary
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """ベースラインと比べて悪化したリクエストの種類と指標を返す
+
+    p95・p99が threshold の割合より遅くなった場合、スループットが threshold の割合より
+    下がった場合、エラー率が ERROR_RATE_TOLERANCE より増えた場合を悪化とする。
+    """
+    regressions: List[str] = []
+    for name, before in baseline["endpoints"].items():
+        after = current["endpoints"].get(name)
+        if after is None:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            if after[key] > before[key] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {key} {before[key]:.1f} -> {after[key]:.1f}"
+                )
+        if after["throughput_rps"] < before["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput_rps "
+                f"{before['throughput_rps']:.1f} -> {after['throughput_rps']:.1f}"
+            )
+        if after["error_rate"] > before["error_rate"] + ERROR_RATE_TOLERANCE:
+            regressions.append(
+                f"{name}: error_rate "
+                f"{before['error_rate']:.1%} -> {after['error_rate']:.1%}"
+            )
+    return regressions
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save(path: str, result: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+        f.write("\n")
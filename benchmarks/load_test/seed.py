@@ -0,0 +1,100 @@
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, List
+from uuid import UUID
+
+from sqlalchemy import exists, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.security import SecurityUtils
+from app.schema.models import Conversations, Messages, RecallCards, UserAnswers, Users
+from benchmarks.dataset import DatasetGenerator, DatasetSizes, load_dataset
+
+# 仮想ユーザーに割り当てるユーザー数の上限
+SAMPLE_USERS = 200
+# リクエストに指定するIDをユーザーごとに取得する件数の上限
+SAMPLE_IDS = 100
+
+
+@dataclass
+class SeededUser:
+    """負荷試験で使うユーザーと、リクエストに指定するID"""
+
+    user_id: UUID
+    access_token: str
+    user_answer_ids: List[UUID] = field(default_factory=list)
+    # 会話セットID -> メッセージ数
+    conversations: Dict[UUID, int] = field(default_factory=dict)
+    recall_card_ids: List[UUID] = field(default_factory=list)
+
+
+@dataclass
+class SeedResult:
+    quiz_type_ids: List[UUID]
+    quiz_ids: List[UUID]
+    users: List[SeededUser]
+
+
+async def seed(engine: AsyncEngine, sizes: DatasetSizes, seed: int = 0) -> SeedResult:
+    """合成データを登録し、負荷試験で使うユーザーとIDを取得する"""
+    generator = DatasetGenerator(sizes, seed)
+    await load_dataset(engine, generator)
+
+    users: List[SeededUser] = []
+    async with engine.connect() as conn:
+        # 全てのリクエストを送れるよう、回答・会話セット・暗記カードを持つユーザーを選ぶ
+        user_ids = (
+            await conn.execute(
+                select(Users.id)
+                .where(
+                    exists().where(UserAnswers.user_id == Users.id),
+                    exists().where(Conversations.user_id == Users.id),
+                    exists().where(RecallCards.user_id == Users.id),
+                )
+                .order_by(Users.email)
+                .limit(SAMPLE_USERS)
+            )
+        ).scalars()
+
+        for user_id in user_ids:
+            user = SeededUser(
+                user_id=user_id,
+                access_token=SecurityUtils.create_access_token(
+                    {"sub": str(user_id)}, expires_delta=timedelta(days=1)
+                ),
+            )
+            user.user_answer_ids = list(
+                (
+                    await conn.execute(
+                        select(UserAnswers.user_answer_id)
+                        .where(UserAnswers.user_id == user_id)
+                        .limit(SAMPLE_IDS)
+                    )
+                ).scalars()
+            )
+            user.conversations = {
+                conversation_id: message_count
+                for conversation_id, message_count in await conn.execute(
+                    select(Conversations.id, func.count())
+                    .join(Messages, Messages.conversation_id == Conversations.id)
+                    .where(Conversations.user_id == user_id)
+                    .group_by(Conversations.id)
+                    .limit(SAMPLE_IDS)
+                )
+            }
+            user.recall_card_ids = list(
+                (
+                    await conn.execute(
+                        select(RecallCards.recall_card_id)
+                        .where(RecallCards.user_id == user_id)
+                        .limit(SAMPLE_IDS)
+                    )
+                ).scalars()
+            )
+            users.append(user)
+
+    return SeedResult(
+        quiz_type_ids=[row["quiz_type_id"] for row in generator.quiz_types],
+        quiz_ids=[row["quiz_id"] for row in generator.quizzes],
+        users=users,
+    )
@@ -0,0 +1,17 @@
+"""負荷試験用のアプリケーション
+
+ChatOpenAIを FakeChatModel に置き換えた app.main.app。uvicornから起動する。
+
+    LOAD_TEST_LLM_LATENCY_MS=800 uvicorn benchmarks.load_test.server:app
+"""
+
+import os
+
+from app.core.dependencies.repositories import get_chat_prompt_template
+from app.main import app
+from benchmarks.load_test.fake_llm import LLM_LATENCY_ENV, FakeChatModel
+
+fake_llm = FakeChatModel(latency=float(os.environ.get(LLM_LATENCY_ENV, "0")) / 1000)
+app.dependency_overrides[get_chat_prompt_template] = lambda: fake_llm
+
+__all__ = ["app"]
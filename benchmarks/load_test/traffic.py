@@ -0,0 +1,205 @@
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.load_test.seed import SeededUser, SeedResult
+
+ANSWERS = [
+    "I have been studying English for three years.",
+    "Could you tell me the way to the station?",
+    "She said that she would come to the party tomorrow.",
+]
+
+
+@dataclass
+class Request:
+    method: str
+    url: str
+    json: Optional[Any] = None
+
+
+@dataclass
+class RequestSpec:
+    """送信するリクエストの種類
+
+    name はルートのテンプレートを含む「メソッド パス」とし、集計の単位にする。
+    """
+
+    name: str
+    build: Callable[[SeededUser, SeedResult, random.Random], Request]
+
+
+def _get(url: str) -> Callable[[SeededUser, SeedResult, random.Random], Request]:
+    return lambda user, data, rng: Request("GET", url)
+
+
+def _get_quiz(user: SeededUser, data: SeedResult, rng: random.Random) -> Request:
+    question_type = rng.choice(["new", "review", "mixed"])
+    return Request(
+        "GET",
+        f"/study/quiz?quiz_type_id={rng.choice(data.quiz_type_ids)}"
+        f"&question_type={question_type}",
+    )
+
+
+def _get_study_record(
+    user: SeededUser, data: SeedResult, rng: random.Random
+) -> Request:
+    return Request("GET", f"/study/record/{rng.choice(user.user_answer_ids)}")
+
+
+def _post_quiz_answer(
+    user: SeededUser, data: SeedResult, rng: random.Random
+) -> Request:
+    return Request(
+        "POST",
+        "/study/quiz-answer",
+        {"quiz_id": str(rng.choice(data.quiz_ids)), "user_answer": rng.choice(ANSWERS)},
+    )
+
+
+def _get_conversation(
+    user: SeededUser, data: SeedResult, rng: random.Random
+) -> Request:
+    conversation_id = rng.choice(list(user.conversations))
+    return Request("GET", f"/practice/conversation/{conversation_id}")
+
+
+def _post_test_result(
+    user: SeededUser, data: SeedResult, rng: random.Random
+) -> Request:
+    conversation_id = rng.choice(list(user.conversations))
+    return Request(
+        "POST",
+        "/practice/test_result",
+        {
+            "conversation_id": str(conversation_id),
+            "answers": [
+                {"message_order": order, "user_answer": rng.choice(ANSWERS)}
+                for order in range(1, user.conversations[conversation_id] + 1)
+            ],
+        },
+    )
+
+
+def _post_ai_registration(
+    user: SeededUser, data: SeedResult, rng: random.Random
+) -> Request:
+    return Request(
+        "POST",
+        "/practice/conversation/ai-registration",
+        {"user_phrase": rng.choice(["take it easy", "figure out", "catch up"])},
+    )
+
+
+def _post_recall_answer(
+    user: SeededUser, data: SeedResult, rng: random.Random
+) -> Request:
+    return Request(
+        "POST",
+        "/recall/answer_recall_card",
+        {
+            "recall_card_id": str(rng.choice(user.recall_card_ids)),
+            "answer": rng.choice(ANSWERS),
+        },
+    )
+
+
+def _post_recall_answers(
+    user: SeededUser, data: SeedResult, rng: random.Random
+) -> Request:
+    cards = rng.sample(user.recall_card_ids, min(10, len(user.recall_card_ids)))
+    return Request(
+        "POST",
+        "/recall/answer_recall_cards",
+        {
+            "answers": [
+                {"recall_card_id": str(card), "answer": rng.choice(ANSWERS)}
+                for card in cards
+            ]
+        },
+    )
+
+
+REQUEST_SPECS: Dict[str, RequestSpec] = {
+    spec.name: spec
+    for spec in [
+        RequestSpec("GET /home/", _get("/home/")),
+        RequestSpec("GET /study/quiz_type", _get("/study/quiz_type")),
+        RequestSpec("GET /study/quiz", _get_quiz),
+        RequestSpec("GET /study/records", _get("/study/records")),
+        RequestSpec("GET /study/record/{user_answer_id}", _get_study_record),
+        RequestSpec("POST /study/quiz-answer", _post_quiz_answer),
+        RequestSpec("GET /practice/conversations", _get("/practice/conversations")),
+        RequestSpec("GET /practice/conversation/{conversation_id}", _get_conversation),
+        RequestSpec("POST /practice/test_result", _post_test_result),
+        RequestSpec(
+            "POST /practice/conversation/ai-registration", _post_ai_registration
+        ),
+        RequestSpec(
+            "GET /recall/get_next_recall_card", _get("/recall/get_next_recall_card")
+        ),
+        RequestSpec(
+            "GET /recall/get_recall_card_queue", _get("/recall/get_recall_card_queue")
+        ),
+        RequestSpec("POST /recall/answer_recall_card", _post_recall_answer),
+        RequestSpec("POST /recall/answer_recall_cards", _post_recall_answers),
+    ]
+}
+
+# トラフィックのプロファイル（リクエストの種類 -> 重み）
+# チャット（/chat）はChatOpenAIを直接作成しており置き換えられないため含めない
+PROFILES: Dict[str, Dict[str, int]] = {
+    # 画面の表示が中心の利用
+    "read_heavy": {
+        "GET /home/": 20,
+        "GET /study/quiz_type": 5,
+        "GET /study/quiz": 15,
+        "GET /study/records": 10,
+        "GET /study/record/{user_answer_id}": 10,
+        "GET /practice/conversations": 10,
+        "GET /practice/conversation/{conversation_id}": 10,
+        "GET /recall/get_next_recall_card": 10,
+        "GET /recall/get_recall_card_queue": 5,
+        "POST /study/quiz-answer": 3,
+        "POST /recall/answer_recall_card": 2,
+    },
+    # 通常の学習セッション
+    "mixed": {
+        "GET /home/": 10,
+        "GET /study/quiz": 15,
+        "GET /study/records": 5,
+        "GET /study/record/{user_answer_id}": 5,
+        "POST /study/quiz-answer": 15,
+        "GET /practice/conversations": 5,
+        "GET /practice/conversation/{conversation_id}": 10,
+        "POST /practice/test_result": 10,
+        "POST /practice/conversation/ai-registration": 2,
+        "GET /recall/get_recall_card_queue": 5,
+        "POST /recall/answer_recall_card": 10,
+        "POST /recall/answer_recall_cards": 8,
+    },
+    # 回答の送信（採点・LLMの呼び出し）が中心の利用
+    "write_heavy": {
+        "GET /study/quiz": 10,
+        "POST /study/quiz-answer": 30,
+        "POST /practice/test_result": 25,
+        "POST /practice/conversation/ai-registration": 5,
+        "POST /recall/answer_recall_card": 15,
+        "POST /recall/answer_recall_cards": 15,
+    },
+}
+
+
+class TrafficMix:
+    """プロファイルの重みに従って、仮想ユーザーが次に送るリクエストを選ぶ"""
+
+    def __init__(self, profile: str, data: SeedResult):
+        weights = PROFILES[profile]
+        self.specs: List[RequestSpec] = [REQUEST_SPECS[name] for name in weights]
+        self.weights: List[int] = list(weights.values())
+        self.data = data
+
+    def next(self, user: SeededUser, rng: random.Random) -> Tuple[str, Request]:
+        spec = rng.choices(self.specs, weights=self.weights)[0]
+        return spec.name, spec.build(user, self.data, rng)
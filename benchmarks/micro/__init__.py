@@ -0,0 +1,12 @@
+"""ドメインの純粋なPythonの処理のマイクロベンチマーク（pytest-benchmark）
+
+実行方法:
+    # ベースラインとして保存する（.benchmarks/ に保存される）
+    pytest benchmarks/micro --benchmark-save=baseline
+    # 最新の保存結果と比較し、平均が20%以上遅くなったら失敗にする
+    pytest benchmarks/micro --benchmark-compare
+    # 比較するベースラインと閾値を指定する
+    pytest benchmarks/micro --benchmark-compare=0001 --benchmark-compare-fail=median:10%
+
+通常のテスト（pytest）では実行しない。
+"""
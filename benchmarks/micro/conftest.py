@@ -0,0 +1,16 @@
+import pytest
+from pytest_benchmark.utils import parse_compare_fail
+
+# --benchmark-compare-fail を指定せずに比較した場合に、回帰とみなす閾値
+DEFAULT_COMPARE_FAIL = ["mean:20%"]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config) -> None:
+    # pytest-benchmarkがオプションを読み込む前に既定の閾値を設定する
+    if config.getoption("benchmark_compare") and not config.getoption(
+        "benchmark_compare_fail"
+    ):
+        config.option.benchmark_compare_fail = [
+            parse_compare_fail(expression) for expression in DEFAULT_COMPARE_FAIL
+        ]
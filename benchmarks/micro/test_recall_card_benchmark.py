@@ -0,0 +1,45 @@
+import datetime
+import random
+from uuid import uuid4
+
+import pytest
+
+from app.domain.recall.reacall_card_entity import RecallCardEntity
+from benchmarks.practice_scoring import generate_sentence, perturb
+
+# 答案の単語数
+WORD_COUNTS = [5, 20, 100]
+
+
+def _card(answer: str) -> RecallCardEntity:
+    return RecallCardEntity(
+        recallCardId=uuid4(),
+        userId=uuid4(),
+        question="問題",
+        answer=answer,
+        correctPoint=3,
+        reviewDeadline=datetime.datetime.now(datetime.timezone.utc),
+    )
+
+
+class TestRecallCardBenchmark:
+    """RecallCardEntityの回答による更新のベンチマーク"""
+
+    @pytest.mark.parametrize("word_count", WORD_COUNTS)
+    def test_update_by_user_answer_correct(self, benchmark, word_count):
+        """正解（答案と一致）の場合"""
+        answer = generate_sentence(random.Random(word_count), word_count)
+        card = _card(answer)
+
+        result = benchmark(card.update_by_user_answer, answer)
+
+        assert result.correctPoint == 4
+
+    @pytest.mark.parametrize("word_count", WORD_COUNTS)
+    def test_update_by_user_answer_typo(self, benchmark, word_count):
+        """誤りを含む回答の場合"""
+        rng = random.Random(word_count)
+        answer = generate_sentence(rng, word_count)
+        card = _card(answer)
+
+        benchmark(card.update_by_user_answer, perturb(rng, answer))
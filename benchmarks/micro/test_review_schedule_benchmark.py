@@ -0,0 +1,46 @@
+import random
+from uuid import uuid4
+
+import pytest
+
+from app.domain.reviewSchedule.review_schedule_entity import ReviewScheduleEntity
+
+SCORE_COUNTS = [10, 100, 1000, 10000]
+
+
+def _scores(count: int) -> list:
+    rng = random.Random(count)
+    return [round(100 * rng.betavariate(5, 2)) for _ in range(count)]
+
+
+@pytest.fixture
+def schedule() -> ReviewScheduleEntity:
+    return ReviewScheduleEntity.create_first(userId=uuid4(), quizId=uuid4(), score=70)
+
+
+class TestReviewScheduleBenchmark:
+    """ReviewScheduleEntityの復習期限の計算のベンチマーク"""
+
+    @pytest.mark.parametrize("count", SCORE_COUNTS)
+    def test_update(self, benchmark, schedule, count):
+        """回答履歴の全スコアからの再計算"""
+        scores = _scores(count)
+
+        result = benchmark(schedule.update, scores)
+
+        assert result.answerCount == count
+
+    def test_reschedule(self, benchmark, schedule):
+        """データベースで加算した集計値だけを使った1回分の更新"""
+        incremented = schedule.model_copy(
+            update={
+                "answerCount": 2,
+                "scoreSum": 155,
+                "highScoreStreak": 1,
+                "lastScore": 85,
+            }
+        )
+
+        result = benchmark(incremented.reschedule)
+
+        assert result.answerCount == 2
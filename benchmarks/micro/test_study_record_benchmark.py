@@ -0,0 +1,70 @@
+import datetime
+import random
+from uuid import uuid4
+
+import pytest
+
+from app.domain.dashboard.learning_history_domain_service import (
+    LearningHistoryDomainService,
+)
+from app.domain.dashboard.learning_history_entity import LearningHistoryEntity
+from app.domain.studyRecord.dailyt_study_record_value_object import (
+    DailyStudyRecordValueObject,
+)
+from app.domain.studyRecord.study_record_entity import StudyRecordEntity
+
+# 学習記録の日数（毎日学習した場合が最も遅い）
+DAY_COUNTS = [30, 365, 3650]
+
+
+def _dates(count: int) -> list:
+    """今日から遡って連続した日付（リポジトリの取得順に依存しないよう並べ替える）"""
+    today = datetime.date.today()
+    dates = [today - datetime.timedelta(days=day) for day in range(count)]
+    random.Random(count).shuffle(dates)
+    return dates
+
+
+class TestStudyRecordBenchmark:
+    """StudyRecordEntityの連続学習日数の計算のベンチマーク"""
+
+    @pytest.mark.parametrize("count", DAY_COUNTS)
+    def test_get_continuous_learning_days(self, benchmark, count):
+        study_record = StudyRecordEntity(
+            studyRcordId=uuid4(),
+            userId=uuid4(),
+            dailyStudyRecords=[
+                DailyStudyRecordValueObject(date=date, studyTime=600)
+                for date in _dates(count)
+            ],
+        )
+
+        result = benchmark(study_record.getContinuousLearningDays)
+
+        assert result == count
+
+
+class TestLearningHistoryBenchmark:
+    """LearningHistoryDomainServiceの集計のベンチマーク"""
+
+    @pytest.mark.parametrize("count", DAY_COUNTS)
+    def test_summary(self, benchmark, count):
+        """ホーム画面に表示する集計をまとめて計算する"""
+        user_id = str(uuid4())
+        histories = [
+            LearningHistoryEntity(userId=user_id, date=date, learningTime=600)
+            for date in _dates(count)
+        ]
+
+        def summarize():
+            service = LearningHistoryDomainService(histories)
+            return (
+                service.get_total_learning_time(),
+                service.get_total_learning_time_in_this_week(),
+                service.get_continuous_learning_days(),
+                service.get_max_continuous_learning_days(),
+            )
+
+        result = benchmark(summarize)
+
+        assert result[3] == count
@@ -0,0 +1,38 @@
+import random
+from uuid import uuid4
+
+import pytest
+
+# pytestがテストクラスとして収集しないよう、モジュールとしてimportする
+from app.domain.practice import test_result_entity
+from benchmarks.practice_scoring import CONVERSATION_SIZES, generate_conversation
+
+ROUNDS = 50
+
+
+class TestTestResultBenchmark:
+    """TestResultEntity.factory（会話テストの採点）のベンチマーク"""
+
+    @pytest.mark.parametrize("word_count,message_count", CONVERSATION_SIZES)
+    def test_factory(self, benchmark, word_count, message_count):
+        """毎回異なる回答を採点する（トークン化のキャッシュに当たらない場合）"""
+        rng = random.Random(word_count * message_count)
+
+        def setup():
+            answers = [
+                {
+                    "message_order": order,
+                    "user_answer": user_answer,
+                    "correct_answer": correct_answer,
+                }
+                for order, (user_answer, correct_answer) in enumerate(
+                    generate_conversation(rng, word_count, message_count), start=1
+                )
+            ]
+            return (uuid4(), 1, answers), {}
+
+        result = benchmark.pedantic(
+            test_result_entity.TestResultEntity.factory, setup=setup, rounds=ROUNDS
+        )
+
+        assert len(result.message_scores) == message_count
@@ -0,0 +1,97 @@
+"""会話テストの採点処理のベンチマーク（difflibとSimilarityEngineの比較）
+
+実行方法:
+    python -m benchmarks.practice_scoring
+"""
+
+import difflib
+import random
+import re
+from typing import List, Tuple
+
+from app.domain.practice.similarity_engine import SimilarityEngine
+from benchmarks.utils import measure, print_table
+
+# (1メッセージあたりの単語数, 会話のメッセージ数)
+CONVERSATION_SIZES = [(8, 10), (20, 10), (50, 20), (150, 20)]
+REPEAT = 5
+
+VOCABULARY = (
+    "I you we they it is are was were have has do does did can could will would "
+    "the a an to of in on at for with about from this that these those my your "
+    "meeting tomorrow morning project schedule really think maybe please thanks "
+    "coffee station weekend travel restaurant reservation, order. sure! okay? "
+).split()
+
+
+def generate_sentence(rng: random.Random, word_count: int) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(word_count))
+
+
+def perturb(rng: random.Random, sentence: str, rate: float = 0.15) -> str:
+    """単語の置換・削除・タイプミスを加えてユーザーの回答らしくする"""
+    words = []
+    for word in sentence.split():
+        roll = rng.random()
+        if roll < rate / 3:
+            continue
+        if roll < rate * 2 / 3:
+            words.append(rng.choice(VOCABULARY))
+        elif roll < rate and len(word) > 1:
+            index = rng.randrange(len(word))
+            words.append(word[:index] + word[index + 1 :])
+        else:
+            words.append(word)
+    return " ".join(words)
+
+
+def generate_conversation(
+    rng: random.Random, word_count: int, message_count: int
+) -> List[Tuple[str, str]]:
+    pairs = []
+    for _ in range(message_count):
+        correct = generate_sentence(rng, word_count)
+        pairs.append((perturb(rng, correct), correct))
+    return pairs
+
+
+def grade_with_difflib(pairs: List[Tuple[str, str]]) -> None:
+    """変更前の実装と同じ処理（文字単位のratioとトークン単位のopcode）"""
+    for user_answer, correct_answer in pairs:
+        round(difflib.SequenceMatcher(None, user_answer, correct_answer).ratio() * 100)
+        user_tokens = re.findall(r"\b[\w\']+\b|[.,;!?]|\S", user_answer.strip())
+        correct_tokens = re.findall(r"\b[\w\']+\b|[.,;!?]|\S", correct_answer.strip())
+        difflib.SequenceMatcher(None, user_tokens, correct_tokens).get_opcodes()
+
+
+def grade_with_engine(pairs: List[Tuple[str, str]]) -> None:
+    """SimilarityEngine（トークン化の結果をキャッシュする）で1組ずつ採点する"""
+    for user_answer, correct_answer in pairs:
+        SimilarityEngine.similarity(user_answer, correct_answer)
+        SimilarityEngine.diff_opcodes(
+            SimilarityEngine.tokenize(user_answer),
+            SimilarityEngine.tokenize(correct_answer),
+        )
+
+
+def main() -> None:
+    rng = random.Random(0)
+    rows = []
+    for word_count, message_count in CONVERSATION_SIZES:
+        pairs = generate_conversation(rng, word_count, message_count)
+        difflib_result = measure(lambda: grade_with_difflib(pairs), REPEAT)
+        engine_result = measure(lambda: grade_with_engine(pairs), REPEAT)
+        rows.append(
+            {
+                "words/message": word_count,
+                "messages": message_count,
+                "difflib_median_ms": difflib_result["median_ms"],
+                "engine_median_ms": engine_result["median_ms"],
+                "speedup": difflib_result["median_ms"] / engine_result["median_ms"],
+            }
+        )
+    print_table("会話テストの採点（1会話あたり）", rows)
+
+
+if __name__ == "__main__":
+    main()
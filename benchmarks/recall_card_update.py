@@ -0,0 +1,114 @@
+"""暗記カード更新のベンチマーク（1行ずつのUPDATEと一括UPDATEの比較）
+
+実行方法:
+    python -m benchmarks.recall_card_update
+
+ASYNC_DATABASE_URL で指定したデータベースにベンチマーク用のユーザーと
+暗記カードを作成し、計測後に削除する。
+"""
+
+import asyncio
+import datetime
+from typing import List
+from uuid import uuid4
+
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.domain.recall.reacall_card_entity import RecallCardEntity
+from app.repository.recall_card_postgres_repository import (
+    RecallCardPostgresRepository,
+)
+from app.schema.models import RecallCards, Users
+from benchmarks.utils import measure_async, print_table
+
+CARD_COUNTS = [10, 100, 1000]
+REPEAT = 5
+
+
+async def update_per_row(db: AsyncSession, recall_cards: List[RecallCardEntity]):
+    """従来の実装と同じく1枚ずつUPDATEを発行する"""
+    for recall_card in recall_cards:
+        await db.execute(
+            update(RecallCards)
+            .where(RecallCards.recall_card_id == recall_card.recallCardId)
+            .values(
+                question=recall_card.question,
+                answer=recall_card.answer,
+                correct_point=recall_card.correctPoint,
+                review_deadline=recall_card.reviewDeadline,
+            )
+        )
+    await db.commit()
+
+
+async def main() -> None:
+    engine = create_async_engine(settings.ASYNC_DATABASE_URL)
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    user_id = uuid4()
+    rows = []
+    async with session_factory() as db:
+        db.add(
+            Users(
+                id=user_id,
+                email=f"bench-{user_id}@example.com",
+                hashed_password="benchmark",
+            )
+        )
+        await db.commit()
+
+        try:
+            for count in CARD_COUNTS:
+                now = datetime.datetime.now(datetime.timezone.utc)
+                recall_cards = [
+                    RecallCardEntity(
+                        recallCardId=uuid4(),
+                        userId=user_id,
+                        question=f"質問{i}",
+                        answer=f"Answer {i}",
+                        correctPoint=0,
+                        reviewDeadline=now,
+                    )
+                    for i in range(count)
+                ]
+                repository = RecallCardPostgresRepository(db)
+                await repository.createAll(recall_cards)
+
+                # 毎回値が変わるように正解ポイントを加算してから更新する
+                def next_cards() -> List[RecallCardEntity]:
+                    nonlocal recall_cards
+                    recall_cards = [
+                        card.model_copy(update={"correctPoint": card.correctPoint + 1})
+                        for card in recall_cards
+                    ]
+                    return recall_cards
+
+                per_row = await measure_async(
+                    lambda: update_per_row(db, next_cards()), REPEAT
+                )
+                bulk = await measure_async(
+                    lambda: repository.updateAll(next_cards()), REPEAT
+                )
+                rows.append(
+                    {
+                        "cards": count,
+                        "per_row_median_ms": per_row["median_ms"],
+                        "bulk_median_ms": bulk["median_ms"],
+                        "speedup": per_row["median_ms"] / bulk["median_ms"],
+                    }
+                )
+        finally:
+            await db.execute(delete(RecallCards).where(RecallCards.user_id == user_id))
+            await db.execute(delete(Users).where(Users.id == user_id))
+            await db.commit()
+
+    await engine.dispose()
+    print_table("RecallCardPostgresRepository.updateAll", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""記録したトレースをウォーターフォールで表示する
+
+実行方法:
+    TRACING_EXPORTER=jsonl TRACING_SAMPLE_RATE=1 uvicorn app.main:app
+    python -m benchmarks.trace_waterfall traces/spans.jsonl --name "POST /study/quiz-answer"
+
+TRACING_EXPORTER=jsonl で書き出したスパンのファイルから、--trace-id で指定したトレース
+（省略した場合は、--name に一致するルートのスパンを持つ最新のトレース）を表示する。
+負荷試験（benchmarks.load_test）のサーバーにも同じ環境変数を指定して記録できる。
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from app.core.tracing import SPAN_KIND_SERVER, render_waterfall
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="トレースをウォーターフォールで表示する"
+    )
+    parser.add_argument("path", nargs="?", default="traces/spans.jsonl")
+    parser.add_argument("--trace-id", help="表示するトレースのID")
+    parser.add_argument(
+        "--name",
+        help="ルートのスパンの名前（例: POST /practice/conversation/ai-registration）",
+    )
+    parser.add_argument("--width", type=int, default=60)
+    return parser.parse_args()
+
+
+def load_traces(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """トレースIDごとのスパン（ファイルに書き出した順）"""
+    traces: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces[span["traceId"]].append(span)
+    return traces
+
+
+def main() -> None:
+    args = parse_args()
+    traces = load_traces(args.path)
+
+    if args.trace_id:
+        spans = traces.get(args.trace_id, [])
+    else:
+        # 書き出しはリクエストの終了順のため、後ろにあるものほど新しい
+        candidates = [
+            spans
+            for spans in traces.values()
+            if not args.name
+            or any(
+                span["name"] == args.name and span["kind"] == SPAN_KIND_SERVER
+                for span in spans
+            )
+        ]
+        spans = candidates[-1] if candidates else []
+
+    if not spans:
+        print("該当するトレースがありません")
+        return
+    print(render_waterfall(spans, args.width))
+
+
+if __name__ == "__main__":
+    main()
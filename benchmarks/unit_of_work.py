@@ -0,0 +1,135 @@
+"""会話セット登録時のDB書き込みのベンチマーク（リポジトリごとのコミットと作業単位の比較）
+
+ai_registration と同じく、会話セット・メッセージ・暗記カードを保存する処理を
+リポジトリごとにコミットする場合と、作業単位で1回だけコミットする場合で比較する。
+
+実行方法:
+    python -m benchmarks.unit_of_work
+
+ASYNC_DATABASE_URL で指定したデータベースにベンチマーク用のユーザーと
+会話セットを作成し、計測後に削除する。
+"""
+
+import asyncio
+import datetime
+from typing import List, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.domain.practice.conversation_entity import ConversationEntity, MessageEntity
+from app.domain.recall.reacall_card_entity import RecallCardEntity
+from app.repository.postgres_unit_of_work import PostgresUnitOfWork
+from app.repository.practice_postgres_repository import PracticePostgresRepository
+from app.repository.recall_card_postgres_repository import (
+    RecallCardPostgresRepository,
+)
+from app.schema.models import Conversations, Messages, RecallCards, Users
+from benchmarks.utils import measure_async, print_table
+
+MESSAGE_COUNT = 8
+REPEAT = 20
+
+
+def generate(
+    user_id: UUID,
+) -> Tuple[ConversationEntity, List[RecallCardEntity]]:
+    """ai_registration が作成するものと同じ形の会話セットと暗記カードを作成する"""
+    conversation_id = uuid4()
+    now = datetime.datetime.now()
+    messages = [
+        MessageEntity(
+            conversationId=conversation_id,
+            messageOrder=i + 1,
+            speakerNumber=i % 2,
+            messageEn=f"This is message number {i}.",
+            messageJa=f"これは{i}番目のメッセージです。",
+            createdAt=now,
+        )
+        for i in range(MESSAGE_COUNT)
+    ]
+    conversation = ConversationEntity(
+        id=conversation_id,
+        userId=user_id,
+        title="ベンチマーク",
+        order=0,
+        createdAt=now,
+        messages=messages,
+    )
+    recall_cards = [
+        RecallCardEntity(
+            recallCardId=uuid4(),
+            userId=user_id,
+            question=message.messageJa,
+            answer=message.messageEn,
+            correctPoint=0,
+            reviewDeadline=now,
+        )
+        for message in messages
+    ]
+    return conversation, recall_cards
+
+
+async def save_separately(db: AsyncSession, user_id: UUID) -> None:
+    """変更前と同じくリポジトリごとにコミットする"""
+    conversation, recall_cards = generate(user_id)
+    await PracticePostgresRepository(db).create(conversation)
+    await RecallCardPostgresRepository(db).createAll(recall_cards)
+
+
+async def save_in_unit_of_work(db: AsyncSession, user_id: UUID) -> None:
+    conversation, recall_cards = generate(user_id)
+    async with PostgresUnitOfWork(db).transaction():
+        await PracticePostgresRepository(db).create(conversation)
+        await RecallCardPostgresRepository(db).createAll(recall_cards)
+
+
+async def cleanup(db: AsyncSession, user_id: UUID) -> None:
+    conversation_ids = select(Conversations.id).where(Conversations.user_id == user_id)
+    await db.execute(
+        delete(Messages).where(Messages.conversation_id.in_(conversation_ids))
+    )
+    await db.execute(delete(Conversations).where(Conversations.user_id == user_id))
+    await db.execute(delete(RecallCards).where(RecallCards.user_id == user_id))
+    await db.commit()
+
+
+async def main() -> None:
+    engine = create_async_engine(settings.ASYNC_DATABASE_URL)
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    user_id = uuid4()
+    rows = []
+    async with session_factory() as db:
+        db.add(
+            Users(
+                id=user_id,
+                email=f"bench-{user_id}@example.com",
+                hashed_password="benchmark",
+            )
+        )
+        await db.commit()
+
+        try:
+            for name, method in [
+                ("commit per repository", save_separately),
+                ("unit of work", save_in_unit_of_work),
+            ]:
+                result = await measure_async(lambda: method(db, user_id), REPEAT)
+                rows.append({"method": name, **result})
+                await cleanup(db, user_id)
+        finally:
+            await cleanup(db, user_id)
+            await db.execute(delete(Users).where(Users.id == user_id))
+            await db.commit()
+
+    await engine.dispose()
+    print_table(f"会話セット登録（メッセージ{MESSAGE_COUNT}件）のDB書き込み", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
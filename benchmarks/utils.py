@@ -0,0 +1,53 @@
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+
+def _summarize(durations: List[float]) -> Dict[str, float]:
+    return {
+        "min_ms": min(durations),
+        "median_ms": statistics.median(durations),
+        "max_ms": max(durations),
+    }
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> Dict[str, float]:
+    """処理をrepeat回実行し、所要時間（ミリ秒）の統計値を返す"""
+    durations: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    return _summarize(durations)
+
+
+async def measure_async(
+    func: Callable[[], Awaitable[object]], repeat: int = 5
+) -> Dict[str, float]:
+    """非同期処理をrepeat回実行し、所要時間（ミリ秒）の統計値を返す"""
+    durations: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    return _summarize(durations)
+
+
+def print_table(title: str, rows: List[Dict[str, object]]) -> None:
+    """計測結果を表形式で出力する"""
+    print(f"\n## {title}")
+    if not rows:
+        return
+
+    headers = list(rows[0].keys())
+    print(" | ".join(headers))
+    print(" | ".join("---" for _ in headers))
+    for row in rows:
+        print(
+            " | ".join(
+                f"{value:.2f}" if isinstance(value, float) else str(value)
+                for value in row.values()
+            )
+        )
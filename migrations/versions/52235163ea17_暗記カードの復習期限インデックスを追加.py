@@ -0,0 +1,36 @@
+"""暗記カードの復習期限インデックスを追加
+
+Revision ID: 52235163ea17
+Revises: 07bf809c98bc
+Create Date: 2026-10-19 09:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '52235163ea17'
+down_revision: Union[str, None] = '07bf809c98bc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 期限順のキーセットページング (review_deadline, recall_card_id) をインデックスだけで辿れるよう、
+# 同じ期限のカードの並び順になる recall_card_id も含める
+INDEX_NAME = 'ix_recall_cards_user_id_review_deadline_recall_card_id'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY はトランザクション内で実行できないため autocommit で作成する
+    with op.get_context().autocommit_block():
+        op.create_index(INDEX_NAME, 'recall_cards', ['user_id', 'review_deadline', 'recall_card_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX_NAME, table_name='recall_cards', postgresql_concurrently=True, if_exists=True)
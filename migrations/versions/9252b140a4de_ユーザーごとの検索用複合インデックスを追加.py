@@ -0,0 +1,44 @@
+"""ユーザーごとの検索用複合インデックスを追加
+
+Revision ID: 9252b140a4de
+Revises: 52235163ea17
+Create Date: 2026-10-19 10:03:47.581934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9252b140a4de'
+down_revision: Union[str, None] = '52235163ea17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (インデックス名, テーブル名, カラム)
+# recall_cards (user_id, review_deadline, recall_card_id) は 52235163ea17 で追加済み
+INDEXES = [
+    ('ix_user_answers_user_id_quiz_id', 'user_answers', ['user_id', 'quiz_id']),
+    ('ix_review_schedules_user_id_quiz_id', 'review_schedules', ['user_id', 'quiz_id']),
+    ('ix_review_schedules_user_id_review_deadline', 'review_schedules', ['user_id', 'review_deadline']),
+    ('ix_conversations_user_id_created_at', 'conversations', ['user_id', sa.text('created_at DESC')]),
+    ('ix_verification_codes_email_is_used_expires_at', 'verification_codes', ['email', 'is_used', 'expires_at']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY はトランザクション内で実行できないため、
+    # テーブルをロックしないよう autocommit で1つずつ作成する
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,30 @@
+"""メッセージのトークン列を追加
+
+Revision ID: b3e1c9d4a7f2
+Revises: 9252b140a4de
+Create Date: 2026-10-19 11:20:15.204861
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e1c9d4a7f2'
+down_revision: Union[str, None] = '9252b140a4de'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 既存のメッセージはNULLのままとし、採点時に従来通りトークン化する
+    op.add_column('messages', sa.Column('message_en_tokens', postgresql.ARRAY(sa.String()), nullable=True, comment='英語メッセージのトークン列'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('messages', 'message_en_tokens')
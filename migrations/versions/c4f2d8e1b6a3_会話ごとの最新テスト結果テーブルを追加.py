@@ -0,0 +1,58 @@
+"""会話ごとの最新テスト結果テーブルを追加
+
+Revision ID: c4f2d8e1b6a3
+Revises: b3e1c9d4a7f2
+Create Date: 2026-10-19 12:05:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f2d8e1b6a3'
+down_revision: Union[str, None] = 'b3e1c9d4a7f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('conversation_latest_test_results',
+    sa.Column('conversation_id', sa.UUID(), nullable=False),
+    sa.Column('test_number', sa.Integer(), nullable=False),
+    sa.Column('test_score', sa.Float(), nullable=False),
+    sa.Column('message_scores', postgresql.ARRAY(sa.Float()), nullable=False, comment='メッセージの順番に並べたスコア'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ),
+    sa.PrimaryKeyConstraint('conversation_id')
+    )
+    # 既存のテスト結果から会話ごとの最新の結果を作成する
+    op.execute(
+        '''
+        INSERT INTO conversation_latest_test_results
+            (conversation_id, test_number, test_score, message_scores, updated_at)
+        SELECT DISTINCT ON (t.conversation_id)
+            t.conversation_id,
+            t.test_number,
+            t.test_score,
+            ARRAY(
+                SELECT m.score
+                FROM message_test_scores m
+                WHERE m.conversation_id = t.conversation_id
+                  AND m.test_number = t.test_number
+                ORDER BY m.message_order
+            ),
+            t.created_at
+        FROM conversation_test_scores t
+        ORDER BY t.conversation_id, t.test_number DESC
+        '''
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('conversation_latest_test_results')
@@ -0,0 +1,68 @@
+"""復習スケジュールをユーザーとクイズで一意にする
+
+Revision ID: d5a3e9f2c7b4
+Revises: c4f2d8e1b6a3
+Create Date: 2026-10-19 14:21:09.542871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a3e9f2c7b4'
+down_revision: Union[str, None] = 'c4f2d8e1b6a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEX_NAME = 'ix_review_schedules_user_id_quiz_id'
+# 作成中の新しいインデックスの名前（作成後に元の名前へ変更する）
+NEW_INDEX_NAME = 'ix_review_schedules_user_id_quiz_id_new'
+
+
+def _replace_index(unique: bool) -> None:
+    """ユーザー・クイズのインデックスを作り直す
+
+    CREATE INDEX CONCURRENTLY はトランザクション内で実行できないため、
+    テーブルをロックしないよう autocommit で新しいインデックスを作成してから古いものと入れ替える。
+    作成に失敗した場合は無効なインデックスが残るため、再実行時に先に削除する。
+    """
+    with op.get_context().autocommit_block():
+        op.drop_index(NEW_INDEX_NAME, table_name='review_schedules', postgresql_concurrently=True, if_exists=True)
+        op.create_index(NEW_INDEX_NAME, 'review_schedules', ['user_id', 'quiz_id'], unique=unique, postgresql_concurrently=True)
+        op.drop_index(INDEX_NAME, table_name='review_schedules', postgresql_concurrently=True, if_exists=True)
+        op.execute(f'ALTER INDEX {NEW_INDEX_NAME} RENAME TO {INDEX_NAME}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 同じユーザー・クイズの復習スケジュールが重複している場合は最後に更新されたものを残す
+    # （更新日時・作成日時が同じ場合も結果が変わらないよう、主キーで順序を決める）
+    op.execute(
+        '''
+        DELETE FROM review_schedules r
+        USING (
+            SELECT review_schedule_id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY user_id, quiz_id
+                       ORDER BY updated_at DESC NULLS LAST,
+                                created_at DESC NULLS LAST,
+                                review_schedule_id DESC
+                   ) AS rn
+            FROM review_schedules
+        ) d
+        WHERE r.review_schedule_id = d.review_schedule_id
+          AND d.rn > 1
+        '''
+    )
+    # 削除から作成までの間に重複が登録されると一意インデックスの作成に失敗する。
+    # その場合は再実行すれば、重複の削除からやり直す
+    _replace_index(unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_index(unique=False)
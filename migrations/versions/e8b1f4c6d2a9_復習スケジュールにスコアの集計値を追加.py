@@ -0,0 +1,71 @@
+"""復習スケジュールにスコアの集計値を追加
+
+Revision ID: e8b1f4c6d2a9
+Revises: d5a3e9f2c7b4
+Create Date: 2026-10-19 15:02:37.186420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b1f4c6d2a9'
+down_revision: Union[str, None] = 'd5a3e9f2c7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('review_schedules', sa.Column('answer_count', sa.Integer(), server_default='0', nullable=False, comment='回答数'))
+    op.add_column('review_schedules', sa.Column('score_sum', sa.Integer(), server_default='0', nullable=False, comment='スコアの合計'))
+    op.add_column('review_schedules', sa.Column('high_score_streak', sa.Integer(), server_default='0', nullable=False, comment='直近の連続高得点の回数'))
+    op.add_column('review_schedules', sa.Column('low_score_streak', sa.Integer(), server_default='0', nullable=False, comment='直近の連続低得点の回数'))
+    op.add_column('review_schedules', sa.Column('last_score', sa.Integer(), nullable=True, comment='最新スコア'))
+    # 既存の回答履歴から集計値を作成する
+    # 連続回数は、新しい順に並べて最初に条件を満たさなくなる回答の順位から求める
+    op.execute(
+        '''
+        UPDATE review_schedules r
+        SET answer_count = s.answer_count,
+            score_sum = s.score_sum,
+            high_score_streak = s.high_score_streak,
+            low_score_streak = s.low_score_streak,
+            last_score = s.last_score
+        FROM (
+            SELECT user_id,
+                   quiz_id,
+                   COUNT(*) AS answer_count,
+                   SUM(score) AS score_sum,
+                   COALESCE(MIN(rn) FILTER (WHERE score < 80), COUNT(*) + 1) - 1
+                       AS high_score_streak,
+                   COALESCE(MIN(rn) FILTER (WHERE score >= 50), COUNT(*) + 1) - 1
+                       AS low_score_streak,
+                   MAX(score) FILTER (WHERE rn = 1) AS last_score
+            FROM (
+                SELECT user_id,
+                       quiz_id,
+                       score,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY user_id, quiz_id ORDER BY created_at DESC
+                       ) AS rn
+                FROM user_answers
+            ) a
+            GROUP BY user_id, quiz_id
+        ) s
+        WHERE r.user_id = s.user_id
+          AND r.quiz_id = s.quiz_id
+        '''
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('review_schedules', 'last_score')
+    op.drop_column('review_schedules', 'low_score_streak')
+    op.drop_column('review_schedules', 'high_score_streak')
+    op.drop_column('review_schedules', 'score_sum')
+    op.drop_column('review_schedules', 'answer_count')
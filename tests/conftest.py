@@ -0,0 +1,9 @@
+import os
+
+# app.core.database はインポート時にエンジンを作成する（接続はしない）ため、
+# データベースを使わないテストでもサービスやエンドポイントを読み込めるように
+# 接続先を設定しておく。TEST_DATABASE_URL がある場合は tests/repository/conftest.py が設定する
+if not os.environ.get("TEST_DATABASE_URL"):
+    os.environ.setdefault(
+        "ASYNC_DATABASE_URL", "postgresql+asyncpg://localhost/eigoat_test"
+    )
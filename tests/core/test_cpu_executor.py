@@ -0,0 +1,121 @@
+import datetime
+import os
+from uuid import UUID
+
+import pytest
+
+from app.core.cpu_executor import CpuExecutor
+from app.domain.recall.reacall_card_entity import RecallCardEntity
+from app.services.practice_service import PracticeService
+from app.services.recall_card_service import RecallCardService
+
+THRESHOLD = 100
+
+CONVERSATION_ID = UUID("123e4567-e89b-12d3-a456-426614174000")
+ANSWERS = [
+    {
+        "message_order": 1,
+        "user_answer": "I go to the park yesterday.",
+        "correct_answer": "I went to the park yesterday.",
+        "correct_tokens": ["I", "went", "to", "the", "park", "yesterday", "."],
+    },
+    {
+        "message_order": 2,
+        "user_answer": "It was sunny",
+        "correct_answer": "It was sunny and warm.",
+        "correct_tokens": None,
+    },
+]
+
+
+def create_recall_card(index: int) -> RecallCardEntity:
+    return RecallCardEntity(
+        recallCardId=UUID(int=index + 1),
+        userId=UUID("123e4567-e89b-12d3-a456-426614174001"),
+        question=f"Question {index}",
+        answer="Paris",
+        correctPoint=2,
+        reviewDeadline=datetime.datetime(2026, 10, 1, 12, 0, 0),
+    )
+
+
+@pytest.fixture(scope="module")
+def executor():
+    # 本番と同じくspawnで起動したワーカープロセスを使う
+    executor = CpuExecutor(max_workers=1, threshold=THRESHOLD)
+    executor.start()
+    yield executor
+    executor.shutdown()
+
+
+class TestCpuExecutor:
+    """CpuExecutorクラスのテストケース"""
+
+    @pytest.mark.asyncio
+    async def test_runs_inline_without_workers(self):
+        """ワーカー数が0の場合はプロセスプールを作らずその場で実行することをテスト"""
+        executor = CpuExecutor(max_workers=0, threshold=0)
+        executor.start()
+        assert not executor.is_running
+        assert await executor.run(10**9, os.getpid) == os.getpid()
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_runs_inline_below_threshold(self, executor):
+        """閾値未満の場合はワーカープロセスではなくその場で実行することをテスト"""
+        assert executor.is_running
+        assert await executor.run(THRESHOLD - 1, os.getpid) == os.getpid()
+
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_at_threshold(self, executor):
+        """閾値以上の場合はワーカープロセスで実行することをテスト"""
+        assert await executor.run(THRESHOLD, os.getpid) != os.getpid()
+
+    @pytest.mark.asyncio
+    async def test_grade_round_trip(self, executor):
+        """採点の引数と結果がワーカープロセスとの間で受け渡せることをテスト"""
+        for structured_diff in (False, True):
+            expected_result, expected_diffs = PracticeService._grade(
+                CONVERSATION_ID, 3, ANSWERS, structured_diff=structured_diff
+            )
+            test_result, diffs = await executor.run(
+                THRESHOLD,
+                PracticeService._grade,
+                CONVERSATION_ID,
+                3,
+                ANSWERS,
+                structured_diff=structured_diff,
+            )
+            # 作成日時は実行した時刻になる
+            exclude = {"created_at"}
+            assert test_result.model_dump(exclude=exclude) == (
+                expected_result.model_dump(exclude=exclude)
+            )
+            assert diffs == expected_diffs
+
+    @pytest.mark.asyncio
+    async def test_apply_answers_round_trip(self, executor):
+        """暗記カードの回答の適用がワーカープロセスで同じ結果になることをテスト"""
+        recall_cards = [create_recall_card(index) for index in range(2)]
+        recall_card_map = {card.recallCardId: card for card in recall_cards}
+        answers = [
+            (recall_cards[0].recallCardId, "Paris"),
+            (recall_cards[1].recallCardId, "London"),
+            (recall_cards[0].recallCardId, "Paris"),
+        ]
+
+        result = await executor.run(
+            THRESHOLD, RecallCardService._apply_answers, recall_card_map, answers
+        )
+        assert result == RecallCardService._apply_answers(recall_card_map, answers)
+        assert result[recall_cards[0].recallCardId].correctPoint == 4
+
+    def test_shutdown(self):
+        """終了後はその場で実行する状態に戻ることをテスト"""
+        executor = CpuExecutor(max_workers=1, threshold=0)
+        executor.start()
+        assert executor.is_running
+        executor.shutdown()
+        assert not executor.is_running
+        # 2回目の終了は何もしない
+        executor.shutdown()
@@ -0,0 +1,126 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import (
+    FakeListChatModel,
+    GenericFakeChatModel,
+)
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from prometheus_client import REGISTRY
+
+from app.core.llm_metrics import (
+    UNKNOWN_MODEL,
+    estimate_cost,
+    get_token_usage,
+    register_llm_metrics,
+)
+from app.core.metrics import MetricsMiddleware, UNMATCHED_ROUTE
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture(autouse=True)
+def registered():
+    register_llm_metrics()
+
+
+class TestLLMMetrics:
+    """LLMの呼び出しのメトリクスのテストケース"""
+
+    def test_records_calls_without_explicit_callbacks(self):
+        """コールバックを渡していない呼び出しも記録することをテスト"""
+        before = _sample(
+            "llm_requests_total",
+            route=UNMATCHED_ROUTE,
+            model=UNKNOWN_MODEL,
+            status="success",
+        )
+
+        FakeListChatModel(responses=["hello"]).invoke("hi")
+
+        assert (
+            _sample(
+                "llm_requests_total",
+                route=UNMATCHED_ROUTE,
+                model=UNKNOWN_MODEL,
+                status="success",
+            )
+            == before + 1
+        )
+
+    def test_records_time_to_first_token_for_streams(self):
+        """ストリーミングで最初のトークンまでの時間を1回だけ記録することをテスト"""
+        before = _sample(
+            "llm_time_to_first_token_seconds_count",
+            route=UNMATCHED_ROUTE,
+            model=UNKNOWN_MODEL,
+        )
+
+        model = GenericFakeChatModel(messages=iter([AIMessage(content="a b c")]))
+        list(model.stream("hi"))
+
+        assert (
+            _sample(
+                "llm_time_to_first_token_seconds_count",
+                route=UNMATCHED_ROUTE,
+                model=UNKNOWN_MODEL,
+            )
+            == before + 1
+        )
+
+    def test_tags_calls_with_route(self):
+        """エンドポイントから呼び出した場合はルートのテンプレートで記録することをテスト"""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.post("/llm-test/{item_id}")
+        async def call_llm(item_id: str):
+            await FakeListChatModel(responses=["hello"]).ainvoke("hi")
+            return {}
+
+        route = "/llm-test/{item_id}"
+        before = _sample(
+            "llm_requests_total", route=route, model=UNKNOWN_MODEL, status="success"
+        )
+
+        TestClient(app).post("/llm-test/1")
+
+        assert (
+            _sample(
+                "llm_requests_total",
+                route=route,
+                model=UNKNOWN_MODEL,
+                status="success",
+            )
+            == before + 1
+        )
+
+    def test_get_token_usage_from_usage_metadata(self):
+        """usage_metadataからトークン数を取得することをテスト"""
+        message = AIMessage(
+            content="hello",
+            usage_metadata={"input_tokens": 12, "output_tokens": 5, "total_tokens": 17},
+        )
+        response = LLMResult(generations=[[ChatGeneration(message=message)]])
+
+        assert get_token_usage(response) == (12, 5)
+
+    def test_get_token_usage_from_llm_output(self):
+        """usage_metadataがない場合はllm_outputから取得することをテスト"""
+        response = LLMResult(
+            generations=[[ChatGeneration(message=AIMessage(content="hello"))]],
+            llm_output={"token_usage": {"prompt_tokens": 7, "completion_tokens": 3}},
+        )
+
+        assert get_token_usage(response) == (7, 3)
+
+    def test_estimate_cost(self):
+        """日付付きのモデル名でも最も長く一致する料金で計算することをテスト"""
+        # gpt-4.1-mini: 入力0.40、出力1.60（100万トークンあたり）
+        assert estimate_cost("gpt-4.1-mini-2025-04-14", 1_000_000, 500_000) == (
+            pytest.approx(0.40 + 0.80)
+        )
+        assert estimate_cost("unknown-model", 100, 100) is None
@@ -0,0 +1,95 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core.metrics import MetricsMiddleware, UNMATCHED_ROUTE, render_metrics
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics-test/items/{item_id}")
+    async def get_item(item_id: str):
+        if item_id == "missing":
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    return TestClient(app)
+
+
+class TestMetricsMiddleware:
+    """MetricsMiddlewareのテストケース"""
+
+    def test_counts_by_route_template_and_status(self, client):
+        """パスではなくルートのテンプレートとステータスごとに数えることをテスト"""
+        route = "/metrics-test/items/{item_id}"
+        ok_before = _sample(
+            "http_requests_total", method="GET", route=route, status="200"
+        )
+        missing_before = _sample(
+            "http_requests_total", method="GET", route=route, status="404"
+        )
+
+        client.get(f"/metrics-test/items/{uuid4()}")
+        client.get(f"/metrics-test/items/{uuid4()}")
+        client.get("/metrics-test/items/missing")
+
+        assert (
+            _sample("http_requests_total", method="GET", route=route, status="200")
+            == ok_before + 2
+        )
+        assert (
+            _sample("http_requests_total", method="GET", route=route, status="404")
+            == missing_before + 1
+        )
+        assert (
+            _sample("http_request_duration_seconds_count", method="GET", route=route)
+            >= 3
+        )
+        # 処理が終わったリクエストは処理中の数に含まれない
+        assert (
+            _sample(
+                "http_requests_in_progress", method="GET", route_group="/metrics-test"
+            )
+            == 0
+        )
+
+    def test_unmatched_path_uses_single_label(self, client):
+        """どのルートにも一致しないパスは1つのラベルにまとめることをテスト"""
+        before = _sample(
+            "http_requests_total", method="GET", route=UNMATCHED_ROUTE, status="404"
+        )
+
+        client.get(f"/unknown/{uuid4()}")
+
+        assert (
+            _sample(
+                "http_requests_total",
+                method="GET",
+                route=UNMATCHED_ROUTE,
+                status="404",
+            )
+            == before + 1
+        )
+        assert (
+            _sample("http_requests_in_progress", method="GET", route_group="<other>")
+            == 0
+        )
+
+    def test_render_metrics(self, client):
+        """Prometheusのテキスト形式で出力することをテスト"""
+        client.get(f"/metrics-test/items/{uuid4()}")
+
+        content, media_type = render_metrics()
+
+        assert media_type.startswith("text/plain")
+        assert b'route="/metrics-test/items/{item_id}"' in content
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import Counter
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.profiler import (
+    PROFILE_HEADER,
+    PROFILE_ID_HEADER,
+    ProfilerMiddleware,
+    StackSampler,
+    render_flamegraph,
+)
+
+
+def busy_loop(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _create_app(output_dir: str, sample_rate: float = 0.0) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        ProfilerMiddleware,
+        output_dir=output_dir,
+        sample_rate=sample_rate,
+        interval=0.001,
+    )
+
+    @app.get("/busy")
+    async def busy():
+        busy_loop(0.05)
+        return {}
+
+    return app
+
+
+class TestStackSampler:
+    """StackSamplerのテストケース"""
+
+    def test_samples_target_thread(self):
+        """対象スレッドで実行中の関数のスタックを取得することをテスト"""
+        sampler = StackSampler(threading.get_ident(), interval=0.001)
+        sampler.start()
+        busy_loop(0.05)
+        stacks = sampler.stop()
+
+        assert sum(stacks.values()) > 0
+        assert any("busy_loop" in stack for stack in stacks)
+
+
+class TestRenderFlamegraph:
+    """render_flamegraphのテストケース"""
+
+    def test_renders_frames(self):
+        """各フレームを描画することをテスト"""
+        stacks = Counter({"main;handler;grade": 3, "main;handler;hash": 1})
+
+        svg = render_flamegraph(stacks, title="test")
+
+        assert svg.startswith("<svg")
+        assert "4 samples" in svg
+        assert "grade (3 samples, 75.0%)" in svg
+        assert "hash (1 samples, 25.0%)" in svg
+
+
+class TestProfilerMiddleware:
+    """ProfilerMiddlewareのテストケース"""
+
+    def test_profiles_request_with_admin_header(self, tmp_path, monkeypatch):
+        """管理者トークンのヘッダを指定したリクエストのプロファイルを保存することをテスト"""
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+        client = TestClient(_create_app(str(tmp_path)))
+
+        response = client.get("/busy", headers={PROFILE_HEADER: "secret"})
+
+        name = response.headers[PROFILE_ID_HEADER]
+        collapsed = (tmp_path / f"{name}.collapsed.txt").read_text(encoding="utf-8")
+        assert "busy_loop" in collapsed
+        assert (tmp_path / f"{name}.svg").exists()
+
+    def test_ignores_wrong_token(self, tmp_path, monkeypatch):
+        """トークンが一致しない場合はプロファイルしないことをテスト"""
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+        client = TestClient(_create_app(str(tmp_path)))
+
+        response = client.get("/busy", headers={PROFILE_HEADER: "wrong"})
+
+        assert PROFILE_ID_HEADER not in response.headers
+        assert list(tmp_path.iterdir()) == []
+
+    def test_profiles_sampled_requests(self, tmp_path, monkeypatch):
+        """サンプリングの割合を指定した場合はヘッダなしでもプロファイルすることをテスト"""
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+        client = TestClient(_create_app(str(tmp_path), sample_rate=1.0))
+
+        response = client.get("/busy")
+
+        assert PROFILE_ID_HEADER in response.headers
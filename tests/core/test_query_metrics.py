@@ -0,0 +1,117 @@
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.query_metrics import (
+    QUERY_BUDGET_ACTION_RAISE,
+    QueryBudgetExceededError,
+    QueryMetricsMiddleware,
+    instrument_engine,
+    query_budget,
+)
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+    yield engine
+    await engine.dispose()
+
+
+async def _run_queries(engine, count: int) -> None:
+    async with engine.connect() as conn:
+        for _ in range(count):
+            await conn.execute(text("SELECT 1"))
+
+
+def _create_app(engine, action: str) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        QueryMetricsMiddleware,
+        budgets={"GET /items/{count}": 2},
+        action=action,
+    )
+
+    @app.get("/items/{count}")
+    async def get_items(count: int, fail: bool = False):
+        await _run_queries(engine, count)
+        if fail:
+            raise ValueError("failed")
+        return {"count": count}
+
+    return app
+
+
+class TestQueryBudget:
+    """query_budgetのテストケース"""
+
+    @pytest.mark.asyncio
+    async def test_counts_queries(self, engine):
+        """ブロック内のクエリ数と実行時間を数えることをテスト"""
+        with query_budget(3) as stats:
+            await _run_queries(engine, 3)
+
+        assert stats.count == 3
+        assert stats.duration > 0
+
+    @pytest.mark.asyncio
+    async def test_raises_when_exceeded(self, engine):
+        """上限を超えた場合に例外を送出することをテスト"""
+        with pytest.raises(QueryBudgetExceededError) as exc_info:
+            with query_budget(2, name="n+1"):
+                await _run_queries(engine, 3)
+
+        assert exc_info.value.count == 3
+        assert exc_info.value.budget == 2
+
+    @pytest.mark.asyncio
+    async def test_queries_outside_block_are_not_counted(self, engine):
+        """ブロックの外で発行したクエリは数えないことをテスト"""
+        with query_budget(1) as stats:
+            pass
+        await _run_queries(engine, 2)
+
+        assert stats.count == 0
+
+
+class TestQueryMetricsMiddleware:
+    """QueryMetricsMiddlewareのテストケース"""
+
+    def test_server_timing_header(self, engine):
+        """クエリ数とDB時間をServer-Timingヘッダで返すことをテスト"""
+        client = TestClient(_create_app(engine, action="log"))
+
+        response = client.get("/items/2")
+
+        assert response.status_code == 200
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert 'desc="2 queries"' in response.headers["Server-Timing"]
+
+    def test_logs_when_budget_exceeded(self, engine, caplog):
+        """上限を超えた場合に警告ログを出力することをテスト"""
+        client = TestClient(_create_app(engine, action="log"))
+
+        response = client.get("/items/3")
+
+        assert response.status_code == 200
+        assert "GET /items/{count}" in caplog.text
+
+    def test_raises_when_budget_exceeded(self, engine):
+        """raiseを指定した場合は上限を超えたリクエストを例外にすることをテスト"""
+        client = TestClient(_create_app(engine, action=QUERY_BUDGET_ACTION_RAISE))
+
+        client.get("/items/2")
+        with pytest.raises(QueryBudgetExceededError):
+            client.get("/items/3")
+
+    def test_keeps_original_exception(self, engine, caplog):
+        """処理中に例外が発生した場合は、上限を超えていても元の例外をそのまま送出することをテスト"""
+        client = TestClient(_create_app(engine, action=QUERY_BUDGET_ACTION_RAISE))
+
+        with pytest.raises(ValueError):
+            client.get("/items/3", params={"fail": True})
+        assert "GET /items/{count}" in caplog.text
@@ -0,0 +1,151 @@
+import json
+import logging
+import queue
+import sys
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.request_logging import (
+    ACCESS_LOGGER_NAME,
+    REQUEST_ID_HEADER,
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestLoggingMiddleware,
+    bind_user_id,
+    current_request_id,
+    start_logging,
+    stop_logging,
+)
+
+app_logger = logging.getLogger("app.test_request_logging")
+
+
+class ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.setFormatter(JsonFormatter())
+        # TestClient（httpx）のログは対象外にする
+        self.addFilter(logging.Filter("app"))
+        self.lines: list = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(json.loads(self.format(record)))
+
+
+@pytest.fixture
+def handler():
+    handler = ListHandler()
+    start_logging(handlers=[handler], level="INFO")
+    yield handler
+    stop_logging()
+
+
+def _flush() -> None:
+    # キューに残っているログを書き込ませる
+    stop_logging()
+
+
+def _create_app(sample_rates=None, slow_request_ms: float = 1000) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        RequestLoggingMiddleware,
+        sample_rates=sample_rates or {},
+        slow_request_ms=slow_request_ms,
+    )
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        bind_user_id("user-1")
+        app_logger.info("取得しました")
+        if item_id == "fail":
+            app_logger.error("失敗しました")
+        if item_id == "slow":
+            time.sleep(0.02)
+        return {"request_id": current_request_id()}
+
+    return app
+
+
+class TestRequestLoggingMiddleware:
+    """RequestLoggingMiddlewareのテストケース"""
+
+    def test_logs_with_request_context(self, handler):
+        """ログとアクセスログにリクエストID・ユーザーID・ルートを付与することをテスト"""
+        response = TestClient(_create_app()).get("/items/1")
+        _flush()
+
+        request_id = response.headers[REQUEST_ID_HEADER]
+        assert response.json() == {"request_id": request_id}
+        app_line, access_line = handler.lines
+        for line in (app_line, access_line):
+            assert line["request_id"] == request_id
+            assert line["user_id"] == "user-1"
+            assert line["route"] == "/items/{item_id}"
+        assert app_line["message"] == "取得しました"
+        assert access_line["logger"] == ACCESS_LOGGER_NAME
+        assert access_line["status"] == 200
+        assert access_line["duration_ms"] >= 0
+
+    def test_uses_valid_incoming_request_id(self, handler):
+        """受け取ったリクエストIDを使い、不正な値は採番し直すことをテスト"""
+        client = TestClient(_create_app())
+
+        valid = client.get("/items/1", headers={REQUEST_ID_HEADER: "abc-123"})
+        invalid = client.get("/items/1", headers={REQUEST_ID_HEADER: "a b\nc"})
+
+        assert valid.headers[REQUEST_ID_HEADER] == "abc-123"
+        assert invalid.headers[REQUEST_ID_HEADER] != "a b\nc"
+
+    def test_sampling_drops_info_logs(self, handler):
+        """サンプリングで選ばれなかったリクエストはWARNING以上のログだけを出力することをテスト"""
+        client = TestClient(_create_app(sample_rates={"GET /items/{item_id}": 0.0}))
+
+        client.get("/items/1")
+        client.get("/items/fail")
+        _flush()
+
+        assert [line["message"] for line in handler.lines] == ["失敗しました"]
+
+    def test_slow_request_is_always_logged(self, handler):
+        """遅いリクエストのアクセスログはサンプリングに関わらずWARNINGで出力することをテスト"""
+        app = _create_app(
+            sample_rates={"GET /items/{item_id}": 0.0}, slow_request_ms=10
+        )
+
+        TestClient(app).get("/items/slow")
+        _flush()
+
+        (line,) = handler.lines
+        assert line["logger"] == ACCESS_LOGGER_NAME
+        assert line["level"] == "WARNING"
+
+
+class TestNonBlockingQueueHandler:
+    """NonBlockingQueueHandlerのテストケース"""
+
+    def test_drops_when_queue_is_full(self):
+        """キューが一杯の場合は待たずに破棄することをテスト"""
+        queue_handler = NonBlockingQueueHandler(queue.Queue(1))
+        record = logging.LogRecord("test", logging.INFO, "", 0, "msg", None, None)
+
+        queue_handler.emit(record)
+        queue_handler.emit(record)
+
+        assert queue_handler.queue.qsize() == 1
+
+    def test_keeps_exception_separate(self):
+        """例外をメッセージに連結せず、別の項目として出力することをテスト"""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord(
+                "test", logging.ERROR, "", 0, "失敗 %s", ("x",), sys.exc_info()
+            )
+        prepared = NonBlockingQueueHandler(queue.Queue()).prepare(record)
+        line = json.loads(JsonFormatter().format(prepared))
+
+        assert line["message"] == "失敗 x"
+        assert "ValueError: boom" in line["exception"]
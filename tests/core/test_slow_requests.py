@@ -0,0 +1,157 @@
+import json
+from uuid import UUID
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.app_exception import setup_exception_handlers
+from app.core.config import settings
+from app.core.llm_metrics import register_llm_metrics
+from app.core.query_metrics import instrument_engine
+from app.core.slow_requests import (
+    REDACTED,
+    SlowRequestBuffer,
+    SlowRequestMiddleware,
+    redact_sql_parameters,
+    slow_request_buffer,
+)
+from app.endpoint.admin import admin_endpoint
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+    yield engine
+    await engine.dispose()
+
+
+def _create_app(engine, buffer: SlowRequestBuffer, threshold_ms: float) -> FastAPI:
+    register_llm_metrics()
+    app = FastAPI()
+    app.add_middleware(SlowRequestMiddleware, buffer=buffer, threshold_ms=threshold_ms)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str, token: str = ""):
+        async with engine.connect() as conn:
+            await conn.execute(
+                text("SELECT :email, :item_id"),
+                {"email": "user@example.com", "item_id": 1},
+            )
+        FakeListChatModel(responses=["hello"]).invoke("hi")
+        return {}
+
+    return app
+
+
+class TestSlowRequestMiddleware:
+    """SlowRequestMiddlewareのテストケース"""
+
+    def test_records_slow_request(self, engine):
+        """閾値を超えたリクエストのSQLクエリ・LLMの呼び出しを、値を伏せて記録することをテスト"""
+        buffer = SlowRequestBuffer(10)
+        client = TestClient(_create_app(engine, buffer, threshold_ms=0))
+
+        client.get("/items/abc", params={"token": "secret-token", "page": "2"})
+
+        (entry,) = buffer.snapshot()
+        assert entry["route"] == "/items/{item_id}"
+        assert entry["status"] == 200
+        assert entry["path_params"] == {"item_id": "abc"}
+        assert entry["query_params"] == {"token": REDACTED, "page": "2"}
+        (query,) = entry["queries"]
+        assert query["statement"] == "SELECT ?, ?"
+        assert query["parameters"] == ["<str len=16>", 1]
+        (llm_call,) = entry["llm_calls"]
+        assert llm_call["status"] == "success"
+        assert llm_call["duration_ms"] >= 0
+        assert "secret-token" not in json.dumps(entry)
+        assert "user@example.com" not in json.dumps(entry)
+
+    def test_ignores_fast_request(self, engine):
+        """閾値未満のリクエストは記録しないことをテスト"""
+        buffer = SlowRequestBuffer(10)
+        client = TestClient(_create_app(engine, buffer, threshold_ms=60_000))
+
+        client.get("/items/abc")
+
+        assert buffer.snapshot() == []
+
+
+class TestSlowRequestBuffer:
+    """SlowRequestBufferのテストケース"""
+
+    def test_keeps_latest_entries(self):
+        """上限を超えた場合は古いものから破棄し、新しい順に返すことをテスト"""
+        buffer = SlowRequestBuffer(2)
+        for i in range(3):
+            buffer.add({"id": i})
+
+        assert buffer.snapshot() == [{"id": 2}, {"id": 1}]
+
+    def test_dumps_only_when_changed(self, tmp_path):
+        """追加があった場合だけファイルに書き込むことをテスト"""
+        buffer = SlowRequestBuffer(2)
+        path = str(tmp_path / "slow" / "slow_requests.json")
+
+        assert buffer.dump(path) is False
+        buffer.add({"id": 1})
+        assert buffer.dump(path) is True
+        assert buffer.dump(path) is False
+
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f) == [{"id": 1}]
+
+
+def test_redact_sql_parameters():
+    """ID・数値は残し、文字列・バイト列は型と長さだけにすることをテスト"""
+    user_id = UUID(int=1)
+
+    assert redact_sql_parameters((user_id, 3, "password", b"ab", None)) == [
+        user_id,
+        3,
+        "<str len=8>",
+        "<bytes len=2>",
+        None,
+    ]
+
+
+class TestAdminSlowRequestsEndpoint:
+    """遅いリクエストの取得APIのテストケース"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "admin-token")
+        slow_request_buffer.clear()
+        app = FastAPI()
+        setup_exception_handlers(app)
+        app.include_router(admin_endpoint.router)
+        yield TestClient(app)
+        slow_request_buffer.clear()
+
+    def test_requires_admin_token(self, client):
+        """ADMIN_TOKENが一致しない場合は拒否することをテスト"""
+        response = client.get(
+            "/admin/slow-requests", headers={"Authorization": "Bearer wrong"}
+        )
+
+        assert response.status_code == 401
+
+    def test_returns_entries(self, client):
+        """記録を新しい順に、ルートで絞り込んで返すことをテスト"""
+        slow_request_buffer.add({"route": "/a"})
+        slow_request_buffer.add({"route": "/b"})
+
+        response = client.get(
+            "/admin/slow-requests",
+            params={"route": "/a"},
+            headers={"Authorization": "Bearer admin-token"},
+        )
+
+        assert response.status_code == 200
+        assert [entry["route"] for entry in response.json()] == ["/a"]
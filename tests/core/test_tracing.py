@@ -0,0 +1,254 @@
+import json
+
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.prompts import ChatPromptTemplate
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.query_metrics import instrument_engine
+from app.core.tracing import (
+    SPAN_KIND_SERVER,
+    STATUS_ERROR,
+    TRACE_HEADER,
+    TRACE_ID_HEADER,
+    TRACEPARENT_HEADER,
+    JsonlSpanExporter,
+    OtlpHttpSpanExporter,
+    Span,
+    TracingMiddleware,
+    register_tracing_callback,
+    render_waterfall,
+    start_span,
+    trace_methods,
+)
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+    yield engine
+    await engine.dispose()
+
+
+@trace_methods("repository")
+class ItemRepository:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def fetch(self) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def generate(self) -> str:
+        chain = ChatPromptTemplate.from_template("{phrase}") | FakeListChatModel(
+            responses=["hello"]
+        )
+        return chain.invoke({"phrase": "hi"}).content
+
+    def stream(self):
+        yield "chunk"
+
+
+@trace_methods("service")
+class ItemService:
+    def __init__(self, repository: ItemRepository):
+        self.repository = repository
+
+    async def create(self, fail: bool) -> str:
+        await self.repository.fetch()
+        if fail:
+            raise ValueError("failed")
+        return await self.repository.generate()
+
+
+def _create_app(engine, spans: list, sample_rate: float = 1.0) -> FastAPI:
+    register_tracing_callback()
+    app = FastAPI()
+    app.add_middleware(
+        TracingMiddleware,
+        submit=lambda exported: spans.extend(span.to_dict() for span in exported),
+        sample_rate=sample_rate,
+    )
+    service = ItemService(ItemRepository(engine))
+
+    @app.post("/items/{fail}")
+    async def create_item(fail: bool):
+        return {"content": await service.create(fail)}
+
+    return app
+
+
+def _by_name(spans: list) -> dict:
+    return {span["name"]: span for span in spans}
+
+
+class TestTracingMiddleware:
+    """TracingMiddleware・trace_methodsのテストケース"""
+
+    def test_records_spans_across_layers(self, engine):
+        """エンドポイント〜サービス〜リポジトリ〜SQL・LLMのスパンが親子関係で記録されることをテスト"""
+        spans: list = []
+        response = TestClient(_create_app(engine, spans)).post("/items/false")
+
+        names = _by_name(spans)
+        root = names["POST /items/{fail}"]
+        service = names["ItemService.create"]
+        fetch = names["ItemRepository.fetch"]
+        generate = names["ItemRepository.generate"]
+        chain = names["langchain.RunnableSequence"]
+        llm = names["llm"]
+
+        assert response.headers[TRACE_ID_HEADER] == root["traceId"]
+        assert root["kind"] == SPAN_KIND_SERVER
+        assert root["attributes"]["http.status_code"] == 200
+        assert service["parentSpanId"] == root["spanId"]
+        assert fetch["parentSpanId"] == service["spanId"]
+        assert names["db.query"]["parentSpanId"] == fetch["spanId"]
+        assert generate["parentSpanId"] == service["spanId"]
+        assert chain["parentSpanId"] == generate["spanId"]
+        assert llm["parentSpanId"] == chain["spanId"]
+        assert {span["traceId"] for span in spans} == {root["traceId"]}
+
+    def test_records_exception(self, engine):
+        """例外が発生したスパンをエラーとして記録することをテスト"""
+        spans: list = []
+        client = TestClient(_create_app(engine, spans), raise_server_exceptions=False)
+
+        client.post("/items/true")
+
+        assert _by_name(spans)["ItemService.create"]["status"] == STATUS_ERROR
+        assert (
+            _by_name(spans)["ItemService.create"]["attributes"]["exception.type"]
+            == "ValueError"
+        )
+
+    def test_not_sampled(self, engine):
+        """サンプリングで選ばれなかったリクエストは記録しないことをテスト"""
+        spans: list = []
+        response = TestClient(_create_app(engine, spans, sample_rate=0)).post(
+            "/items/false"
+        )
+
+        assert response.status_code == 200
+        assert TRACE_ID_HEADER not in response.headers
+        assert spans == []
+
+    def test_admin_header_and_traceparent(self, engine, monkeypatch):
+        """ADMIN_TOKENのヘッダを指定したリクエストを、呼び出し元のトレースIDで記録することをテスト"""
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "admin-token")
+        spans: list = []
+        trace_id = "0af7651916cd43dd8448eb211c80319c"
+
+        TestClient(_create_app(engine, spans, sample_rate=0)).post(
+            "/items/false",
+            headers={
+                TRACE_HEADER: "admin-token",
+                TRACEPARENT_HEADER: f"00-{trace_id}-b7ad6b7169203331-01",
+            },
+        )
+
+        root = _by_name(spans)["POST /items/{fail}"]
+        assert root["traceId"] == trace_id
+        assert root["parentSpanId"] == "b7ad6b7169203331"
+
+
+class TestTraceMethods:
+    """trace_methodsのテストケース"""
+
+    def test_does_not_wrap_generators(self):
+        """ジェネレータを返すメソッドはそのまま残すことをテスト"""
+        assert list(ItemRepository(None).stream()) == ["chunk"]
+        assert not hasattr(ItemRepository.stream, "__wrapped__")
+
+    def test_no_trace_outside_request(self):
+        """トレースしていない場合はスパンを作らないことをテスト"""
+        with start_span("outside") as span:
+            assert span is None
+
+
+class TestExporters:
+    """スパンの書き出し・表示のテストケース"""
+
+    def _spans(self) -> list:
+        return [
+            {
+                "traceId": "t",
+                "spanId": "root",
+                "parentSpanId": "",
+                "name": "POST /study/quiz-answer",
+                "kind": SPAN_KIND_SERVER,
+                "startTimeUnixNano": 0,
+                "endTimeUnixNano": 100_000_000,
+                "attributes": {},
+                "status": "OK",
+            },
+            {
+                "traceId": "t",
+                "spanId": "db",
+                "parentSpanId": "root",
+                "name": "db.query",
+                "kind": 3,
+                "startTimeUnixNano": 0,
+                "endTimeUnixNano": 10_000_000,
+                "attributes": {},
+                "status": "OK",
+            },
+            {
+                "traceId": "t",
+                "spanId": "llm",
+                "parentSpanId": "root",
+                "name": "llm",
+                "kind": 3,
+                "startTimeUnixNano": 10_000_000,
+                "endTimeUnixNano": 95_000_000,
+                "attributes": {},
+                "status": "OK",
+            },
+        ]
+
+    def test_render_waterfall_marks_critical_path(self):
+        """最も遅く終わる子スパンをたどった経路に印を付けることをテスト"""
+        lines = render_waterfall(self._spans()).splitlines()
+
+        assert lines[0] == "trace t (100.0 ms)"
+        assert lines[1].startswith("* POST /study/quiz-answer")
+        assert lines[2].startswith("    db.query")
+        assert lines[3].startswith("*   llm")
+
+    def test_jsonl_exporter(self, tmp_path):
+        """スパンを1行ずつJSONで追記することをテスト"""
+        path = tmp_path / "traces" / "spans.jsonl"
+        app = FastAPI()
+        app.add_middleware(
+            TracingMiddleware,
+            submit=JsonlSpanExporter(str(path)).export,
+            sample_rate=1.0,
+        )
+
+        @app.get("/ping")
+        async def ping():
+            return {}
+
+        TestClient(app).get("/ping")
+
+        (line,) = path.read_text(encoding="utf-8").splitlines()
+        assert json.loads(line)["name"] == "GET /ping"
+
+    def test_otlp_payload(self):
+        """OTLP/HTTP（JSON）の形式に変換することをテスト"""
+        span = Span("a" * 32, None, "llm", attributes={"llm.model": "gpt", "n": 1})
+        span.end_ns = span.start_ns + 1
+        payload = OtlpHttpSpanExporter("http://collector:4318").to_otlp([span])
+
+        (otlp_span,) = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert otlp_span["traceId"] == "a" * 32
+        assert "parentSpanId" not in otlp_span
+        assert otlp_span["attributes"] == [
+            {"key": "llm.model", "value": {"stringValue": "gpt"}},
+            {"key": "n", "value": {"intValue": "1"}},
+        ]
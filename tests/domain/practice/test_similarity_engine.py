@@ -0,0 +1,105 @@
+import difflib
+import random
+
+from app.domain.practice.similarity_engine import SimilarityEngine
+
+
+class TestSimilarityEngine:
+    """SimilarityEngineクラスのテストケース"""
+
+    def test_tokenize(self):
+        """トークン化が句読点と短縮形を扱えることをテスト"""
+        tokens = SimilarityEngine.tokenize("  I'm happy, you're great!  ")
+        assert tokens == ["I'm", "happy", ",", "you're", "great", "!"]
+
+    def test_token_offsets(self):
+        """トークンの文字位置が元の文字列のトークンを指すことをテスト"""
+        text = "  I'm happy, you're great!  "
+        offsets = SimilarityEngine.token_offsets(text)
+        assert [text[start:end] for start, end in offsets] == (
+            SimilarityEngine.tokenize(text)
+        )
+
+    def test_locate_tokens(self):
+        """トークン化結果と同じトークン列の位置が token_offsets と一致することをテスト"""
+        text = "  I'm happy, you're great!  "
+        tokens = SimilarityEngine.tokenize(text)
+        assert SimilarityEngine.locate_tokens(text, tokens) == (
+            SimilarityEngine.token_offsets(text)
+        )
+
+    def test_locate_tokens_stored(self):
+        """トークン化結果と異なるトークン列でも添字ごとの位置を返すことをテスト"""
+        text = "Don't go, Tom."
+        # 別のトークン化で保存されたトークン（"Do" が見つからない場合は空の範囲）
+        tokens = ["Don", "'t", "go", ",", "Do", "Tom."]
+        assert SimilarityEngine.locate_tokens(text, tokens) == [
+            (0, 3),
+            (3, 5),
+            (6, 8),
+            (8, 9),
+            (9, 9),
+            (10, 14),
+        ]
+
+    def test_similarity(self):
+        """類似度の境界値をテスト"""
+        assert SimilarityEngine.similarity("Hello", "Hello") == 100
+        assert SimilarityEngine.similarity("", "") == 100
+        assert SimilarityEngine.similarity("abc", "xyz") == 0
+        # 一致は "Hello " と "r" の7文字、全体は22文字
+        assert SimilarityEngine.similarity("Hello world", "Hello earth") == 64
+
+    def test_similarity_matches_difflib(self):
+        """類似度が変更前（difflibのratio）のスコアと一致することをテスト"""
+        # difflibの一致数はLCSの長さより小さくなる場合がある
+        assert SimilarityEngine.similarity("cacc", " a   c ") == 18
+        rng = random.Random(3)
+        for _ in range(300):
+            a = "".join(rng.choice("ab c") for _ in range(rng.randint(0, 30)))
+            b = "".join(rng.choice("ab c") for _ in range(rng.randint(0, 30)))
+            expected = round(difflib.SequenceMatcher(None, a, b).ratio() * 100)
+            assert SimilarityEngine.similarity(a, b) == expected
+
+    def test_diff_opcodes_matches_difflib(self):
+        """差分が変更前（difflibのget_opcodes）と一致することをテスト"""
+        rng = random.Random(1)
+        for _ in range(500):
+            a = [rng.choice("abcd") for _ in range(rng.randint(0, 15))]
+            b = [rng.choice("abcd") for _ in range(rng.randint(0, 15))]
+            expected = difflib.SequenceMatcher(None, a, b).get_opcodes()
+            assert SimilarityEngine.diff_opcodes(a, b) == expected
+
+    def test_diff_opcodes_repeated_tokens(self):
+        """同じトークンが繰り返される場合も、difflibと同じく最長の一致ブロックを選ぶことをテスト"""
+        opcodes = SimilarityEngine.diff_opcodes(
+            ["the", "cat", "the", "dog"], ["the", "dog", "the", "cat"]
+        )
+        assert opcodes == [
+            ("insert", 0, 0, 0, 2),
+            ("equal", 0, 2, 2, 4),
+            ("delete", 2, 4, 4, 4),
+        ]
+
+    def test_diff_opcodes_tokens(self):
+        """トークン列の差分をテスト"""
+        opcodes = SimilarityEngine.diff_opcodes(
+            ["Hello", ",", "world", "!"], ["Hello", "earth", "!"]
+        )
+        assert opcodes == [
+            ("equal", 0, 1, 0, 1),
+            ("replace", 1, 3, 1, 2),
+            ("equal", 3, 4, 2, 3),
+        ]
+
+    def test_diff_opcodes_empty(self):
+        """空の入力に対する差分をテスト"""
+        assert SimilarityEngine.diff_opcodes([], []) == []
+        assert SimilarityEngine.diff_opcodes(["a"], []) == [("delete", 0, 1, 0, 0)]
+        assert SimilarityEngine.diff_opcodes([], ["a"]) == [("insert", 0, 0, 0, 1)]
+
+    def test_tokenize_returns_independent_lists(self):
+        """キャッシュされたトークンを変更しても次の結果に影響しないことをテスト"""
+        tokens = SimilarityEngine.tokenize("Hello world")
+        tokens.append("!")
+        assert SimilarityEngine.tokenize("Hello world") == ["Hello", "world"]
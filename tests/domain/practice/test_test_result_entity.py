@@ -3,6 +3,7 @@ from datetime import datetime
 from uuid import uuid4
 
 from app.domain.practice.test_result_entity import (
+    LatestTestResultValueObject,
     TestResultEntity,
     MessageScoreValueObject,
     TestConstants,
@@ -100,11 +101,6 @@ class TestMessageScoreValueObject:
         )
         assert 0 < similarity < 100
 
-    def test_get_matcher(self):
-        """SequenceMatcherの取得をテスト"""
-        matcher = MessageScoreValueObject.get_matcher("Hello", "Hello")
-        assert matcher.ratio() == 1.0
-
     def test_get_diff_blocks(self):
         """差分ブロックの取得をテスト"""
         user_tokens = ["Hello", "world"]
@@ -127,6 +123,19 @@ class TestMessageScoreValueObject:
         expected = ["Hello", ",", "world", "!"]
         assert tokens == expected
 
+    def test_computed_field_tokenized_answer_is_cached(self):
+        """トークン化の結果が2回目以降は再計算されないことをテスト"""
+        score = MessageScoreValueObject(
+            message_order=1,
+            score=100,
+            isCorrect=True,
+            userAnswer="Hello world",
+            correctAnswer="Hello world",
+        )
+
+        assert score.get_tokenized_user_answer is score.get_tokenized_user_answer
+        assert score.get_tokenized_correct_answer is score.get_tokenized_correct_answer
+
     def test_factory_method_perfect_match(self):
         """完全一致時のfactoryメソッドをテスト"""
         score = MessageScoreValueObject.factory(
@@ -393,6 +402,78 @@ class TestTestResultEntity:
         assert result.message_scores[0].isCorrect is True
         assert result.message_scores[1].score < 100.0
 
+    def test_factory_method_uses_stored_correct_tokens(self):
+        """保存済みの正解トークンがあればトークン化せずに使うことをテスト"""
+        # トークン化した結果と区別できるよう、あえて異なるトークンにする
+        stored_tokens = ["Hello", "world", "(stored)"]
+        answers = [
+            {
+                "message_order": "1",
+                "user_answer": "Hello world",
+                "correct_answer": "Hello world.",
+                "correct_tokens": stored_tokens,
+            }
+        ]
+
+        result = TestResultEntity.factory(
+            conversation_id=uuid4(), test_number=1, answers=answers
+        )
+
+        score = result.message_scores[0]
+        assert score.get_tokenized_correct_answer == stored_tokens
+        assert "correctTokens" not in score.model_dump()
+
+    def test_factory_method_matches_message_score_factory(self):
+        """一括採点の結果がメッセージごとのfactoryと一致することをテスト"""
+        answers = [
+            {
+                "message_order": str(i + 1),
+                "user_answer": user_answer,
+                "correct_answer": correct_answer,
+            }
+            for i, (user_answer, correct_answer) in enumerate(
+                [
+                    ("Hello world", "Hello world"),
+                    ("I am going to the station", "I'm going to the station."),
+                    ("", "Good morning"),
+                    ("Thanks", "Thank you very much!"),
+                ]
+            )
+        ]
+
+        result = TestResultEntity.factory(
+            conversation_id=uuid4(), test_number=1, answers=answers
+        )
+
+        expected = [
+            MessageScoreValueObject.factory(
+                message_order=int(answer["message_order"]),
+                user_answer=answer["user_answer"],
+                correct_answer=answer["correct_answer"],
+            )
+            for answer in answers
+        ]
+        assert result.message_scores == expected
+
+
+class TestLatestTestResultValueObject:
+    """LatestTestResultValueObjectクラスのテストケース"""
+
+    def test_get_message_score(self):
+        """メッセージの順番でスコアを取得できることをテスト"""
+        latest = LatestTestResultValueObject(
+            conversation_id=uuid4(),
+            test_number=3,
+            overall_score=85,
+            message_scores=[100.0, 70.0],
+        )
+
+        assert latest.get_message_score(1) == 100.0
+        assert latest.get_message_score(2) == 70.0
+        # 前回より会話のメッセージが増えている場合
+        assert latest.get_message_score(3) is None
+        assert latest.get_message_score(0) is None
+
 
 class TestTestConstants:
     """TestConstantsクラスのテストケース"""
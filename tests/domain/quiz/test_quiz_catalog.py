@@ -0,0 +1,84 @@
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from app.domain.quiz.quiz_catalog import QuizCatalog
+from app.domain.quiz.quize_entity import DifficultyEnum, QuizEntity
+from app.domain.quizType.quiz_type_entity import QuizTypeEntity
+
+QUIZ_TYPE_ID_A = UUID("123e4567-e89b-12d3-a456-426614174000")
+QUIZ_TYPE_ID_B = UUID("123e4567-e89b-12d3-a456-426614174001")
+
+
+def create_quiz(quiz_type_id: UUID) -> QuizEntity:
+    return QuizEntity(
+        quizId=uuid4(),
+        question="問題",
+        modelAnswer="Answer",
+        quizTypeId=quiz_type_id,
+        difficulty=DifficultyEnum.ふつう,
+    )
+
+
+def create_quiz_type(quiz_type_id: UUID) -> QuizTypeEntity:
+    return QuizTypeEntity(
+        quizTypeId=quiz_type_id,
+        name="種類",
+        abbreviation="略語",
+        description="説明",
+    )
+
+
+class TestQuizCatalog:
+    """QuizCatalogクラスのテストケース"""
+
+    def test_index_by_id(self):
+        """IDでクイズとクイズの種類を取得できることをテスト"""
+        quiz = create_quiz(QUIZ_TYPE_ID_A)
+        quiz_type = create_quiz_type(QUIZ_TYPE_ID_A)
+        catalog = QuizCatalog(version=1, quizzes=[quiz], quiz_types=[quiz_type])
+
+        assert catalog.get_quiz(quiz.quizId) is quiz
+        assert catalog.get_quiz(uuid4()) is None
+        assert catalog.quiz_types_by_id[QUIZ_TYPE_ID_A] is quiz_type
+
+    def test_group_by_quiz_type(self):
+        """種類ごとのクイズ一覧が元の順序を保つことをテスト"""
+        quizzes = [
+            create_quiz(QUIZ_TYPE_ID_A),
+            create_quiz(QUIZ_TYPE_ID_B),
+            create_quiz(QUIZ_TYPE_ID_A),
+        ]
+        catalog = QuizCatalog(version=1, quizzes=quizzes, quiz_types=[])
+
+        assert catalog.get_quizzes_by_type_id(QUIZ_TYPE_ID_A) == (
+            quizzes[0],
+            quizzes[2],
+        )
+        assert catalog.get_quizzes_by_type_id(QUIZ_TYPE_ID_B) == (quizzes[1],)
+        assert catalog.get_quizzes_by_type_id(uuid4()) == ()
+
+    def test_snapshot_is_immutable(self):
+        """スナップショットが外部から変更できないことをテスト"""
+        quizzes = [create_quiz(QUIZ_TYPE_ID_A)]
+        catalog = QuizCatalog(version=1, quizzes=quizzes, quiz_types=[])
+
+        # 元のリストを変更してもスナップショットには影響しない
+        quizzes.append(create_quiz(QUIZ_TYPE_ID_A))
+        assert len(catalog.quizzes) == 1
+
+        with pytest.raises(TypeError):
+            catalog.quizzes_by_id[uuid4()] = quizzes[1]  # type: ignore
+
+    def test_entities_are_immutable(self):
+        """共有されるクイズとクイズの種類を変更できないことをテスト"""
+        quiz = create_quiz(QUIZ_TYPE_ID_A)
+        quiz_type = create_quiz_type(QUIZ_TYPE_ID_A)
+        catalog = QuizCatalog(version=1, quizzes=[quiz], quiz_types=[quiz_type])
+
+        with pytest.raises(ValidationError):
+            catalog.get_quiz(quiz.quizId).question = "変更"  # type: ignore
+        with pytest.raises(ValidationError):
+            catalog.quiz_types_by_id[QUIZ_TYPE_ID_A].name = "変更"  # type: ignore
+        assert catalog.get_quiz(quiz.quizId).question == "問題"
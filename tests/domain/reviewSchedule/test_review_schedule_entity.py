@@ -105,6 +105,67 @@ class TestReviewScheduleEntity:
         )
         assert updated_schedule.reviewDeadLine == expected_date
 
+    def test_create_first(self):
+        """最初の回答からの作成をテスト"""
+        before = datetime.datetime.now()
+        review_schedule = ReviewScheduleEntity.create_first(
+            userId=UUID("123e4567-e89b-12d3-a456-426614174001"),
+            quizId=UUID("123e4567-e89b-12d3-a456-426614174002"),
+            score=85,
+        )
+        assert review_schedule.reviewDeadLine > before
+        assert review_schedule.answerCount == 1
+        assert review_schedule.scoreSum == 85
+        assert review_schedule.highScoreStreak == 1
+        assert review_schedule.lowScoreStreak == 0
+        assert review_schedule.lastScore == 85
+
+    def test_reschedule_after_streak_reset(self):
+        """連続が途切れた後の集計値（データベースで加算済み）から復習期限を求めることをテスト"""
+        review_schedule = ReviewScheduleEntity(
+            reviewScheduleId=UUID("123e4567-e89b-12d3-a456-426614174000"),
+            userId=UUID("123e4567-e89b-12d3-a456-426614174001"),
+            quizId=UUID("123e4567-e89b-12d3-a456-426614174002"),
+            reviewDeadLine=datetime.datetime(2023, 10, 1, 12, 0, 0),
+            # 90点が3回続いた後に30点
+            answerCount=4,
+            scoreSum=300,
+            highScoreStreak=0,
+            lowScoreStreak=1,
+            lastScore=30,
+        )
+        updated_schedule = review_schedule.reschedule()
+        assert updated_schedule.answerCount == 4
+        assert updated_schedule.scoreSum == 300
+        assert updated_schedule.highScoreStreak == 0
+        assert updated_schedule.lowScoreStreak == 1
+        assert updated_schedule.lastScore == 30
+        # 最新スコア係数: 0.2, 連続性係数: 1.0, 平均補正係数: 1.0（平均75点）
+        multiplier = 0.2 * 1.0 * 1.0
+        expected_date = (
+            datetime.date.today() + RecallCardConstants.BASIC_ADD_DEADLINE * multiplier
+        )
+        assert updated_schedule.reviewDeadLine == expected_date
+
+    def test_reschedule_matches_update(self):
+        """集計値から求め直した復習期限が全スコアからの更新と一致することをテスト"""
+        scores = [30, 40, 20, 85, 90, 95, 60, 82, 88, 45, 10]
+        review_schedule = ReviewScheduleEntity.create_first(
+            userId=UUID("123e4567-e89b-12d3-a456-426614174001"),
+            quizId=UUID("123e4567-e89b-12d3-a456-426614174002"),
+            score=scores[0],
+        )
+        # 最初の回答は create_first の復習期限のまま
+        assert review_schedule.reschedule() == review_schedule
+
+        for i in range(2, len(scores) + 1):
+            expected = review_schedule.update(scores[:i])
+            # データベースで集計値だけを加算した状態（復習期限は更新前のまま）
+            incremented = expected.model_copy(
+                update={"reviewDeadLine": review_schedule.reviewDeadLine}
+            )
+            assert incremented.reschedule() == expected
+
     def test_get_latest_score_multiplier(self):
         """最新スコア係数の取得をテスト"""
         review_schedule = ReviewScheduleEntity(
@@ -120,7 +181,7 @@ class TestReviewScheduleEntity:
         assert review_schedule._get_latest_score_multiplier(50) == 0.4
         assert review_schedule._get_latest_score_multiplier(25) == 0.2
 
-    def test_get_continuity_multiplier(self):
+    def test_get_streak_multiplier(self):
         """連続性係数の取得をテスト"""
         review_schedule = ReviewScheduleEntity(
             reviewScheduleId=UUID("123e4567-e89b-12d3-a456-426614174000"),
@@ -130,27 +191,27 @@ class TestReviewScheduleEntity:
         )
 
         # 単一スコアの場合
-        assert review_schedule._get_continuity_multiplier([80]) == 1.0
+        assert review_schedule._get_streak_multiplier(1, 1, 0) == 1.0
 
         # 4回連続高得点
-        assert review_schedule._get_continuity_multiplier([80, 85, 82, 90]) == 2.0
+        assert review_schedule._get_streak_multiplier(4, 4, 0) == 2.0
 
         # 3回連続高得点
-        assert review_schedule._get_continuity_multiplier([70, 80, 85, 82]) == 1.5
+        assert review_schedule._get_streak_multiplier(4, 3, 0) == 1.5
 
         # 2回連続高得点
-        assert review_schedule._get_continuity_multiplier([70, 80, 85]) == 1.2
+        assert review_schedule._get_streak_multiplier(3, 2, 0) == 1.2
 
         # 3回連続低得点
-        assert review_schedule._get_continuity_multiplier([30, 40, 20]) == 0.5
+        assert review_schedule._get_streak_multiplier(3, 0, 3) == 0.5
 
         # 2回連続低得点
-        assert review_schedule._get_continuity_multiplier([60, 40, 20]) == 0.7
+        assert review_schedule._get_streak_multiplier(3, 0, 2) == 0.7
 
         # 連続性がない場合
-        assert review_schedule._get_continuity_multiplier([60, 70, 75]) == 1.0
+        assert review_schedule._get_streak_multiplier(3, 0, 0) == 1.0
 
-    def test_get_average_correction_multiplier(self):
+    def test_get_average_multiplier(self):
         """平均補正係数の取得をテスト"""
         review_schedule = ReviewScheduleEntity(
             reviewScheduleId=UUID("123e4567-e89b-12d3-a456-426614174000"),
@@ -159,17 +220,14 @@ class TestReviewScheduleEntity:
             reviewDeadLine=datetime.datetime(2023, 10, 1, 12, 0, 0),
         )
 
-        # 空リストの場合
-        assert review_schedule._get_average_correction_multiplier([]) == 1.0
-
         # 平均80点以上
-        assert review_schedule._get_average_correction_multiplier([80, 85, 90]) == 1.2
+        assert review_schedule._get_average_multiplier(85) == 1.2
 
         # 平均60-79点
-        assert review_schedule._get_average_correction_multiplier([60, 70, 75]) == 1.0
+        assert review_schedule._get_average_multiplier(68.3) == 1.0
 
         # 平均40-59点
-        assert review_schedule._get_average_correction_multiplier([40, 50, 55]) == 0.8
+        assert review_schedule._get_average_multiplier(48.3) == 0.8
 
         # 平均40点未満
-        assert review_schedule._get_average_correction_multiplier([20, 30, 35]) == 0.6
+        assert review_schedule._get_average_multiplier(28.3) == 0.6
@@ -0,0 +1,172 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.endpoint.practice import practice_endpoint
+from app.endpoint.practice.practice_endpoint import (
+    _accept_quality,
+    _accepts_diff_spans,
+)
+from app.endpoint.practice.practice_model import (
+    DIFF_SPANS_MEDIA_TYPE,
+    MessageTestDiffResult,
+    MessageTestDiffResultSummary,
+    MessageTestResult,
+    MessageTestResultSummary,
+)
+
+
+class FakePracticeService:
+    """採点結果を固定で返し、structured_diff の指定を記録するサービス"""
+
+    def __init__(self) -> None:
+        self.structured_diff = None
+
+    async def post_test_results(self, user_id, request, structured_diff=False):
+        self.structured_diff = structured_diff
+        if structured_diff:
+            return MessageTestDiffResultSummary(
+                correct_rate=0,
+                last_correct_rate=None,
+                result=[
+                    MessageTestDiffResult(
+                        message_order=1,
+                        spans=[("r", 5, 8, 5, 10)],
+                        is_correct=False,
+                        similarity_to_correct=80,
+                        last_similarity_to_correct=None,
+                    )
+                ],
+            )
+        return MessageTestResultSummary(
+            correct_rate=0,
+            last_correct_rate=None,
+            result=[
+                MessageTestResult(
+                    message_order=1,
+                    user_answer="I am <del>sad</del>",
+                    correct_answer='I am <span style="color:red">happy</span>',
+                    is_correct=False,
+                    similarity_to_correct=80,
+                    last_similarity_to_correct=None,
+                )
+            ],
+        )
+
+
+class FakeAuthService:
+    async def get_current_user(self, token):
+        class User:
+            id = uuid4()
+
+        return User()
+
+
+@pytest.fixture
+def service():
+    return FakePracticeService()
+
+
+@pytest.fixture
+def client(service):
+    app = FastAPI()
+    app.include_router(practice_endpoint.router)
+    app.dependency_overrides[practice_endpoint.get_practice_service] = lambda: service
+    app.dependency_overrides[practice_endpoint.get_auth_service] = FakeAuthService
+    return TestClient(app)
+
+
+def post_test_result(client, accept=None):
+    headers = {"Authorization": "Bearer token"}
+    if accept is not None:
+        headers["Accept"] = accept
+    return client.post(
+        "/practice/test_result",
+        json={"conversation_id": str(uuid4()), "answers": []},
+        headers=headers,
+    )
+
+
+class TestPostTestResults:
+    """POST /practice/test_result のテストケース"""
+
+    def test_html_diff_by_default(self, client, service):
+        """Acceptヘッダーがない場合はHTMLの差分を返すことをテスト"""
+        response = post_test_result(client)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["vary"] == "Accept"
+        assert response.json()["result"][0]["user_answer"] == "I am <del>sad</del>"
+        assert service.structured_diff is False
+
+    def test_structured_diff(self, client, service):
+        """差分のメディアタイプを指定した場合は文字位置の範囲を返すことをテスト"""
+        response = post_test_result(client, DIFF_SPANS_MEDIA_TYPE)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == DIFF_SPANS_MEDIA_TYPE
+        assert response.headers["vary"] == "Accept"
+        assert response.json()["result"][0]["spans"] == [["r", 5, 8, 5, 10]]
+        assert service.structured_diff is True
+
+    def test_structured_diff_refused(self, client, service):
+        """q=0 で差分のメディアタイプを指定した場合はHTMLの差分を返すことをテスト"""
+        response = post_test_result(
+            client, f"{DIFF_SPANS_MEDIA_TYPE};q=0, application/json"
+        )
+        assert response.headers["content-type"] == "application/json"
+        assert service.structured_diff is False
+
+    def test_structured_diff_validated(self, client, service):
+        """構造化された差分もレスポンスのモデルで検証されることをテスト"""
+        html_result = FakePracticeService.post_test_results
+
+        # 構造化された差分を指定してもHTMLの差分（spansがない）を返してしまう場合
+        async def post_test_results(user_id, request, structured_diff=False):
+            return await html_result(service, user_id, request)
+
+        service.post_test_results = post_test_results
+        with pytest.raises(ValidationError):
+            post_test_result(client, DIFF_SPANS_MEDIA_TYPE)
+
+
+class TestAcceptNegotiation:
+    """Acceptヘッダーの解釈のテストケース"""
+
+    @pytest.mark.parametrize(
+        "accept, expected",
+        [
+            (None, False),
+            ("", False),
+            ("*/*", False),
+            ("application/json, text/plain, */*", False),
+            ("application/*", False),
+            (DIFF_SPANS_MEDIA_TYPE, True),
+            (DIFF_SPANS_MEDIA_TYPE.upper(), True),
+            (f"application/json, {DIFF_SPANS_MEDIA_TYPE}", True),
+            (f"{DIFF_SPANS_MEDIA_TYPE};q=0", False),
+            (f"{DIFF_SPANS_MEDIA_TYPE}; q=0.0", False),
+            (f"{DIFF_SPANS_MEDIA_TYPE};q=invalid", False),
+            (f"{DIFF_SPANS_MEDIA_TYPE};q=0.5, application/json", False),
+            (f"{DIFF_SPANS_MEDIA_TYPE};q=0.5, application/json;q=0.4", True),
+            (f"{DIFF_SPANS_MEDIA_TYPE};q=0.5, */*;q=0.1", True),
+        ],
+    )
+    def test_accepts_diff_spans(self, accept, expected):
+        """差分のメディアタイプが明示され、JSONより優先される場合だけ選ぶことをテスト"""
+        assert _accepts_diff_spans(accept) is expected
+
+    def test_accept_quality_most_specific(self):
+        """最も具体的に一致するメディアレンジの品質値を使うことをテスト"""
+        accept = "*/*;q=0.1, application/*;q=0.5, application/json;q=0.8"
+        assert _accept_quality(accept, "application/json") == 0.8
+        assert _accept_quality(accept, "application/xml") == 0.5
+        assert _accept_quality(accept, "text/html") == 0.1
+        assert _accept_quality(accept, "application/xml", explicit=True) == 0
+
+    def test_accept_quality_clamped(self):
+        """範囲外の品質値を0から1に丸めることをテスト"""
+        assert _accept_quality("application/json;q=2", "application/json") == 1
+        assert _accept_quality("application/json;q=-1", "application/json") == 0
@@ -0,0 +1,64 @@
+import pytest
+
+from app.repository.postgres_unit_of_work import PostgresUnitOfWork, commit
+
+
+class FakeSession:
+    """コミット・フラッシュ・ロールバックの回数を記録するセッション"""
+
+    def __init__(self):
+        self.info = {}
+        self.commits = 0
+        self.flushes = 0
+        self.rollbacks = 0
+
+    async def commit(self):
+        self.commits += 1
+
+    async def flush(self):
+        self.flushes += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.mark.asyncio
+class TestPostgresUnitOfWork:
+    """PostgresUnitOfWorkクラスのテストケース"""
+
+    async def test_commit_outside_unit_of_work(self):
+        """作業単位の外ではリポジトリごとにコミットすることをテスト"""
+        db = FakeSession()
+        await commit(db)  # type: ignore
+        await commit(db)  # type: ignore
+        assert (db.commits, db.flushes) == (2, 0)
+
+    async def test_commit_once_in_unit_of_work(self):
+        """作業単位の中ではコミットが最後の1回になることをテスト"""
+        db = FakeSession()
+        async with PostgresUnitOfWork(db).transaction():  # type: ignore
+            await commit(db)  # type: ignore
+            await commit(db)  # type: ignore
+            assert db.commits == 0
+        assert (db.commits, db.flushes, db.rollbacks) == (1, 2, 0)
+        assert db.info == {}
+
+    async def test_nested_unit_of_work_joins_outer(self):
+        """入れ子にした作業単位が外側に合流することをテスト"""
+        db = FakeSession()
+        unit_of_work = PostgresUnitOfWork(db)  # type: ignore
+        async with unit_of_work.transaction():
+            async with unit_of_work.transaction():
+                await commit(db)  # type: ignore
+            assert db.commits == 0
+        assert db.commits == 1
+
+    async def test_rollback_on_error(self):
+        """例外が発生した場合はロールバックして例外を再送出することをテスト"""
+        db = FakeSession()
+        with pytest.raises(ValueError):
+            async with PostgresUnitOfWork(db).transaction():  # type: ignore
+                await commit(db)  # type: ignore
+                raise ValueError("error")
+        assert (db.commits, db.rollbacks) == (0, 1)
+        assert db.info == {}
@@ -0,0 +1,44 @@
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from app.domain.practice.geneerated_conversation_value_object import (
+    GeneratedConversationValueObject,
+    GeneratedMessageValueObject,
+)
+from app.repository.practice_api_openai_repository import PracticeApiOpenAiRepository
+
+
+class FakeStructuredLLM:
+    """構造化出力として決まった会話を返すチャットモデル"""
+
+    def __init__(self, conversation: GeneratedConversationValueObject):
+        self.conversation = conversation
+
+    def with_structured_output(self, schema):
+        assert schema is GeneratedConversationValueObject
+        return RunnableLambda(lambda _: self.conversation)
+
+
+@pytest.mark.asyncio
+class TestPracticeApiOpenAiRepository:
+    """PracticeApiOpenAiRepositoryクラスのテストケース"""
+
+    async def test_get_generated_conversation(self):
+        """生成された会話のタイトルとメッセージの英語・日本語を引き継ぐことをテスト"""
+        conversation = GeneratedConversationValueObject(
+            title="ストレス解消法",
+            messages=[
+                GeneratedMessageValueObject(
+                    messageEn="How do you relieve stress?",
+                    messageJa="どうやってストレス解消してるの？",
+                ),
+                GeneratedMessageValueObject(
+                    messageEn="I go hiking.", messageJa="ハイキングに行くよ。"
+                ),
+            ],
+        )
+        repository = PracticeApiOpenAiRepository(FakeStructuredLLM(conversation))  # type: ignore
+
+        result = await repository.get_generated_conversation("relieve stress")
+
+        assert result == conversation
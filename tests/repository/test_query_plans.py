@@ -0,0 +1,316 @@
+"""リポジトリが発行するクエリがインデックスを使用していることをEXPLAINで確認するテスト
+
+TEST_DATABASE_URL が設定されていない場合はスキップする。
+"""
+
+import datetime
+import json
+import os
+from typing import AbstractSet, Awaitable, Callable, Iterator, List, Tuple
+from uuid import UUID
+
+import pytest
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+
+if not TEST_DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL が設定されていません", allow_module_level=True)
+
+import pytest_asyncio
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.core.database import Base
+from app.repository.auth_postgres_repository import AuthPostgresRepository
+from app.repository.practice_postgres_repository import PracticePostgresRepository
+from app.repository.recall_card_postgres_repository import (
+    RecallCardPostgresRepository,
+)
+from app.repository.review_schedule_postgres_repository import (
+    ReviewSchedulePostgresRepository,
+)
+from app.repository.user_answer_postgres_repository import (
+    UserAnswerPostgresRepository,
+)
+from app.schema.models import Conversations, UserAnswers, Users, VerificationCodes
+from benchmarks.dataset import DatasetGenerator, DatasetSizes, load_dataset
+
+# インデックスを使った走査とみなすノード
+INDEX_SCAN_NODE_TYPES = {"Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+
+USER_COUNT = 50
+QUIZ_COUNT = 40
+VERIFICATION_CODE = "123456"
+
+
+class SeededData:
+    """テストで使うシードデータのID"""
+
+    def __init__(self, user_id: UUID, email: str, quiz_id: UUID, conversation_id: UUID):
+        self.user_id = user_id
+        self.email = email
+        self.quiz_id = quiz_id
+        self.conversation_id = conversation_id
+
+
+def _walk(plan: dict) -> Iterator[dict]:
+    """実行計画のノードを全て列挙する"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+def _index_names(node: dict) -> List[str]:
+    """テーブルを走査するノードが使っているインデックスの名前"""
+    if node["Node Type"] == "Bitmap Heap Scan":
+        # インデックスは子の Bitmap Index Scan（BitmapAnd・BitmapOr の下の場合もある）に現れる
+        return [
+            child["Index Name"]
+            for child in _walk(node)
+            if child["Node Type"] == "Bitmap Index Scan"
+        ]
+    return [node["Index Name"]] if "Index Name" in node else []
+
+
+class QueryPlanChecker:
+    """リポジトリのメソッドが発行したSELECTをEXPLAINして走査方法を確認する"""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.session_factory = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+    async def capture(
+        self, call: Callable[[AsyncSession], Awaitable[object]]
+    ) -> List[Tuple[str, object]]:
+        """callの実行中に発行されたSELECT文とパラメータを取得する"""
+        statements: List[Tuple[str, object]] = []
+
+        def before_cursor_execute(
+            conn, cursor, statement, parameters, context, executemany
+        ):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append((statement, parameters))
+
+        event.listen(
+            self.engine.sync_engine, "before_cursor_execute", before_cursor_execute
+        )
+        try:
+            async with self.session_factory() as db:
+                await call(db)
+        finally:
+            event.remove(
+                self.engine.sync_engine, "before_cursor_execute", before_cursor_execute
+            )
+        return statements
+
+    async def assert_index_scan(
+        self,
+        table: str,
+        indexes: AbstractSet[str],
+        call: Callable[[AsyncSession], Awaitable[object]],
+    ) -> None:
+        """tableへのアクセスが全て indexes のいずれかのインデックス経由であることを確認する
+
+        どのテーブルにも user_id の単一列のインデックスがあるため、インデックスを使っている
+        ことだけでは複合インデックスの効果を確認できない。使われたインデックスの名前を比べる。
+        """
+        statements = await self.capture(call)
+
+        node_types = []
+        index_names = []
+        async with self.engine.connect() as conn:
+            # データ量に依存せず「使えるインデックスがあるか」を確認するため
+            # シーケンシャルスキャンを最後の手段にする
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            for statement, parameters in statements:
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {statement}", parameters  # type: ignore
+                )
+                plan = result.scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                for node in _walk(plan[0]["Plan"]):  # type: ignore
+                    if node.get("Relation Name") == table:
+                        node_types.append(node["Node Type"])
+                        index_names += _index_names(node)
+
+        assert node_types, f"{table} を参照するクエリが発行されていません"
+        assert set(node_types) <= INDEX_SCAN_NODE_TYPES, f"{table}: {node_types}"
+        assert index_names and set(index_names) <= indexes, f"{table}: {index_names}"
+
+
+async def _seed(engine: AsyncEngine) -> SeededData:
+    """複数ユーザー分の合成データを作成する"""
+    generator = DatasetGenerator(
+        DatasetSizes(users=USER_COUNT, quizzes=QUIZ_COUNT), seed=0
+    )
+    await load_dataset(engine, generator)
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    async with engine.begin() as conn:
+        emails = (await conn.execute(select(Users.email))).scalars().all()
+        await conn.execute(
+            insert(VerificationCodes),
+            [
+                {
+                    "email": email,
+                    "code": VERIFICATION_CODE,
+                    "is_used": False,
+                    "expires_at": now + datetime.timedelta(minutes=10),
+                }
+                for email in emails
+            ],
+        )
+        await conn.exec_driver_sql("ANALYZE verification_codes")
+
+        # 回答と会話セットの両方を持つユーザーを対象にする
+        target = (
+            await conn.execute(
+                select(Users.id, Users.email, UserAnswers.quiz_id, Conversations.id)
+                .join(UserAnswers, UserAnswers.user_id == Users.id)
+                .join(Conversations, Conversations.user_id == Users.id)
+                .limit(1)
+            )
+        ).one()
+
+    return SeededData(
+        user_id=target[0],
+        email=target[1],
+        quiz_id=target[2],
+        conversation_id=target[3],
+    )
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def engine():
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def seeded(engine) -> SeededData:
+    return await _seed(engine)
+
+
+@pytest.fixture
+def checker(engine) -> QueryPlanChecker:
+    return QueryPlanChecker(engine)
+
+
+@pytest.mark.asyncio(loop_scope="module")
+class TestQueryPlans:
+    """各リポジトリのクエリがインデックススキャンになることを確認する"""
+
+    async def test_user_answers_by_user_and_quiz(self, checker, seeded):
+        await checker.assert_index_scan(
+            "user_answers",
+            {"ix_user_answers_user_id_quiz_id"},
+            lambda db: UserAnswerPostgresRepository(db).getAllByQuizIdUserId(
+                seeded.user_id, seeded.quiz_id
+            ),
+        )
+
+    async def test_user_answers_by_user(self, checker, seeded):
+        await checker.assert_index_scan(
+            "user_answers",
+            # 並び順の指定がないため、user_id から始まるどちらのインデックスでもよい
+            {"ix_user_answers_user_id", "ix_user_answers_user_id_quiz_id"},
+            lambda db: UserAnswerPostgresRepository(db).getAllByUserId(seeded.user_id),
+        )
+
+    async def test_review_schedule_by_user_and_quiz(self, checker, seeded):
+        await checker.assert_index_scan(
+            "review_schedules",
+            {"ix_review_schedules_user_id_quiz_id"},
+            lambda db: ReviewSchedulePostgresRepository(db).get_schedule(
+                seeded.user_id, seeded.quiz_id
+            ),
+        )
+
+    async def test_review_schedules_by_user(self, checker, seeded):
+        await checker.assert_index_scan(
+            "review_schedules",
+            # 並び順の指定がないため、user_id から始まるどのインデックスでもよい
+            {
+                "ix_review_schedules_user_id",
+                "ix_review_schedules_user_id_quiz_id",
+                "ix_review_schedules_user_id_review_deadline",
+            },
+            lambda db: ReviewSchedulePostgresRepository(db).getAllByUserId(
+                seeded.user_id
+            ),
+        )
+
+    async def test_conversations_by_user_newest_first(self, checker, seeded):
+        await checker.assert_index_scan(
+            "conversations",
+            {"ix_conversations_user_id_created_at"},
+            lambda db: PracticePostgresRepository(db).fetchAll(seeded.user_id),
+        )
+
+    async def test_latest_test_scores_by_conversation(self, checker, seeded):
+        await checker.assert_index_scan(
+            "conversation_latest_test_results",
+            {"conversation_latest_test_results_pkey"},
+            lambda db: PracticePostgresRepository(db).get_latest_test_scores(
+                seeded.conversation_id
+            ),
+        )
+
+    async def test_recall_card_most_overdue(self, checker, seeded):
+        await checker.assert_index_scan(
+            "recall_cards",
+            {"ix_recall_cards_user_id_review_deadline_recall_card_id"},
+            lambda db: RecallCardPostgresRepository(db).getMostOverdueDeadline(
+                seeded.user_id
+            ),
+        )
+
+    async def test_recall_card_due_queue(self, checker, seeded):
+        await checker.assert_index_scan(
+            "recall_cards",
+            {"ix_recall_cards_user_id_review_deadline_recall_card_id"},
+            lambda db: RecallCardPostgresRepository(db).getDueByUserId(
+                seeded.user_id,
+                now=datetime.datetime.now(datetime.timezone.utc),
+                limit=20,
+            ),
+        )
+
+    async def test_recall_card_due_queue_next_page(self, checker, seeded):
+        await checker.assert_index_scan(
+            "recall_cards",
+            {"ix_recall_cards_user_id_review_deadline_recall_card_id"},
+            lambda db: RecallCardPostgresRepository(db).getDueByUserId(
+                seeded.user_id,
+                now=datetime.datetime.now(datetime.timezone.utc),
+                limit=20,
+                after=(
+                    datetime.datetime.now(datetime.timezone.utc)
+                    - datetime.timedelta(days=30),
+                    UUID(int=0),
+                ),
+            ),
+        )
+
+    async def test_verification_code_lookup(self, checker, seeded):
+        await checker.assert_index_scan(
+            "verification_codes",
+            {"ix_verification_codes_email_is_used_expires_at"},
+            lambda db: AuthPostgresRepository(db)._verify_code(
+                seeded.email, VERIFICATION_CODE
+            ),
+        )
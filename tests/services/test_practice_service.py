@@ -0,0 +1,109 @@
+from app.domain.practice.similarity_engine import SimilarityEngine
+from app.services.practice_service import PracticeService
+
+
+def generate_diff_spans(user_answer: str, correct_answer: str):
+    return PracticeService._generate_diff_spans(
+        user_answer,
+        correct_answer,
+        SimilarityEngine.tokenize(user_answer),
+        SimilarityEngine.tokenize(correct_answer),
+    )
+
+
+class TestGenerateDiffSpans:
+    """PracticeService._generate_diff_spans のテストケース"""
+
+    def test_equal(self):
+        """一致している場合は差分がないことをテスト"""
+        assert generate_diff_spans("I am happy.", "I am happy.") == []
+
+    def test_replace(self):
+        """置換された範囲が両方の文字列のトークンを指すことをテスト"""
+        user_answer = "I am  sad today."
+        correct_answer = "I am happy today."
+        spans = generate_diff_spans(user_answer, correct_answer)
+        assert spans == [("r", 6, 9, 5, 10)]
+        _, i1, i2, j1, j2 = spans[0]
+        assert user_answer[i1:i2] == "sad"
+        assert correct_answer[j1:j2] == "happy"
+
+    def test_delete(self):
+        """余分なトークンの範囲と、英語の答案では空の範囲になることをテスト"""
+        user_answer = "I am very happy."
+        correct_answer = "I am happy."
+        spans = generate_diff_spans(user_answer, correct_answer)
+        assert spans == [("d", 5, 9, 5, 5)]
+        _, i1, i2, j1, j2 = spans[0]
+        assert user_answer[i1:i2] == "very"
+        # 空の範囲は次のトークンの開始位置
+        assert correct_answer[j1:].startswith("happy")
+
+    def test_insert(self):
+        """不足しているトークンの範囲と、ユーザーの解答では空の範囲になることをテスト"""
+        user_answer = "I happy."
+        correct_answer = "I am happy."
+        spans = generate_diff_spans(user_answer, correct_answer)
+        assert spans == [("i", 2, 2, 2, 4)]
+        _, i1, i2, j1, j2 = spans[0]
+        assert user_answer[i1:].startswith("happy")
+        assert correct_answer[j1:j2] == "am"
+
+    def test_insert_at_end(self):
+        """末尾の空の範囲が文字列の長さ（末尾の空白を含む）になることをテスト"""
+        user_answer = "I am happy  "
+        correct_answer = "I am happy."
+        spans = generate_diff_spans(user_answer, correct_answer)
+        assert spans == [("i", 12, 12, 10, 11)]
+        assert correct_answer[10:11] == "."
+
+    def test_delete_at_end(self):
+        """英語の答案の末尾での空の範囲が文字列の長さになることをテスト"""
+        user_answer = "I am happy today"
+        correct_answer = "I am happy"
+        spans = generate_diff_spans(user_answer, correct_answer)
+        assert spans == [("d", 11, 16, 10, 10)]
+        assert user_answer[11:16] == "today"
+
+    def test_empty_user_answer(self):
+        """空の解答では英語の答案全体が不足している範囲になることをテスト"""
+        spans = generate_diff_spans("", "Hello, world!")
+        assert spans == [("i", 0, 0, 0, 13)]
+
+    def test_stored_correct_tokens(self):
+        """保存済みのトークンで差分を求めた場合、その添字と同じトークンの位置になることをテスト"""
+        user_answer = "Don't go."
+        correct_answer = "Don't go, Tom."
+        # トークン化の方法が変わる前に保存されたトークン
+        correct_tokens = ["Don", "'t", "go", ",", "Tom", "."]
+        spans = PracticeService._generate_diff_spans(
+            user_answer,
+            correct_answer,
+            SimilarityEngine.tokenize(user_answer),
+            correct_tokens,
+        )
+        assert spans == [("r", 0, 5, 0, 5), ("i", 8, 8, 8, 13)]
+        # "Don" と "'t" の2トークンが "Don't" に、"," と "Tom" が ", Tom" に対応する
+        assert correct_answer[0:5] == "Don't"
+        assert correct_answer[8:13] == ", Tom"
+
+    def test_spans_point_to_tokens(self):
+        """差分の範囲が元の文字列のトークンの境界と一致することをテスト"""
+        user_answer = "Yesterday  I  go to the the park,and  played."
+        correct_answer = "Yesterday I went to the park, and I played soccer."
+        user_tokens = SimilarityEngine.tokenize(user_answer)
+        correct_tokens = SimilarityEngine.tokenize(correct_answer)
+        spans = generate_diff_spans(user_answer, correct_answer)
+        blocks = [
+            block
+            for block in SimilarityEngine.diff_opcodes(user_tokens, correct_tokens)
+            if block[0] != "equal"
+        ]
+        assert len(spans) == len(blocks)
+        for (code, i1, i2, j1, j2), (tag, ti1, ti2, tj1, tj2) in zip(spans, blocks):
+            assert code == tag[0]
+            assert SimilarityEngine.tokenize(user_answer[i1:i2]) == user_tokens[ti1:ti2]
+            assert (
+                SimilarityEngine.tokenize(correct_answer[j1:j2])
+                == correct_tokens[tj1:tj2]
+            )
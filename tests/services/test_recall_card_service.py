@@ -0,0 +1,268 @@
+import base64
+import datetime
+from uuid import UUID
+
+import pytest
+
+from app.core.app_exception import BadRequestError, NotFoundError
+from app.domain.recall.reacall_card_entity import RecallCardEntity
+from app.endpoint.recall.recall_model import (
+    RecallCardAnswerRequest,
+    RecallCardAnswersRequest,
+)
+from app.services.recall_card_service import RecallCardService
+
+USER_ID = UUID("123e4567-e89b-12d3-a456-426614174001")
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
+
+def create_recall_card(index: int, answer: str = "Paris") -> RecallCardEntity:
+    return RecallCardEntity(
+        recallCardId=UUID(int=index + 1),
+        userId=USER_ID,
+        question=f"Question {index}",
+        answer=answer,
+        correctPoint=2,
+        reviewDeadline=NOW - datetime.timedelta(days=1, minutes=index),
+    )
+
+
+def encode_raw_cursor(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+class FakeRecallCardRepository:
+    """メモリ上の暗記カードを返し、呼び出し内容を記録するリポジトリ"""
+
+    def __init__(self, recall_cards):
+        self.recall_cards = list(recall_cards)
+        self.due_calls = []
+        self.updated = []
+
+    async def getAllByRecallCardIdsAndUserId(self, recall_card_ids, user_id):
+        return [
+            card
+            for card in self.recall_cards
+            if card.recallCardId in recall_card_ids and card.userId == user_id
+        ]
+
+    async def updateAll(self, recall_cards):
+        self.updated.append(list(recall_cards))
+
+    async def getDueByUserId(self, user_id, now, limit, after=None):
+        self.due_calls.append(after)
+        recall_cards = sorted(
+            (card for card in self.recall_cards if card.reviewDeadline <= now),
+            key=lambda card: (card.reviewDeadline, card.recallCardId),
+        )
+        if after is not None:
+            recall_cards = [
+                card
+                for card in recall_cards
+                if (card.reviewDeadline, card.recallCardId) > after
+            ]
+        return recall_cards[:limit]
+
+
+class TestRecallCardCursor:
+    """復習キューのカーソルのテストケース"""
+
+    def test_round_trip(self):
+        """エンコードしたカーソルが同じ(復習期限, ID)に戻ることをテスト"""
+        review_deadline = datetime.datetime(
+            2026, 10, 19, 9, 12, 31, 204518, tzinfo=datetime.timezone.utc
+        )
+        recall_card_id = UUID("123e4567-e89b-12d3-a456-426614174000")
+        cursor = RecallCardService._encode_cursor(review_deadline, recall_card_id)
+        assert RecallCardService._decode_cursor(cursor) == (
+            review_deadline,
+            recall_card_id,
+        )
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            # base64として不正（binascii.Error）
+            "a",
+            # UTF-8として不正
+            base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+            # 区切り文字がない
+            encode_raw_cursor("2026-10-19T09:12:31+00:00"),
+            # 区切り文字が多い
+            encode_raw_cursor(
+                "2026-10-19T09:12:31+00:00|123e4567-e89b-12d3-a456-426614174000|x"
+            ),
+            # 日時が不正
+            encode_raw_cursor("yesterday|123e4567-e89b-12d3-a456-426614174000"),
+            # IDが不正
+            encode_raw_cursor("2026-10-19T09:12:31+00:00|not-a-uuid"),
+            "",
+        ],
+    )
+    def test_decode_invalid_cursor(self, cursor):
+        """不正なカーソルはBadRequestErrorになることをテスト"""
+        with pytest.raises(BadRequestError):
+            RecallCardService._decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+class TestGetRecallCardQueue:
+    """RecallCardService.get_recall_card_queue のテストケース"""
+
+    async def test_pages_through_due_cards(self):
+        """next_cursorを順に渡すと全てのカードを重複なく期限順に取得できることをテスト"""
+        recall_cards = [create_recall_card(index) for index in range(5)]
+        # 期限が同じカードはIDの順になる
+        recall_cards.append(
+            recall_cards[0].model_copy(update={"recallCardId": UUID(int=100)})
+        )
+        repository = FakeRecallCardRepository(recall_cards)
+        service = RecallCardService(repository)
+
+        received = []
+        cursor = None
+        for _ in range(len(recall_cards)):
+            queue = await service.get_recall_card_queue(USER_ID, limit=2, cursor=cursor)
+            received += [card.recall_card_id for card in queue.recall_cards]
+            cursor = queue.next_cursor
+            if cursor is None:
+                break
+
+        expected = [
+            card.recallCardId
+            for card in sorted(
+                recall_cards, key=lambda card: (card.reviewDeadline, card.recallCardId)
+            )
+        ]
+        assert received == expected
+        assert repository.due_calls[0] is None
+
+    async def test_no_next_cursor_when_fewer_than_limit(self):
+        """取得件数がlimitに満たない場合はnext_cursorがないことをテスト"""
+        repository = FakeRecallCardRepository([create_recall_card(0)])
+        queue = await RecallCardService(repository).get_recall_card_queue(
+            USER_ID, limit=2
+        )
+        assert len(queue.recall_cards) == 1
+        assert queue.next_cursor is None
+
+    async def test_next_cursor_points_to_last_card(self):
+        """next_cursorが最後に返したカードの(復習期限, ID)を指すことをテスト"""
+        recall_cards = [create_recall_card(index) for index in range(2)]
+        queue = await RecallCardService(
+            FakeRecallCardRepository(recall_cards)
+        ).get_recall_card_queue(USER_ID, limit=2)
+        last = recall_cards[0]
+        assert RecallCardService._decode_cursor(queue.next_cursor) == (
+            last.reviewDeadline,
+            last.recallCardId,
+        )
+
+    async def test_invalid_cursor(self):
+        """不正なカーソルはリポジトリを呼ばずにBadRequestErrorになることをテスト"""
+        repository = FakeRecallCardRepository([])
+        with pytest.raises(BadRequestError):
+            await RecallCardService(repository).get_recall_card_queue(
+                USER_ID, limit=2, cursor="not-a-cursor"
+            )
+        assert repository.due_calls == []
+
+
+def answers_request(*answers) -> RecallCardAnswersRequest:
+    return RecallCardAnswersRequest(
+        answers=[
+            RecallCardAnswerRequest(recall_card_id=recall_card_id, answer=answer)
+            for recall_card_id, answer in answers
+        ]
+    )
+
+
+class TestApplyAnswers:
+    """RecallCardService._apply_answers のテストケース"""
+
+    def test_repeated_answers_applied_in_order(self):
+        """同じカードへの複数の回答が送信順に適用されることをテスト"""
+        card = create_recall_card(0)
+        answers = [
+            (card.recallCardId, "Paris"),
+            (card.recallCardId, "Paris"),
+            (card.recallCardId, "London"),
+        ]
+        result = RecallCardService._apply_answers({card.recallCardId: card}, answers)
+
+        expected = (
+            card.update_by_user_answer("Paris")
+            .update_by_user_answer("Paris")
+            .update_by_user_answer("London")
+        )
+        assert result == {card.recallCardId: expected}
+        # 正解2回で4ポイントになった後、不正解で5減って0になる
+        assert expected.correctPoint == 0
+
+    def test_order_matters(self):
+        """回答の順番が変わると結果が変わる（順番に適用している）ことをテスト"""
+        card = create_recall_card(0)
+        correct_first = RecallCardService._apply_answers(
+            {card.recallCardId: card},
+            [(card.recallCardId, "Paris"), (card.recallCardId, "London")],
+        )
+        incorrect_first = RecallCardService._apply_answers(
+            {card.recallCardId: card},
+            [(card.recallCardId, "London"), (card.recallCardId, "Paris")],
+        )
+        assert correct_first[card.recallCardId].correctPoint == 0
+        assert incorrect_first[card.recallCardId].correctPoint == 1
+
+    def test_does_not_mutate_input(self):
+        """渡した辞書を変更しないことをテスト"""
+        card = create_recall_card(0)
+        recall_card_map = {card.recallCardId: card}
+        RecallCardService._apply_answers(
+            recall_card_map, [(card.recallCardId, "Paris")]
+        )
+        assert recall_card_map == {card.recallCardId: card}
+
+
+@pytest.mark.asyncio
+class TestUpdateRecallCards:
+    """RecallCardService.update_recall_cards のテストケース"""
+
+    async def test_updates_each_card_once(self):
+        """複数の回答を適用したカードを1回ずつまとめて保存することをテスト"""
+        first, second = create_recall_card(0), create_recall_card(1, answer="Tokyo")
+        repository = FakeRecallCardRepository([first, second])
+        await RecallCardService(repository).update_recall_cards(
+            USER_ID,
+            answers_request(
+                (first.recallCardId, "Paris"),
+                (second.recallCardId, "Tokyo"),
+                (first.recallCardId, "London"),
+            ),
+        )
+
+        assert len(repository.updated) == 1
+        updated = {card.recallCardId: card for card in repository.updated[0]}
+        assert len(repository.updated[0]) == 2
+        assert updated[first.recallCardId] == first.update_by_user_answer(
+            "Paris"
+        ).update_by_user_answer("London")
+        assert updated[second.recallCardId] == second.update_by_user_answer("Tokyo")
+
+    async def test_missing_card(self):
+        """存在しない（または他のユーザーの）カードを含む場合はNotFoundErrorになり保存しないことをテスト"""
+        card = create_recall_card(0)
+        other_user_card = card.model_copy(
+            update={"recallCardId": UUID(int=100), "userId": UUID(int=0)}
+        )
+        repository = FakeRecallCardRepository([card, other_user_card])
+        service = RecallCardService(repository)
+
+        for missing_id in (UUID(int=999), other_user_card.recallCardId):
+            with pytest.raises(NotFoundError):
+                await service.update_recall_cards(
+                    USER_ID,
+                    answers_request(
+                        (card.recallCardId, "Paris"), (missing_id, "Paris")
+                    ),
+                )
+        assert repository.updated == []